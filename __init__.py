@@ -8,8 +8,8 @@ from.lib import bhqab
 ADDON_PKG=bhqab.utils_ui.get_addon_package_name()
 DATA_DIR=os.path.join(os.path.dirname(__file__),'data')
 INFO_DIR=os.path.join(DATA_DIR,'info')
-if'bpy'in locals():from importlib import reload;reload(bhqab);reload(bhqglsl);reload(bhqupd);reload(pref);reload(main);reload(props);reload(langs);reload(icons)
-else:from.lib import bhqab,bhqglsl,bhqupd;from.import pref;from.import main;from.import props;from.import langs;from.import icons
+if'bpy'in locals():from importlib import reload;reload(bhqab);reload(bhqglsl);reload(bhqupd);reload(pref);reload(main);reload(props);reload(langs);reload(icons);reload(graph);reload(pick);reload(shaders);reload(profiling);reload(batch);reload(core)
+else:from.lib import bhqab,bhqglsl,bhqupd;from.import pref;from.import main;from.import props;from.import langs;from.import icons;from.import graph;from.import pick;from.import shaders;from.import profiling;from.import batch;from.import core
 import bpy
 from bpy.types import Context,UILayout,WindowManager,WorkSpaceTool
 from bpy.props import PointerProperty
@@ -22,14 +22,21 @@ class PathToolMesh(WorkSpaceTool):
 	def draw_settings(context:Context,layout:UILayout,tool:WorkSpaceTool):wm_props:WMProps=context.window_manager.select_path;layout.enabled=not wm_props.is_runtime;wm_props.ui_draw_func_runtime(layout)
 @persistent
 def load_post(_unused):bhqab.utils_ui.copy_default_presets_from(src_root=os.path.join(DATA_DIR,'presets'));bhqupd.check_addon_updates()
-_classes=pref.Preferences,pref.PREFERENCES_MT_path_tool_appearance_preset,pref.PREFERENCES_OT_path_tool_appearance_preset,props.WMProps,props.MESH_MT_select_path_presets,props.MESH_OT_select_path_preset_add,props.PREFERENCES_OT_select_path_pref_show,main.MESH_OT_select_path,main.MESH_PT_select_path_context
+_classes=pref.Preferences,pref.PREFERENCES_MT_path_tool_appearance_preset,pref.PREFERENCES_OT_path_tool_appearance_preset,pref.PREFERENCES_OT_path_tool_profiling_export,pref.PREFERENCES_OT_path_tool_profiling_reset,props.WMProps,props.MESH_MT_select_path_presets,props.MESH_OT_select_path_preset_add,props.PREFERENCES_OT_select_path_pref_show,main.MESH_OT_select_path,main.MESH_PT_select_path_context,batch.MESH_OT_select_path_batch
 _cls_register,_cls_unregister=bpy.utils.register_classes_factory(classes=_classes)
-_handlers=(bpy.app.handlers.load_post,load_post),
+@persistent
+def depsgraph_update_post(scene,depsgraph):graph.depsgraph_update_post(scene,depsgraph)
+@persistent
+def undo_post(*args):graph.undo_post()
+_handlers=(bpy.app.handlers.load_post,load_post),(bpy.app.handlers.depsgraph_update_post,depsgraph_update_post),(bpy.app.handlers.undo_post,undo_post),(bpy.app.handlers.redo_post,undo_post),(bpy.app.handlers.load_post,undo_post)
 def register():
 	A=False;_cls_register();WindowManager.select_path=PointerProperty(type=props.WMProps);bpy.utils.register_tool(PathToolMesh,after={'builtin.select_lasso'},separator=A,group=A);bpy.app.translations.register(ADDON_PKG,langs.LANGS);bhqupd.register_addon_update_operators()
 	for(handler,func)in _handlers:
 		if func not in handler:handler.append(func)
+	# Shaders are compiled once the interface is running, so the first use of the tool does not wait for them
+	if not bpy.app.background and not bpy.app.timers.is_registered(shaders.warm_up):bpy.app.timers.register(shaders.warm_up,first_interval=1.)
 def unregister():
+	if bpy.app.timers.is_registered(shaders.warm_up):bpy.app.timers.unregister(shaders.warm_up)
 	for(handler,func)in _handlers:
-		if func not in handler:handler.remove(func)
-	bpy.app.translations.unregister(ADDON_PKG);bhqupd.unregister_addon_update_operators();bpy.utils.unregister_tool(PathToolMesh);del WindowManager.select_path;_cls_unregister()
\ No newline at end of file
+		if func in handler:handler.remove(func)
+	bpy.app.translations.unregister(ADDON_PKG);bhqupd.unregister_addon_update_operators();bpy.utils.unregister_tool(PathToolMesh);del WindowManager.select_path;_cls_unregister();graph.clear_cache();pick.clear_cache();shaders.clear_cache();profiling.profiler.reset()
\ No newline at end of file
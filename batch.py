@@ -0,0 +1,142 @@
+from __future__ import annotations
+import json
+import numpy as np
+from typing import Any,Iterable
+from.import core
+from.import graph
+from.import markup
+import bpy
+from bpy.types import Context,Object,Operator
+from bpy.props import StringProperty
+from bpy.app.translations import pgettext
+__all__='MODES','MARK_SELECT_ITEMS','MARK_ITEMS','load_spec','eval_paths','apply_paths','apply_spec','MESH_OT_select_path_batch'
+
+MODES='EDGES','FACES'
+'''Path modes - paths through edges between vertices or through faces.'''
+MARK_SELECT_ITEMS='EXTEND','NONE','SUBTRACT','INVERT'
+MARK_ITEMS='MARK','NONE','CLEAR','TOGGLE'
+
+def load_spec(filepath:str)->dict[str,Any]:
+	'''Read path specification from JSON file.
+
+	Specification is an object with optional ``mode`` (one of ``MODES``, ``EDGES`` by default), ``mark_select``,
+	``mark_seam`` and ``mark_sharp`` options (same as ``WMProps`` ones) and required ``objects`` - mapping of
+	object names to lists of paths. Each path is either a list of control element indices (vertices in edge mode,
+	faces in face mode) or an object with ``control_elements`` and optional ``closed``, ``topology`` and ``weighted``
+	flags.
+	'''
+	with open(filepath,'r',encoding='utf-8')as file:spec=json.load(file)
+	if not isinstance(spec,dict)or not isinstance(spec.get('objects'),dict):raise ValueError(f'"{filepath}" is not a path specification, "objects" mapping is missing')
+	return spec
+
+def _eval_path_item(item:Any)->tuple[list[int],core.PathFlag]:
+	flag=core.PathFlag(0)
+	if isinstance(item,dict):
+		if item.get('closed',False):flag|=core.PathFlag.CLOSED
+		if item.get('topology',False):flag|=core.PathFlag.TOPOLOGY
+		if item.get('weighted',False):flag|=core.PathFlag.WEIGHTED
+		item=item.get('control_elements',())
+	# JSON numbers are the only valid control elements, booleans are integers in Python but not in JSON
+	if not isinstance(item,(list,tuple))or not all(isinstance(elem,int)and not isinstance(elem,bool)for elem in item):raise ValueError(f'Path {item!r} is not a list of control element indices')
+	return list(item),flag
+
+def eval_paths(ob:Any,mesh_graph:core.MeshGraph,items:Iterable[Any])->list[core.Path]:
+	'''Solve paths of the object from specification items, see ``load_spec`` for the format of an item.'''
+	ret=list()
+	for item in items:
+		control_elements,flag=_eval_path_item(item)
+		if not control_elements:continue
+		for elem in control_elements:
+			if not 0<=elem<mesh_graph.num_nodes:raise ValueError(f'Control element {elem} of "{getattr(ob,"name",ob)}" is out of range, mesh has {mesh_graph.num_nodes} elements')
+		path=core.Path(control_elements[0],0,ob,mesh_graph)
+		path.flag=flag
+		for elem_index,elem in enumerate(control_elements[1:],start=1):path.insert_control_element(elem_index,elem)
+		core.update_path_fills(path)
+		ret.append(path)
+	return ret
+
+def apply_paths(items:Iterable[tuple[Object,Iterable[Any]]],*,is_faces:bool,mark_select:str='EXTEND',mark_seam:str='NONE',mark_sharp:str='NONE')->dict[str,dict[str,int]]:
+	'''Solve paths of each object and apply them to its mesh the same way ``MESH_OT_select_path`` execution does.
+
+	Objects should not be in edit mode. Paths of all objects are validated and solved before any mesh is changed, so
+	if an item is invalid, no mesh has been written. Returns statistics of each object by name - number of paths,
+	segments, unreachable segments (control elements of different islands) and selected and marked up elements.
+	'''
+	if mark_select not in MARK_SELECT_ITEMS:raise ValueError(f'Unknown selection mode "{mark_select}"')
+	for value in(mark_seam,mark_sharp):
+		if value not in MARK_ITEMS:raise ValueError(f'Unknown markup mode "{value}"')
+	solved=list()
+	for ob,ob_items in items:
+		if ob.type!='MESH':raise ValueError(f'"{ob.name}" is not a mesh object')
+		# Scripts may have changed mesh data without depsgraph evaluation
+		mesh_graph=graph.get_mesh_graph(ob,is_faces=is_faces,validate=True)
+		if not isinstance(ob_items,(list,tuple)):raise ValueError(f'Paths of "{ob.name}" are not a list')
+		ob_items=list(ob_items)
+		if any(_eval_path_item(item)[1]&core.PathFlag.WEIGHTED for item in ob_items):graph.update_edge_costs(ob,mesh_graph)
+		solved.append((ob,mesh_graph,eval_paths(ob,mesh_graph,ob_items)))
+	ret=dict()
+	for ob,mesh_graph,paths in solved:
+		labels=mesh_graph.island_labels
+		num_segments=num_unreachable=0
+		for path in paths:
+			control_elements=np.asarray(path.control_elements,dtype=np.int32)
+			pairs=np.stack((control_elements[:-1],control_elements[1:]),axis=1)
+			if path.flag&core.PathFlag.CLOSED and len(control_elements)>2:pairs=np.concatenate((pairs,((control_elements[-1],control_elements[0]),)))
+			num_segments+=len(pairs)
+			num_unreachable+=int(np.count_nonzero(labels[pairs[:,0]]!=labels[pairs[:,1]]))
+		select_indices=markup_indices=np.zeros(0,dtype=np.int32)
+		if paths:
+			select_indices,markup_indices=core.eval_element_indices(paths,is_faces=is_faces)[ob]
+			markup.apply_markup(ob.data,is_faces=is_faces,select_indices=select_indices,markup_indices=markup_indices,mark_select=mark_select,mark_seam=mark_seam,mark_sharp=mark_sharp)
+		ret[ob.name]=dict(paths=len(paths),segments=num_segments,unreachable=num_unreachable,selected=len(select_indices),marked=len(markup_indices))
+	return ret
+
+def apply_spec(spec:dict[str,Any],*,mark_select:str='EXTEND',mark_seam:str='NONE',mark_sharp:str='NONE')->dict[str,dict[str,int]]:
+	'''Apply specification (see ``load_spec``) to objects of the current file. Options of the specification override
+	keyword arguments.'''
+	mode=spec.get('mode','EDGES')
+	if mode not in MODES:raise ValueError(f'Unknown path mode "{mode}"')
+	items=list()
+	for name,ob_items in spec['objects'].items():
+		ob=bpy.data.objects.get(name)
+		if ob is None:raise ValueError(f'Object "{name}" not found')
+		items.append((ob,ob_items))
+	return apply_paths(items,is_faces=mode=='FACES',mark_select=spec.get('mark_select',mark_select),mark_seam=spec.get('mark_seam',mark_seam),mark_sharp=spec.get('mark_sharp',mark_sharp))
+
+class MESH_OT_select_path_batch(Operator):
+	bl_idname='mesh.select_path_batch'
+	bl_label='Select Path Batch'
+	bl_description='Select and mark up paths given by control element indices in a JSON file, without user interaction'
+	bl_options={'REGISTER','UNDO'}
+	bl_translation_context='MESH_OT_select_path_batch'
+	filepath:StringProperty(subtype='FILE_PATH',options={'SKIP_SAVE'},name='File Path',description='Path specification file')
+	filter_glob:StringProperty(default='*.json',options={'HIDDEN'})
+
+	@classmethod
+	def poll(cls,context:Context)->bool:return context.mode in{'OBJECT','EDIT_MESH'}
+
+	def invoke(self,context:Context,event)->set[str]:
+		context.window_manager.fileselect_add(self)
+		return{'RUNNING_MODAL'}
+
+	def execute(self,context:Context)->set[str]:
+		msgctxt=self.__class__.__qualname__
+		wm_props=context.window_manager.select_path
+		try:spec=load_spec(bpy.path.abspath(self.filepath))
+		except(OSError,ValueError)as err:
+			self.report({'ERROR'},str(err))
+			return{'CANCELLED'}
+		is_edit_mode=context.mode=='EDIT_MESH'
+		# Mesh attributes can be written in bulk only outside of edit mode
+		if is_edit_mode:bpy.ops.object.mode_set(mode='OBJECT')
+		try:stats=apply_spec(spec,mark_select=wm_props.mark_select,mark_seam=wm_props.mark_seam,mark_sharp=wm_props.mark_sharp)
+		except ValueError as err:
+			self.report({'ERROR'},str(err))
+			return{'CANCELLED'}
+		finally:
+			if is_edit_mode:bpy.ops.object.mode_set(mode='EDIT')
+		num_paths=sum(n['paths']for n in stats.values())
+		num_unreachable=sum(n['unreachable']for n in stats.values())
+		self.report({'INFO'},pgettext('Applied {num_paths} paths to {num_objects} objects',msgctxt).format(num_paths=num_paths,num_objects=len(stats)))
+		if num_unreachable:self.report({'WARNING'},pgettext('{num} segments connect elements of different islands',msgctxt).format(num=num_unreachable))
+		return{'FINISHED'}
@@ -0,0 +1,242 @@
+'''Headless benchmark of ``MESH_OT_select_path`` on synthetic meshes.
+
+Run from the add-on directory with Blender in background mode::
+
+	blender -b --factory-startup --python benchmarks/benchmark.py -- --output results.json
+
+Grid, UV-sphere and many-island meshes are generated for each requested number of elements. Invoke state
+evaluation, ``_get_linked_island_index``, ``_update_fills_by_element_index``, a simulated drag of the last control
+element and ``execute`` are timed in both edge and face mode. Nothing is drawn, so with ``--stub-gpu`` (or when
+the ``gpu`` module is not available, as with the ``bpy`` Python module) ``gpu`` and ``gpu_extras`` are replaced by
+stubs. Results are written as JSON.
+'''
+from __future__ import annotations
+import argparse
+import datetime
+import importlib
+import json
+import os
+import platform
+import statistics
+import sys
+import time
+import types
+import numpy as np
+import bpy
+
+ADDON_DIR=os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+MESHES='grid','sphere','islands'
+MODES='edges','faces'
+ISLAND_SIZE=10
+'''Number of quads along each side of a single island of many-island meshes.'''
+
+class _GPUStub:
+	'''Stand-in for any member of stubbed ``gpu`` modules, calls and attribute access return stubs.'''
+	def __init__(self,*args,**kwargs):pass
+	def __call__(self,*args,**kwargs):return _GPUStub()
+	def __getattr__(self,name:str):return _GPUStub()
+	def __enter__(self):return self
+	def __exit__(self,*args):return False
+	def __iter__(self):return iter(())
+
+def _install_gpu_stub()->None:
+	def module_getattr(name:str):
+		if name.startswith('__'):raise AttributeError(name)
+		return _GPUStub
+	for name in('gpu','gpu.types','gpu.state','gpu.matrix','gpu.shader','gpu.texture','gpu.platform','gpu_extras','gpu_extras.batch','gpu_extras.presets'):
+		module=types.ModuleType(name)
+		module.__getattr__=module_getattr
+		sys.modules[name]=module
+		parent,_,attr=name.rpartition('.')
+		if parent:setattr(sys.modules[parent],attr,module)
+
+def _parse_args()->argparse.Namespace:
+	argv=sys.argv[sys.argv.index('--')+1:]if'--'in sys.argv else list()
+	parser=argparse.ArgumentParser(prog='benchmark.py',description=__doc__.split('\n',1)[0])
+	parser.add_argument('--output',default='benchmark_results.json',help='Path of resulting JSON file')
+	parser.add_argument('--sizes',type=int,nargs='+',default=(10_000,100_000,1_000_000,2_000_000),help='Approximate numbers of mesh faces')
+	parser.add_argument('--meshes',nargs='+',choices=MESHES,default=MESHES)
+	parser.add_argument('--modes',nargs='+',choices=MODES,default=MODES)
+	parser.add_argument('--repeat',type=int,default=5,help='Number of timed runs of each operation')
+	parser.add_argument('--drag-steps',type=int,default=20,help='Number of mouse moves of simulated drag')
+	parser.add_argument('--seed',type=int,default=0)
+	parser.add_argument('--stub-gpu',action='store_true',help='Replace gpu and gpu_extras modules with stubs')
+	return parser.parse_args(argv)
+
+# Synthetic meshes. Each generator returns vertex coordinates, loop vertex indices and face sizes.
+
+def _gen_grid(nx:int,ny:int,*,offset:tuple[float,float]=(0.,0.))->tuple[np.ndarray,np.ndarray,np.ndarray]:
+	xs,ys=np.meshgrid(np.arange(nx+1,dtype=np.float32),np.arange(ny+1,dtype=np.float32))
+	coords=np.stack((xs.ravel()+offset[0],ys.ravel()+offset[1],np.zeros(xs.size,dtype=np.float32)),axis=1)
+	v0=(np.arange(ny)[:,None]*(nx+1)+np.arange(nx)[None,:]).ravel()
+	loop_verts=np.stack((v0,v0+1,v0+nx+2,v0+nx+1),axis=1).ravel()
+	return coords,loop_verts,np.full(len(v0),4,dtype=np.int32)
+
+def _gen_sphere(num_segments:int,num_rings:int)->tuple[np.ndarray,np.ndarray,np.ndarray]:
+	theta=np.linspace(0.,np.pi,num_rings+1)[1:-1]
+	phi=np.linspace(0.,2.*np.pi,num_segments,endpoint=False)
+	ring_coords=np.stack((np.outer(np.sin(theta),np.cos(phi)).ravel(),np.outer(np.sin(theta),np.sin(phi)).ravel(),np.repeat(np.cos(theta),num_segments)),axis=1)
+	coords=np.concatenate(((0.,0.,1.),ring_coords,(0.,0.,-1.)),axis=None).reshape(-1,3).astype(np.float32)
+	south=len(coords)-1
+	seg=np.arange(num_segments)
+	seg_next=(seg+1)%num_segments
+	tris_north=np.stack((np.zeros(num_segments,dtype=np.int64),1+seg,1+seg_next),axis=1)
+	ring=np.arange(num_rings-2)[:,None]*num_segments
+	quads=np.stack(((1+ring+seg).ravel(),(1+ring+num_segments+seg).ravel(),(1+ring+num_segments+seg_next).ravel(),(1+ring+seg_next).ravel()),axis=1)
+	last=1+(num_rings-2)*num_segments
+	tris_south=np.stack((last+seg,np.full(num_segments,south),last+seg_next),axis=1)
+	loop_verts=np.concatenate((tris_north.ravel(),quads.ravel(),tris_south.ravel()))
+	loop_totals=np.concatenate((np.full(num_segments,3),np.full(len(quads),4),np.full(num_segments,3))).astype(np.int32)
+	return coords,loop_verts,loop_totals
+
+def _gen_islands(num_islands:int)->tuple[np.ndarray,np.ndarray,np.ndarray]:
+	coords_arr=list();loop_verts_arr=list();loop_totals_arr=list()
+	side=int(np.ceil(np.sqrt(num_islands)))
+	num_verts=0
+	for i in range(num_islands):
+		coords,loop_verts,loop_totals=_gen_grid(ISLAND_SIZE,ISLAND_SIZE,offset=((ISLAND_SIZE+1)*(i%side),(ISLAND_SIZE+1)*(i//side)))
+		coords_arr.append(coords);loop_verts_arr.append(loop_verts+num_verts);loop_totals_arr.append(loop_totals)
+		num_verts+=len(coords)
+	return np.concatenate(coords_arr),np.concatenate(loop_verts_arr),np.concatenate(loop_totals_arr)
+
+def _gen_mesh_data(mesh_type:str,size:int)->tuple[np.ndarray,np.ndarray,np.ndarray]:
+	if mesh_type=='grid':
+		n=max(1,round(np.sqrt(size)))
+		return _gen_grid(n,n)
+	elif mesh_type=='sphere':
+		num_rings=max(3,round(np.sqrt(size/2)))
+		return _gen_sphere(2*num_rings,num_rings)
+	return _gen_islands(max(1,round(size/ISLAND_SIZE**2)))
+
+def _new_object(name:str,coords:np.ndarray,loop_verts:np.ndarray,loop_totals:np.ndarray)->bpy.types.Object:
+	mesh=bpy.data.meshes.new(name)
+	mesh.vertices.add(len(coords))
+	mesh.vertices.foreach_set('co',np.ascontiguousarray(coords,dtype=np.float32).ravel())
+	mesh.loops.add(len(loop_verts))
+	mesh.loops.foreach_set('vertex_index',np.ascontiguousarray(loop_verts,dtype=np.int32))
+	mesh.polygons.add(len(loop_totals))
+	loop_starts=np.zeros(len(loop_totals),dtype=np.int32)
+	np.cumsum(loop_totals[:-1],out=loop_starts[1:])
+	mesh.polygons.foreach_set('loop_start',loop_starts)
+	mesh.update(calc_edges=True)
+	ob=bpy.data.objects.new(name,mesh)
+	bpy.context.scene.collection.objects.link(ob)
+	return ob
+
+def _remove_object(ob:bpy.types.Object)->None:
+	if ob.mode!='OBJECT':bpy.ops.object.mode_set(mode='OBJECT')
+	mesh=ob.data
+	bpy.data.objects.remove(ob)
+	bpy.data.meshes.remove(mesh)
+
+# Timing
+
+def _timeit(func,repeat:int)->list[float]:
+	ret=list()
+	for _ in range(repeat):
+		start=time.perf_counter()
+		func()
+		ret.append(time.perf_counter()-start)
+	return ret
+
+def _result(mesh_type:str,size:int,mode:str,num_elements:int,op:str,times:list[float])->dict:
+	return dict(mesh=mesh_type,size=size,mode=mode,num_elements=num_elements,op=op,times=times,min=min(times),median=statistics.median(times),mean=statistics.fmean(times))
+
+def _bench_mode(addon,ob:bpy.types.Object,mesh_type:str,size:int,mode:str,args:argparse.Namespace)->list[dict]:
+	main=addon.main;Op=main.MESH_OT_select_path;context=bpy.context
+	context.tool_settings.mesh_select_mode=(False,True,False)if mode=='edges'else(False,False,True)
+	bpy.ops.mesh.select_all(action='DESELECT')
+	rng=np.random.default_rng(args.seed)
+	ret=list()
+
+	def invoke()->None:
+		Op._invoke_eval_state(context)
+		for ob_,_bm in Op.bm_arr:Op._get_mesh_graph(ob_)
+
+	def invoke_cold()->None:
+		addon.graph.clear_cache()
+		invoke()
+	ret.append(_result(mesh_type,size,mode,0,'invoke_cold',_timeit(invoke_cold,args.repeat)))
+	invoke()
+	ret.append(_result(mesh_type,size,mode,0,'invoke',_timeit(invoke,args.repeat)))
+	mesh_graph=Op._get_mesh_graph(ob);num_nodes=mesh_graph.num_nodes
+	for item in ret:item['num_elements']=num_nodes
+
+	# The first call evaluates island labels of the whole mesh, following calls only look them up
+	def island_index_first()->None:
+		mesh_graph._island_labels=None
+		Op.mesh_islands=dict()
+		Op._get_linked_island_index(ob,0)
+	ret.append(_result(mesh_type,size,mode,num_nodes,'linked_island_index_first',_timeit(island_index_first,args.repeat)))
+	sample=rng.integers(0,num_nodes,1000)
+
+	def island_index()->None:
+		for elem in sample:Op._get_linked_island_index(ob,int(elem))
+	ret.append(_result(mesh_type,size,mode,num_nodes,'linked_island_index',[t/len(sample)for t in _timeit(island_index,args.repeat)]))
+
+	# Fill between the first element and the farthest element of its island
+	labels=mesh_graph.island_labels
+	island_nodes=np.flatnonzero(labels==labels[0])
+	elem_0=int(island_nodes[0]);elem_1=int(island_nodes[-1])
+	path=main.Path(elem_0,Op._get_linked_island_index(ob,elem_0),ob,mesh_graph)
+	path.insert_control_element(1,elem_1)
+	ret.append(_result(mesh_type,size,mode,num_nodes,'update_fills_by_element_index',_timeit(lambda:Op._update_fills_by_element_index(context,path,1),args.repeat)))
+
+	# Simulated drag of the last control element over random elements of the same island
+	Op.path_arr.append(path);Op._active_path_index=0
+	steps=rng.choice(island_nodes,args.drag_steps)
+
+	def drag()->None:
+		# Segments are solved from drag trees only once a drag move has been made
+		Op._drag_elem=elem_1;Op._drag_ob=ob;Op.is_dragging=True;Op.drag_trees=dict()
+		try:
+			for elem in steps:
+				elem=int(elem)
+				Op._drag_elem=elem
+				path.set_control_element(1,elem)
+				Op._update_fills_by_element_index(context,path,1)
+				path.geom_control_elements=Op._gen_geometry_control_elements(path)
+			if not Op.drag_trees and any(int(elem)!=elem_0 for elem in steps):raise RuntimeError('Drag segments have not been solved from drag trees')
+		finally:Op._drag_elem=None;Op._drag_ob=None;Op.is_dragging=False
+	ret.append(_result(mesh_type,size,mode,num_nodes,'drag',_timeit(drag,args.repeat)))
+	ret.append(_result(mesh_type,size,mode,num_nodes,'drag_step',[t/len(steps)for t in ret[-1]['times']]))
+
+	def execute()->None:
+		Op._eval_final_element_indices_arrays()
+		Op._execute(context)
+	ret.append(_result(mesh_type,size,mode,num_nodes,'execute',_timeit(execute,args.repeat)))
+	Op.path_arr.clear()
+	return ret
+
+def main()->None:
+	args=_parse_args()
+	stub_gpu=args.stub_gpu
+	if not stub_gpu:
+		try:import gpu
+		except ImportError:stub_gpu=True
+	if stub_gpu:_install_gpu_stub()
+	sys.path.insert(0,os.path.dirname(ADDON_DIR))
+	addon=importlib.import_module(os.path.basename(ADDON_DIR))
+	addon.register()
+	results=list()
+	try:
+		for mesh_type in args.meshes:
+			for size in args.sizes:
+				coords,loop_verts,loop_totals=_gen_mesh_data(mesh_type,size)
+				ob=_new_object(f'{mesh_type}_{size}',coords,loop_verts,loop_totals)
+				for other in bpy.context.view_layer.objects:other.select_set(False)
+				bpy.context.view_layer.objects.active=ob
+				ob.select_set(True)
+				bpy.ops.object.mode_set(mode='EDIT')
+				for mode in args.modes:
+					mode_results=_bench_mode(addon,ob,mesh_type,size,mode,args)
+					results.extend(mode_results)
+					for item in mode_results:print(f"{mesh_type:>8} {size:>9} {mode:>6} {item['op']:<32} {item['median']*1000.:10.3f} ms",flush=True)
+				_remove_object(ob)
+				addon.graph.clear_cache();addon.pick.clear_cache()
+	finally:addon.unregister()
+	meta=dict(blender=bpy.app.version_string,addon=list(addon.bl_info['version']),python=platform.python_version(),numpy=np.__version__,platform=platform.platform(),gpu='stub'if stub_gpu else'native',timestamp=datetime.datetime.now(datetime.timezone.utc).isoformat(),repeat=args.repeat,drag_steps=args.drag_steps,seed=args.seed)
+	with open(args.output,'w',encoding='utf-8')as file:json.dump(dict(meta=meta,results=results),file,indent=1)
+	print(f'Results written to {os.path.abspath(args.output)}')
+
+if __name__=='__main__':main()
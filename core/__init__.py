@@ -0,0 +1,12 @@
+'''Path tool engine which does not depend on Blender - mesh graph, shortest path solving, path model, joining and
+merging of paths and export of element indices. It works on plain NumPy arrays, ``MESH_OT_select_path`` is an
+adapter which feeds it with edit mesh data.
+'''
+from __future__ import annotations
+if'graph'in locals():from importlib import reload;reload(graph);reload(path);reload(solver);reload(export)
+else:from.import graph,path,solver,export
+from.graph import EMPTY_FILL,MeshGraph,ShortestPathTree,eval_connected_components
+from.path import PathFlag,PathDirty,DoublesEvent,PathState,Path,remove_doubles,join_adjacent
+from.solver import solve_fill,solve_path,update_fills,update_path_fills,update_fills_many,ProgressiveFill
+from.export import eval_element_indices
+__all__='graph','path','solver','export','EMPTY_FILL','MeshGraph','ShortestPathTree','eval_connected_components','PathFlag','PathDirty','DoublesEvent','PathState','Path','remove_doubles','join_adjacent','solve_fill','solve_path','update_fills','update_fills_many','update_path_fills','ProgressiveFill','eval_element_indices'
@@ -0,0 +1,33 @@
+from __future__ import annotations
+import numpy as np
+from typing import Any,Iterable
+from.graph import EMPTY_FILL
+from typing import TYPE_CHECKING
+if TYPE_CHECKING:from.path import Path
+__all__='eval_element_indices',
+
+def eval_element_indices(paths:Iterable[Path],*,is_faces:bool)->dict[Any,tuple[np.ndarray,np.ndarray]]:
+	'''Sorted unique ``(select, markup)`` element indices of paths of each path object.
+
+	Selection indices are fill edges in edge mode and fill and control faces in face mode, markup indices are
+	always edges - the same as selection in edge mode and edges of selected faces in face mode.
+	'''
+	select_arrays:dict[Any,list[np.ndarray]]=dict()
+	markup_arrays:dict[Any,list[np.ndarray]]=dict()
+	for path in paths:
+		select=select_arrays.setdefault(path.ob,list())
+		markup=markup_arrays.setdefault(path.ob,list())
+		select.extend(path.fill_elements)
+		if is_faces:
+			faces=np.concatenate(path.fill_elements+[np.asarray(path.control_elements,dtype=np.int32)])
+			select.append(faces)
+			markup.append(path.graph.face_edges(faces))
+	ret=dict()
+	for ob,select in select_arrays.items():
+		index_select_seq=np.unique(np.concatenate(select))if select else EMPTY_FILL
+		index_markup_seq=index_select_seq
+		if is_faces:
+			markup=markup_arrays[ob]
+			index_markup_seq=np.unique(np.concatenate(markup))if markup else EMPTY_FILL
+		ret[ob]=index_select_seq,index_markup_seq
+	return ret
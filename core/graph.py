@@ -0,0 +1,594 @@
+from __future__ import annotations
+import heapq
+import numpy as np
+from typing import Callable,Iterable,Sequence
+__all__='EMPTY_FILL','LEVEL_SEARCH_MIN_NODES','LOCAL_SEARCH_MARGIN','LOCAL_SEARCH_MAX_GROWTHS','LOCAL_SEARCH_MAX_EXTENT','COST_ANGLE_WEIGHT','COST_MARK_WEIGHT','COST_UV_WEIGHT','COST_MIN_FACTOR','MeshGraph','ShortestPathTree','eval_connected_components','eval_face_normals','eval_uv_boundaries','eval_edge_costs'
+
+EMPTY_FILL=np.zeros(0,dtype=np.int32)
+EMPTY_FILL.flags.writeable=False
+'''Read-only fill of segments without elements, shared by the whole engine.'''
+
+LEVEL_SEARCH_MIN_NODES=1<<14
+'''Graphs with at least that many nodes are searched level by level with NumPy in topology distance mode. On grids of
+that size level search is about as fast as Dijkstra search for short segments and three times faster for long ones,
+the gap grows with graph size.'''
+LOCAL_SEARCH_MARGIN=.5
+'''Initial margin of local search box around segment ends, relative to the distance between them.'''
+LOCAL_SEARCH_MAX_GROWTHS=3
+'''Number of times local search box may be grown before the whole graph is searched.'''
+LOCAL_SEARCH_MAX_EXTENT=.5
+'''Largest diagonal of local search box relative to the diagonal of the graph bounds. Larger boxes prune too few nodes
+to pay off, so the whole graph is searched instead.'''
+COST_ANGLE_WEIGHT=1.
+'''Weight of edge dihedral angle (relative to right angle) in weighted edge cost.'''
+COST_MARK_WEIGHT=1.
+'''Weight of edge seam or sharp mark in weighted edge cost.'''
+COST_UV_WEIGHT=1.
+'''Weight of UV boundary in weighted edge cost.'''
+COST_MIN_FACTOR=.05
+'''Cost factor of edges with the strongest features, factor of featureless edges is one.'''
+
+class MeshGraph:
+	'''Mesh connectivity graph used to evaluate shortest paths between control elements.
+
+	In edge mode graph nodes are vertices linked by edges, in face mode nodes are faces linked across shared edges
+	(dual graph). Adjacency is stored in CSR layout - links of node ``n`` are ``indptr[n]:indptr[n + 1]`` slice of
+	``indices`` (other node), ``links`` (mesh edge passed through) and ``lengths`` (spatial length of the link).
+	Mesh arrays the graph was built from are kept to resolve path elements without mesh element wrappers.
+	'''
+	__slots__='is_faces','indptr','indices','links','lengths','topology_key','geometry_key','coords','edge_verts','loop_verts','loop_edges','loop_starts','loop_totals','tri_verts','tri_starts','edge_costs','costs_key','_mv','_weighted_mv','_island_labels','_local_bounds'
+	is_faces:bool
+	indptr:np.ndarray
+	indices:np.ndarray
+	links:np.ndarray
+	lengths:np.ndarray
+	topology_key:int
+	geometry_key:int
+	coords:np.ndarray
+	edge_verts:np.ndarray
+	loop_verts:None|np.ndarray
+	loop_edges:None|np.ndarray
+	loop_starts:None|np.ndarray
+	loop_totals:None|np.ndarray
+	tri_verts:None|np.ndarray
+	tri_starts:None|np.ndarray
+	edge_costs:None|np.ndarray
+	costs_key:None|int
+
+	def __init__(self,*,is_faces:bool,indptr:np.ndarray,indices:np.ndarray,links:np.ndarray,lengths:np.ndarray,coords:np.ndarray,edge_verts:np.ndarray,loop_verts:None|np.ndarray=None,loop_edges:None|np.ndarray=None,loop_totals:None|np.ndarray=None,topology_key:int=0,geometry_key:int=0):
+		self.is_faces=is_faces
+		self.indptr=indptr
+		self.indices=indices
+		self.links=links
+		self.coords=coords
+		self.edge_verts=edge_verts
+		self.loop_verts=loop_verts
+		self.loop_edges=loop_edges
+		self.loop_totals=loop_totals
+		self.loop_starts=None
+		if loop_totals is not None:
+			self.loop_starts=np.zeros(len(loop_totals),dtype=np.int32)
+			np.cumsum(loop_totals[:-1],out=self.loop_starts[1:])
+		self.tri_verts=self.tri_starts=None
+		self.topology_key=topology_key
+		self._island_labels=None
+		self.edge_costs=self.costs_key=self._weighted_mv=None
+		self.set_lengths(lengths,geometry_key=geometry_key)
+
+	@property
+	def num_nodes(self)->int:return len(self.indptr)-1
+
+	@property
+	def island_labels(self)->np.ndarray:
+		'''Connected component label of each node, evaluated once per graph topology.'''
+		if self._island_labels is None:
+			src=np.repeat(np.arange(self.num_nodes,dtype=np.int32),np.diff(self.indptr))
+			self._island_labels=eval_connected_components(self.num_nodes,src,self.indices)
+		return self._island_labels
+
+	def set_lengths(self,lengths:np.ndarray,*,geometry_key:int=0)->None:
+		self.lengths=np.ascontiguousarray(lengths,dtype=np.float32)
+		self.geometry_key=geometry_key
+		# Memory views give plain Python scalars on item access which is much faster than NumPy scalars in the solver
+		self._mv=memoryview(self.indptr),memoryview(self.indices),memoryview(self.links),memoryview(self.lengths)
+		if self.edge_costs is not None:self._eval_weighted_mv()
+		self._local_bounds=None
+
+	def set_edge_costs(self,edge_costs:np.ndarray,*,costs_key:int=0)->None:
+		'''Set per-edge cost factors of weighted solving (see ``eval_edge_costs``).
+
+		In edge mode link length is multiplied by the factor of its edge, so paths follow edges with strong
+		features. In face mode link length is divided by the factor of the shared edge, so paths do not cross them.
+		'''
+		self.edge_costs=np.ascontiguousarray(edge_costs,dtype=np.float32)
+		self.costs_key=costs_key
+		self._eval_weighted_mv()
+
+	def _eval_weighted_mv(self)->None:
+		factors=self.edge_costs[self.links]
+		weighted=self.lengths/factors if self.is_faces else self.lengths*factors
+		self._weighted_mv=self._mv[:3]+(memoryview(np.ascontiguousarray(weighted,dtype=np.float32)),)
+
+	def get_mv(self,*,use_weighted_cost:bool=False)->tuple[memoryview,memoryview,memoryview,memoryview]:
+		'''CSR arrays and link lengths for the solver, weighted lengths are used only if edge costs are set.'''
+		if use_weighted_cost and self._weighted_mv is not None:return self._weighted_mv
+		return self._mv
+
+	@staticmethod
+	def _eval_csr(num_nodes:int,src:np.ndarray,dst:np.ndarray,links:np.ndarray)->tuple[np.ndarray,np.ndarray,np.ndarray]:
+		order=np.argsort(src,kind='stable')
+		indptr=np.zeros(num_nodes+1,dtype=np.int32)
+		np.cumsum(np.bincount(src,minlength=num_nodes),out=indptr[1:])
+		return indptr,np.ascontiguousarray(dst[order],dtype=np.int32),np.ascontiguousarray(links[order],dtype=np.int32)
+
+	def face_centers(self,faces:None|np.ndarray=None)->np.ndarray:
+		'''Median centers of given faces, of all faces by default.'''
+		if faces is None:
+			if not len(self.loop_totals):return np.zeros((0,3),dtype=np.float32)
+			return np.add.reduceat(self.coords[self.loop_verts],self.loop_starts,axis=0)/self.loop_totals[:,None]
+		if not len(faces):return np.zeros((0,3),dtype=np.float32)
+		totals=self.loop_totals[faces]
+		starts=np.cumsum(totals)-totals
+		return np.add.reduceat(self.coords[self.loop_verts[self.face_loops(faces)]],starts,axis=0)/totals[:,None]
+
+	def face_loops(self,faces:np.ndarray)->np.ndarray:
+		'''Indices of loops of given faces, in face order.'''
+		totals=self.loop_totals[faces]
+		offsets=np.repeat(self.loop_starts[faces]-np.cumsum(totals)+totals,totals)
+		return offsets+np.arange(int(totals.sum()),dtype=np.int32)
+
+	def face_edges(self,faces:np.ndarray)->np.ndarray:return self.loop_edges[self.face_loops(faces)]
+
+	def set_loop_triangles(self,tri_verts:np.ndarray,tri_faces:np.ndarray)->None:
+		'''Set mesh loop triangles - vertex indices of each triangle and face it belongs to, sorted by face.'''
+		self.tri_verts=np.ascontiguousarray(tri_verts,dtype=np.int32).reshape(-1,3)
+		self.tri_starts=np.zeros(len(self.loop_totals)+1,dtype=np.int32)
+		np.cumsum(np.bincount(tri_faces,minlength=len(self.loop_totals)),out=self.tri_starts[1:])
+
+	def face_triangles(self,faces:np.ndarray)->np.ndarray:
+		'''Vertex indices of loop triangles of given faces, in face order. Loop triangles should be set.'''
+		starts=self.tri_starts[faces]
+		totals=self.tri_starts[faces+1]-starts
+		offsets=np.repeat(starts-np.cumsum(totals)+totals,totals)
+		return self.tri_verts[offsets+np.arange(int(totals.sum()),dtype=np.int32)]
+
+	def fill_keys(self,fill:np.ndarray)->np.ndarray:
+		'''Nodes which path fill elements pass through - vertices of fill edges or fill faces.'''
+		if self.is_faces:return fill
+		return self.edge_verts[fill].ravel()
+
+	def _eval_lengths(self)->np.ndarray:
+		src=np.repeat(np.arange(self.num_nodes,dtype=np.int32),np.diff(self.indptr))
+		coords=self.coords
+		if self.is_faces:
+			face_centers=self.face_centers()
+			# Same cost model as Blender does for face paths - through the middle of the shared edge
+			mid=(coords[self.edge_verts[self.links,0]]+coords[self.edge_verts[self.links,1]])*0.5
+			return np.linalg.norm(face_centers[src]-mid,axis=1)+np.linalg.norm(mid-face_centers[self.indices],axis=1)
+		return np.linalg.norm(coords[src]-coords[self.indices],axis=1)
+
+	@classmethod
+	def from_arrays(cls,*,is_faces:bool,coords:np.ndarray,edge_verts:np.ndarray,edge_hide:None|np.ndarray=None,loop_verts:None|np.ndarray=None,loop_edges:None|np.ndarray=None,loop_totals:None|np.ndarray=None,face_hide:None|np.ndarray=None,topology_key:int=0,geometry_key:int=0)->MeshGraph:
+		'''Build graph from flat mesh arrays. Loop arrays are required in face mode only.'''
+		num_edges=len(edge_verts)
+		edge_visible=np.ones(num_edges,dtype=bool) if edge_hide is None else ~edge_hide
+		if is_faces:
+			num_faces=len(loop_totals)
+			loop_faces=np.repeat(np.arange(num_faces,dtype=np.int32),loop_totals)
+			loop_mask=edge_visible[loop_edges]
+			if face_hide is not None:loop_mask&=~face_hide[loop_faces]
+			l_edges=loop_edges[loop_mask]
+			l_faces=loop_faces[loop_mask]
+			order=np.argsort(l_edges,kind='stable')
+			l_edges=l_edges[order]
+			l_faces=l_faces[order]
+			src,dst,links=[],[],[]
+			# Pair every two faces which share an edge, non-manifold edges give a link for each pair of faces
+			max_edge_faces=int(np.bincount(l_edges).max()) if len(l_edges) else 0
+			for d in range(1,max_edge_faces):
+				same=l_edges[:-d]==l_edges[d:]
+				a=l_faces[:-d][same]
+				b=l_faces[d:][same]
+				e=l_edges[:-d][same]
+				src+=(a,b)
+				dst+=(b,a)
+				links+=(e,e)
+			num_nodes=num_faces
+		else:
+			e_index=np.flatnonzero(edge_visible).astype(np.int32)
+			a=edge_verts[e_index,0]
+			b=edge_verts[e_index,1]
+			src,dst,links=[a,b],[b,a],[e_index,e_index]
+			num_nodes=len(coords)
+		_empty=np.zeros(0,dtype=np.int32)
+		src=np.concatenate(src) if src else _empty
+		dst=np.concatenate(dst) if dst else _empty
+		links=np.concatenate(links) if links else _empty
+		indptr,indices,links=cls._eval_csr(num_nodes,src,dst,links)
+		r_graph=cls(is_faces=is_faces,indptr=indptr,indices=indices,links=links,lengths=np.zeros(len(indices),dtype=np.float32),coords=coords,edge_verts=edge_verts,loop_verts=loop_verts,loop_edges=loop_edges,loop_totals=loop_totals,topology_key=topology_key)
+		r_graph.update_geometry(coords=coords,geometry_key=geometry_key)
+		return r_graph
+
+	@classmethod
+	def from_mesh(cls,*,is_faces:bool,coords:np.ndarray,faces:None|Iterable[Sequence[int]]=None,edges:None|np.ndarray=None)->MeshGraph:
+		'''Build graph from plain mesh data - vertex coordinates, faces as sequences of vertex indices and edges as
+		vertex index pairs.
+
+		Edges are evaluated from faces if they are not given, faces are optional in edge mode only. In face mode
+		faces are fan triangulated for face geometry, so they are expected to be convex.
+		'''
+		coords=np.ascontiguousarray(coords,dtype=np.float32).reshape(-1,3)
+		num_verts=len(coords)
+		loop_verts=loop_edges=loop_totals=None
+		if faces is not None:
+			faces=[np.asarray(face,dtype=np.int32)for face in faces]
+			loop_totals=np.fromiter((len(face)for face in faces),dtype=np.int32,count=len(faces))
+			loop_verts=np.concatenate(faces)if faces else np.zeros(0,dtype=np.int32)
+			loop_starts=np.zeros(len(faces),dtype=np.int32)
+			np.cumsum(loop_totals[:-1],out=loop_starts[1:])
+			# Loop edge goes from loop vertex to the next vertex of the same face
+			loop_next=np.arange(1,len(loop_verts)+1,dtype=np.int32)
+			loop_next[loop_starts+loop_totals-1]=loop_starts
+			loop_keys=np.sort(np.stack((loop_verts,loop_verts[loop_next]),axis=1),axis=1)
+			loop_keys=loop_keys[:,0].astype(np.int64)*num_verts+loop_keys[:,1]
+			if edges is None:
+				edge_keys,loop_edges=np.unique(loop_keys,return_inverse=True)
+				edges=np.stack((edge_keys//num_verts,edge_keys%num_verts),axis=1)
+			else:
+				edges=np.asarray(edges,dtype=np.int32).reshape(-1,2)
+				edge_keys=np.sort(edges,axis=1)
+				edge_keys=edge_keys[:,0].astype(np.int64)*num_verts+edge_keys[:,1]
+				order=np.argsort(edge_keys,kind='stable')
+				pos=np.minimum(np.searchsorted(edge_keys,loop_keys,sorter=order),max(len(order)-1,0))
+				if not len(order) or np.any(edge_keys[order[pos]]!=loop_keys):raise ValueError('Face edges are missing from edges')
+				loop_edges=order[pos]
+			loop_edges=np.asarray(loop_edges,dtype=np.int32).ravel()
+		elif is_faces:raise ValueError('Faces are required in face mode')
+		elif edges is None:raise ValueError('Either faces or edges are required')
+		r_graph=cls.from_arrays(is_faces=is_faces,coords=coords,edge_verts=np.asarray(edges,dtype=np.int32).reshape(-1,2),loop_verts=loop_verts,loop_edges=loop_edges,loop_totals=loop_totals)
+		if is_faces:
+			num_tris=np.maximum(loop_totals-2,0)
+			tri_faces=np.repeat(np.arange(len(loop_totals),dtype=np.int32),num_tris)
+			tri_starts=np.zeros(len(num_tris),dtype=np.int32)
+			np.cumsum(num_tris[:-1],out=tri_starts[1:])
+			first=np.repeat(r_graph.loop_starts,num_tris)
+			k=np.arange(len(tri_faces),dtype=np.int32)-np.repeat(tri_starts,num_tris)
+			r_graph.set_loop_triangles(np.stack((loop_verts[first],loop_verts[first+k+1],loop_verts[first+k+2]),axis=1),tri_faces)
+		return r_graph
+
+	def update_geometry(self,*,coords:np.ndarray,geometry_key:int=0)->None:
+		'''Re-evaluate link lengths for changed vertex coordinates, adjacency stays the same.'''
+		self.coords=coords
+		self.set_lengths(self._eval_lengths(),geometry_key=geometry_key)
+
+	def uses_level_search(self,*,use_topology_distance:bool=False)->bool:
+		'''Whether ``shortest_path`` and ``shortest_paths`` run in NumPy level search, which is fast enough to be done
+		at once even on large graphs.'''
+		return use_topology_distance and self.num_nodes>=LEVEL_SEARCH_MIN_NODES
+
+	def shortest_path(self,source:int,target:int,*,use_topology_distance:bool=False,use_weighted_cost:bool=False,use_local_search:bool=True,use_global_search:bool=True,max_local_nodes:int=-1,count:None|Callable[[str],None]=None)->None|np.ndarray:
+		'''Dijkstra search between two nodes.
+
+		Returns indices of fill elements between source and target - edges along the path in edge mode and faces
+		between (not including) source and target in face mode. Empty array means that target is unreachable.
+
+		With ``use_local_search`` the search is tried inside a box around both nodes first (see ``_local_search``),
+		the result is the same. Each local search settles at most ``max_local_nodes`` nodes (any number if negative).
+		Without ``use_global_search`` only local search is tried and ``None`` is returned if it has not given the
+		result. Optional ``count(name)`` is called with "Local Solves", "Regrown Local Solves" or "Global Fallbacks"
+		for each Dijkstra search.
+		'''
+		if source==target:return EMPTY_FILL
+		if self.uses_level_search(use_topology_distance=use_topology_distance):return self._level_search(source,(target,))[0]
+		# Weighted edge lengths may be much shorter than distance in space, so a box gives no useful bound for them
+		if use_local_search and not(use_weighted_cost and not self.is_faces and self._weighted_mv is not None):
+			prev=self._local_search(source,target,use_topology_distance=use_topology_distance,use_weighted_cost=use_weighted_cost,max_nodes=max_local_nodes,count=count)
+			if prev is not None:return self._restore_path(prev,source,target)
+		if not use_global_search:return None
+		if count is not None:count('Global Fallbacks')
+		prev=self._dijkstra(source,target,use_topology_distance=use_topology_distance,use_weighted_cost=use_weighted_cost)[1]
+		if prev is None:return EMPTY_FILL
+		return self._restore_path(prev,source,target)
+
+	def _dijkstra(self,source:int,target:int,*,use_topology_distance:bool,use_weighted_cost:bool,box:None|tuple[float,float,float,float,float,float]=None,max_nodes:int=-1)->tuple[float,None|dict[int,tuple[int,int]]]:
+		'''Search until target is settled, optionally only through nodes inside of ``(min_x, min_y, min_z, max_x, max_y,
+		max_z)`` box settling at most ``max_nodes`` of them. Returns distance to the target and predecessors, which are
+		``None`` if target is not reached. Distance is negative if the box search has settled ``max_nodes`` nodes
+		before the target.'''
+		indptr,indices,links,lengths=self.get_mv(use_weighted_cost=use_weighted_cost)
+		dist={source:0.0}
+		prev:dict[int,tuple[int,int]]=dict()
+		heap=[(0.0,source)]
+		if box is None:
+			while heap:
+				d,node=heapq.heappop(heap)
+				if node==target:return d,prev
+				if d>dist[node]:continue
+				for i in range(indptr[node],indptr[node+1]):
+					other=indices[i]
+					nd=d+(1.0 if use_topology_distance else lengths[i])
+					if nd<dist.get(other,float('inf')):
+						dist[other]=nd
+						prev[other]=node,links[i]
+						heapq.heappush(heap,(nd,other))
+			return float('inf'),None
+		points=self._get_local_bounds()[0]
+		min_x,min_y,min_z,max_x,max_y,max_z=box
+		while heap:
+			d,node=heapq.heappop(heap)
+			if node==target:return d,prev
+			if d>dist[node]:continue
+			if not max_nodes:return -1.,None
+			max_nodes-=1
+			for i in range(indptr[node],indptr[node+1]):
+				other=indices[i]
+				j=3*other
+				if not(min_x<=points[j]<=max_x and min_y<=points[j+1]<=max_y and min_z<=points[j+2]<=max_z):continue
+				nd=d+(1.0 if use_topology_distance else lengths[i])
+				if nd<dist.get(other,float('inf')):
+					dist[other]=nd
+					prev[other]=node,links[i]
+					heapq.heappush(heap,(nd,other))
+		return float('inf'),None
+
+	def _get_local_bounds(self)->tuple[memoryview,np.ndarray,np.ndarray,float]:
+		'''Flat node positions (vertices or face centers), bounds of the graph and the longest link length.'''
+		if self._local_bounds is None:
+			points=np.ascontiguousarray(self.face_centers()if self.is_faces else self.coords,dtype=np.float64).reshape(-1,3)
+			if len(points):bounds=points.min(axis=0),points.max(axis=0)
+			else:bounds=np.zeros(3),np.zeros(3)
+			self._local_bounds=memoryview(points.ravel()),*bounds,float(self.lengths.max())if len(self.lengths)else 0.
+		return self._local_bounds
+
+	def _local_search(self,source:int,target:int,*,use_topology_distance:bool,use_weighted_cost:bool,max_nodes:int=-1,count:None|Callable[[str],None]=None)->None|dict[int,tuple[int,int]]:
+		'''Dijkstra search through nodes inside a box around source and target only.
+
+		Every node outside of the box is at least ``margin`` away from the segment between source and target, so a path
+		through it is not shorter than ``sqrt(span ** 2 + 4 * margin ** 2)`` in space, where ``span`` is the distance
+		between source and target. Link lengths are not shorter than the distance between nodes in space, in topology
+		distance mode each link is at most the longest link long. Result is accepted if it is shorter than the bound,
+		otherwise the box is grown enough for the found distance to fit it. A larger box would not be searched within
+		``max_nodes`` either, so the search gives up once a box search exceeds them. Returns predecessors or ``None``
+		if the whole graph should be searched.
+		'''
+		points,graph_min,graph_max,max_length=self._get_local_bounds()
+		if not max_length:return None
+		source_point=np.array(points[3*source:3*source+3])
+		target_point=np.array(points[3*target:3*target+3])
+		span=float(np.linalg.norm(source_point-target_point))
+		box_min=np.minimum(source_point,target_point)
+		box_max=np.maximum(source_point,target_point)
+		max_diagonal=LOCAL_SEARCH_MAX_EXTENT*float(np.linalg.norm(graph_max-graph_min))
+		scale=1./max_length if use_topology_distance else 1.
+		margin=max(span*LOCAL_SEARCH_MARGIN,max_length)
+		for growth in range(LOCAL_SEARCH_MAX_GROWTHS+1):
+			if np.linalg.norm(box_max-box_min+2.*margin)>max_diagonal:return None
+			d,prev=self._dijkstra(source,target,use_topology_distance=use_topology_distance,use_weighted_cost=use_weighted_cost,box=(*(box_min-margin).tolist(),*(box_max+margin).tolist()),max_nodes=max_nodes)
+			if d<0.:return None
+			if d<np.sqrt(span*span+4.*margin*margin)*scale:
+				if count is not None:count('Regrown Local Solves'if growth else'Local Solves')
+				return prev
+			# Box is grown enough for the found path to fit the bound
+			if prev is None:margin*=2.
+			else:margin=max(margin*2.,.51*np.sqrt(max((d/scale)**2-span*span,0.)))
+		return None
+
+	def _restore_path(self,prev:dict[int,tuple[int,int]],source:int,target:int)->np.ndarray:
+		r_path=[]
+		node=target
+		while node!=source:
+			node,link=prev[node]
+			r_path.append(node if self.is_faces else link)
+		r_path.reverse()
+		if self.is_faces:
+			# First item is the source face itself
+			r_path.pop(0)
+		return np.array(r_path,dtype=np.int32)
+
+	def shortest_paths(self,source:int,targets:Sequence[int],*,use_topology_distance:bool=False,use_weighted_cost:bool=False)->list[np.ndarray]:
+		'''Fill elements from source to each of targets, same as ``shortest_path`` gives for each of them.
+
+		Single search is shared by all targets and is terminated as soon as the last of them is settled.
+		'''
+		if self.uses_level_search(use_topology_distance=use_topology_distance):return self._level_search(source,targets)
+		tree=ShortestPathTree(self,source,use_topology_distance=use_topology_distance,use_weighted_cost=use_weighted_cost)
+		# Tree gives fill from target to the root
+		return [tree.path_from(target)[::-1]for target in targets]
+
+	def _level_search(self,source:int,targets:Sequence[int])->list[np.ndarray]:
+		'''Breadth-first search which expands a whole level at once until all targets are reached.
+
+		Parent of each node is its neighbour of the previous level with the smallest index, linked by the first such
+		link in CSR order, which is exactly what Dijkstra search with unit link lengths gives.
+		'''
+		indptr=self.indptr
+		parent=np.full(self.num_nodes,-1,dtype=np.int32)
+		parent_link=np.empty(self.num_nodes,dtype=np.int32)
+		parent[source]=source
+		targets=np.asarray(targets,dtype=np.int32)
+		frontier=np.array((source,),dtype=np.int32)
+		while len(frontier)and np.any(parent[targets]<0):
+			starts=indptr[frontier]
+			counts=indptr[frontier+1]-starts
+			pos=np.repeat(starts-np.cumsum(counts)+counts,counts)+np.arange(int(counts.sum()),dtype=np.int32)
+			src=np.repeat(frontier,counts)
+			dst=self.indices[pos]
+			mask=parent[dst]<0
+			src=src[mask]
+			dst=dst[mask]
+			pos=pos[mask]
+			order=np.lexsort((pos,src,dst))
+			dst=dst[order]
+			is_first=np.concatenate(((True,),dst[1:]!=dst[:-1]))
+			first=order[is_first]
+			frontier=dst[is_first]
+			parent[frontier]=src[first]
+			parent_link[frontier]=self.links[pos[first]]
+		ret=list()
+		for target in targets.tolist():
+			if target==source or parent[target]<0:
+				ret.append(EMPTY_FILL)
+				continue
+			r_path=[]
+			node=target
+			while node!=source:
+				r_path.append(node if self.is_faces else int(parent_link[node]))
+				node=int(parent[node])
+			if self.is_faces:
+				r_path.append(source)
+				# First item is the source face itself, last one is the target face
+				r_path=r_path[1:-1]
+			r_path.reverse()
+			ret.append(np.array(r_path,dtype=np.int32))
+		return ret
+
+def eval_connected_components(num_nodes:int,src:np.ndarray,dst:np.ndarray)->np.ndarray:
+	'''Vectorized union-find, returns compact component label of each node.
+
+	Every iteration hooks root of each link to the smaller of two roots and then compresses parent pointers until
+	each node points directly to its root. Number of iterations is logarithmic in practice.
+	'''
+	parent=np.arange(num_nodes,dtype=np.int32)
+	while True:
+		root_a=parent[src]
+		root_b=parent[dst]
+		mask=root_a!=root_b
+		if not np.any(mask):break
+		root_a=root_a[mask]
+		root_b=root_b[mask]
+		np.minimum.at(parent,np.maximum(root_a,root_b),np.minimum(root_a,root_b))
+		while True:
+			grand_parent=parent[parent]
+			if np.array_equal(grand_parent,parent):break
+			parent=grand_parent
+	return np.unique(parent,return_inverse=True)[1].astype(np.int32)
+
+class ShortestPathTree:
+	'''Single-source shortest path tree which is grown on demand.
+
+	Dijkstra state is kept between queries, so the search is advanced only until the queried node is settled and
+	the path to the root is then restored by walking back predecessor links. Used while dragging a control element
+	with roots at neighbour control elements which stay fixed during the drag, and by progressive solving which
+	advances the search in bounded slices.
+	'''
+	__slots__='graph','root','use_topology_distance','use_weighted_cost','_dist','_prev','_settled','_heap','_order'
+	graph:MeshGraph
+	root:int
+	use_topology_distance:bool
+	use_weighted_cost:bool
+
+	def __init__(self,graph:MeshGraph,root:int,*,use_topology_distance:bool=False,use_weighted_cost:bool=False):
+		self.graph=graph
+		self.root=root
+		self.use_topology_distance=use_topology_distance
+		self.use_weighted_cost=use_weighted_cost
+		self._dist={root:0.0}
+		self._prev:dict[int,tuple[int,int]]=dict()
+		self._settled:set[int]=set()
+		self._heap=[(0.0,root)]
+		self._order:list[int]=list()
+
+	@property
+	def num_settled(self)->int:return len(self._order)
+
+	@property
+	def settled_nodes(self)->list[int]:
+		'''Settled nodes in order of their distance from the root. The list is owned by the tree.'''
+		return self._order
+
+	def settle(self,target:int,*,max_nodes:int=-1)->None|bool:
+		'''Advance the search until target is settled. Returns whether target is reachable from the root.
+
+		If ``max_nodes`` is not negative, at most that many nodes are settled by the call and ``None`` is returned if
+		the target is not settled yet, so the search can be continued by the next call.
+		'''
+		settled=self._settled
+		if target in settled:return True
+		indptr,indices,links,lengths=self.graph.get_mv(use_weighted_cost=self.use_weighted_cost)
+		dist=self._dist
+		prev=self._prev
+		heap=self._heap
+		order=self._order
+		use_topology_distance=self.use_topology_distance
+		while heap:
+			if not max_nodes:return None
+			d,node=heapq.heappop(heap)
+			if node in settled:continue
+			max_nodes-=1
+			settled.add(node)
+			order.append(node)
+			for i in range(indptr[node],indptr[node+1]):
+				other=indices[i]
+				nd=d+(1.0 if use_topology_distance else lengths[i])
+				if nd<dist.get(other,float('inf')):
+					dist[other]=nd
+					prev[other]=node,links[i]
+					heapq.heappush(heap,(nd,other))
+			if node==target:return True
+		return False
+
+	def path_from(self,node:int)->np.ndarray:
+		'''Fill elements from node to the root, same as ``MeshGraph.shortest_path(node, root)`` would give.'''
+		if node==self.root or not self.settle(node):return EMPTY_FILL
+		prev=self._prev
+		is_faces=self.graph.is_faces
+		r_path=[]
+		while node!=self.root:
+			node,link=prev[node]
+			r_path.append(node if is_faces else link)
+		if is_faces:
+			# Last item is the root face itself
+			r_path.pop(-1)
+		return np.array(r_path,dtype=np.int32)
+
+def eval_face_normals(coords:np.ndarray,loop_verts:np.ndarray,loop_starts:np.ndarray,loop_totals:np.ndarray)->np.ndarray:
+	'''Unit face normals by Newell's method, which also works for non-planar n-gons.'''
+	if not len(loop_totals):return np.zeros((0,3),dtype=np.float32)
+	loop_next=np.arange(1,len(loop_verts)+1,dtype=np.int32)
+	loop_next[loop_starts+loop_totals-1]=loop_starts
+	normals=np.add.reduceat(np.cross(coords[loop_verts],coords[loop_verts[loop_next]]),loop_starts,axis=0)
+	length=np.linalg.norm(normals,axis=1,keepdims=True)
+	return (normals/np.where(length>0.,length,1.)).astype(np.float32)
+
+def eval_uv_boundaries(num_edges:int,loop_verts:np.ndarray,loop_edges:np.ndarray,loop_starts:np.ndarray,loop_totals:np.ndarray,uvs:np.ndarray,*,eps:float=1e-5)->np.ndarray:
+	'''Mask of edges which have different UV coordinates in different faces (UV island boundaries).'''
+	loop_next=np.arange(1,len(loop_verts)+1,dtype=np.int32)
+	loop_next[loop_starts+loop_totals-1]=loop_starts
+	# UV coordinates of edge ends ordered by vertex index, so both faces of an edge give the same order
+	swap=loop_verts>loop_verts[loop_next]
+	edge_uvs=np.where(swap[:,None],np.hstack((uvs[loop_next],uvs)),np.hstack((uvs,uvs[loop_next])))
+	order=np.argsort(loop_edges,kind='stable')
+	edges=loop_edges[order]
+	edge_uvs=edge_uvs[order]
+	first=np.searchsorted(edges,edges)
+	differs=np.abs(edge_uvs-edge_uvs[first]).max(axis=1)>eps
+	ret=np.zeros(num_edges,dtype=bool)
+	ret[edges[differs]]=True
+	return ret
+
+def eval_edge_costs(*,coords:np.ndarray,edge_verts:np.ndarray,loop_verts:np.ndarray,loop_edges:np.ndarray,loop_totals:np.ndarray,edge_marks:None|np.ndarray=None,uv_boundaries:None|np.ndarray=None)->np.ndarray:
+	'''Per-edge float32 cost factors of weighted solving.
+
+	Edge features - dihedral angle relative to right angle, seam or sharp mark (``edge_marks``) and UV boundary -
+	are summed with ``COST_*_WEIGHT`` weights and clamped to one. Factor falls linearly from one for featureless
+	edges to ``COST_MIN_FACTOR`` for edges with full feature strength. Edges with less than two faces have no angle.
+	'''
+	num_edges=len(edge_verts)
+	features=np.zeros(num_edges,dtype=np.float32)
+	if len(loop_totals):
+		loop_starts=np.zeros(len(loop_totals),dtype=np.int32)
+		np.cumsum(loop_totals[:-1],out=loop_starts[1:])
+		normals=eval_face_normals(coords,loop_verts,loop_starts,loop_totals)
+		loop_faces=np.repeat(np.arange(len(loop_totals),dtype=np.int32),loop_totals)
+		order=np.argsort(loop_edges,kind='stable')
+		edges=loop_edges[order]
+		faces=loop_faces[order]
+		# Angle between the first two faces of each edge
+		same=np.flatnonzero(edges[:-1]==edges[1:])
+		same=same[np.unique(edges[same],return_index=True)[1]]
+		cos_angle=np.clip(np.einsum('ij,ij->i',normals[faces[same]],normals[faces[same+1]]),-1.,1.)
+		features[edges[same]]+=COST_ANGLE_WEIGHT*np.arccos(cos_angle)/(.5*np.pi)
+	if edge_marks is not None:features+=COST_MARK_WEIGHT*edge_marks
+	if uv_boundaries is not None:features+=COST_UV_WEIGHT*uv_boundaries
+	np.clip(features,0.,1.,out=features)
+	return (1.-(1.-COST_MIN_FACTOR)*features).astype(np.float32)
@@ -0,0 +1,354 @@
+from __future__ import annotations
+import itertools
+from enum import auto,IntFlag
+import numpy as np
+from typing import Any,Callable
+from.graph import EMPTY_FILL
+from typing import TYPE_CHECKING
+if TYPE_CHECKING:from.graph import MeshGraph;from..drawlist import Geometry
+__all__='PathFlag','PathDirty','DoublesEvent','PathState','Path','remove_doubles','join_adjacent'
+
+_segment_tokens=itertools.count()
+
+class PathFlag(IntFlag):
+	CLOSED=auto()
+	REVERSED=auto()
+	TOPOLOGY=auto()
+	WEIGHTED=auto()
+
+class PathDirty(IntFlag):
+	GEOMETRY=auto()
+	STYLE=auto()
+	ACTIVE=auto()
+
+class DoublesEvent(IntFlag):
+	'''What ``remove_doubles`` has done to the path.'''
+	NONE=0
+	CLOSED=auto()
+	MERGED=auto()
+
+class PathState:
+	'''Immutable snapshot of path for undo history.
+
+	Fill segment arrays are read-only and shared between path, its snapshots and other snapshots - snapshot of
+	unchanged path is reused, snapshot of changed path references new arrays only for segments which were solved
+	again. Draw geometry of segments and control elements is shared the same way.
+	'''
+	__slots__='island_index','ob','graph','geom_control_elements','control_elements','fill_elements','geom_seq_fills','flag'
+	island_index:int
+	ob:Any
+	graph:None|MeshGraph
+	geom_control_elements:None|Geometry
+	control_elements:tuple[int,...]
+	fill_elements:tuple[np.ndarray,...]
+	geom_seq_fills:tuple[None|Geometry,...]
+	flag:PathFlag
+
+	def __init__(self,path:Path):
+		self.island_index=path.island_index
+		self.ob=path.ob
+		self.graph=path.graph
+		self.geom_control_elements=path.geom_control_elements
+		self.control_elements=tuple(path.control_elements)
+		self.fill_elements=tuple(path.fill_elements)
+		self.geom_seq_fills=tuple(path.geom_seq_fills)
+		self.flag=path.flag
+
+	def iter_nbytes_items(self):
+		'''Items of snapshot for ``history.UndoHistory`` - the snapshot itself (three tuples of pointers), fill segments and draw geometry.'''
+		yield self,64+24*len(self.control_elements)
+		for fill_seq in self.fill_elements:
+			if len(fill_seq):yield fill_seq,fill_seq.nbytes
+		for geometry in self.geom_seq_fills+(self.geom_control_elements,):
+			if geometry is not None:yield geometry,geometry.nbytes
+
+class Path:
+	'''Path of control elements connected by fill segments.
+
+	Elements are stored as indices into mesh of the path object - control elements are vertex or face indices and
+	each fill segment is an int32 array of edge or face indices. The path object (``ob``) is only compared for
+	identity, so any hashable owner of the mesh graph can be used outside of Blender.
+
+	Besides element lists path keeps hash indices for membership queries - control element to its index and
+	queried element (vertex of fill edge or fill face) to tokens of segments which contain it. Segment tokens are
+	stable while segment positions shift, so only token positions and control element indices (number of control
+	elements long) are re-evaluated on structural changes. Indices are evaluated lazily for copies of the path.
+
+	Changes of path geometry and style are accumulated in ``dirty`` flags until the path is drawn again.
+	'''
+	__slots__='island_index','ob','graph','_geom_control_elements','control_elements','fill_elements','geom_seq_fills','_flag','dirty','draw_active','draw_buffers','_tokens','_ce_index','_token_pos','_fill_refs','_state'
+	island_index:int
+	ob:Any
+	graph:None|MeshGraph
+	_geom_control_elements:None|Geometry
+	control_elements:list[int]
+	fill_elements:list[np.ndarray]
+	geom_seq_fills:list[None|Geometry]
+	_flag:PathFlag
+	dirty:PathDirty
+	draw_active:bool
+	draw_buffers:None|dict[str,dict[str,np.ndarray]]
+	_tokens:list[int]
+	_ce_index:dict[int,int]
+	_token_pos:dict[int,int]
+	_fill_refs:None|dict[int,list[int]]
+	_state:None|PathState
+
+	def __init__(self,elem:None|int=None,linked_island_index:int=0,ob:Any=None,mesh_graph:None|MeshGraph=None):
+		self.dirty=PathDirty.GEOMETRY|PathDirty.STYLE|PathDirty.ACTIVE
+		self.draw_active=False
+		self.draw_buffers=None
+		self.island_index=linked_island_index
+		self.ob=ob
+		self.graph=mesh_graph
+		self.geom_control_elements=None
+		self.control_elements=list()
+		self.fill_elements=list()
+		self.geom_seq_fills=list()
+		self._tokens=list()
+		self._fill_refs=dict()
+		self._state=None
+		if elem is not None:
+			self.control_elements.append(elem)
+			self.fill_elements.append(EMPTY_FILL)
+			self.geom_seq_fills.append(None)
+			self._tokens.append(next(_segment_tokens))
+		self.flag=PathFlag(0)
+		self._reindex()
+
+	def __repr__(self):
+		geom_seq_fills_formatted=[]
+		for i,geometry in enumerate(self.geom_seq_fills):
+			if geometry:
+				geom_seq_fills_formatted.append('fg_%d'%i)
+				continue
+			geom_seq_fills_formatted.append(geometry)
+		return '\nPath [id:%d]:\n    ce: %s\n    fe: %s\n    fg: %s'%(id(self),str(self.control_elements),str([len(n)for n in self.fill_elements]),str(geom_seq_fills_formatted))
+
+	@property
+	def flag(self)->PathFlag:return self._flag
+
+	@flag.setter
+	def flag(self,value:PathFlag)->None:
+		self._flag=value
+		self.dirty|=PathDirty.STYLE
+
+	@property
+	def geom_control_elements(self)->None|Geometry:return self._geom_control_elements
+
+	@geom_control_elements.setter
+	def geom_control_elements(self,value:None|Geometry)->None:
+		self._geom_control_elements=value
+		self.dirty|=PathDirty.GEOMETRY
+
+	def _iter_fill_keys(self,fill_seq:np.ndarray):
+		if len(fill_seq):yield from self.graph.fill_keys(fill_seq).tolist()
+
+	def _reindex(self)->None:
+		self._ce_index=dict()
+		self._state=None
+		self.dirty|=PathDirty.GEOMETRY
+		for i,elem in enumerate(self.control_elements):self._ce_index.setdefault(elem,i)
+		self._token_pos={token:i for i,token in enumerate(self._tokens)}
+
+	def _get_fill_refs(self)->dict[int,list[int]]:
+		if self._fill_refs is None:
+			self._fill_refs=dict()
+			for token,fill_seq in zip(self._tokens,self.fill_elements):self._add_fill_refs(token,fill_seq)
+		return self._fill_refs
+
+	def _add_fill_refs(self,token:int,fill_seq:np.ndarray)->None:
+		fill_refs=self._fill_refs
+		if fill_refs is not None:
+			for key in self._iter_fill_keys(fill_seq):
+				if key in fill_refs:fill_refs[key].append(token)
+				else:fill_refs[key]=[token]
+
+	def _remove_fill_refs(self,token:int,fill_seq:np.ndarray)->None:
+		fill_refs=self._fill_refs
+		if fill_refs is not None:
+			for key in self._iter_fill_keys(fill_seq):
+				tokens=fill_refs.get(key)
+				if tokens:
+					tokens.remove(token)
+					if not tokens:del fill_refs[key]
+
+	def copy(self)->Path:
+		new_path=Path()
+		new_path.control_elements=self.control_elements.copy()
+		new_path.fill_elements=self.fill_elements.copy()
+		new_path.geom_seq_fills=self.geom_seq_fills.copy()
+		new_path._tokens=self._tokens.copy()
+		new_path._ce_index=self._ce_index.copy()
+		new_path._token_pos=self._token_pos.copy()
+		new_path._fill_refs=None
+		new_path._state=self._state
+		new_path.geom_control_elements=self.geom_control_elements
+		new_path.island_index=self.island_index
+		new_path.ob=self.ob
+		new_path.graph=self.graph
+		new_path.flag=self.flag
+		return new_path
+
+	def get_state(self)->PathState:
+		'''Snapshot of path, reused while the path has not changed.'''
+		state=self._state
+		if state is None or state.flag!=self.flag or state.geom_control_elements is not self.geom_control_elements:state=self._state=PathState(self)
+		return state
+
+	@classmethod
+	def from_state(cls,state:PathState)->Path:
+		new_path=cls()
+		new_path.island_index=state.island_index
+		new_path.ob=state.ob
+		new_path.graph=state.graph
+		new_path.geom_control_elements=state.geom_control_elements
+		new_path.control_elements=list(state.control_elements)
+		new_path.fill_elements=list(state.fill_elements)
+		new_path.geom_seq_fills=list(state.geom_seq_fills)
+		new_path.flag=state.flag
+		new_path._tokens=[next(_segment_tokens)for _ in state.fill_elements]
+		new_path._fill_refs=None
+		new_path._reindex()
+		new_path._state=state
+		return new_path
+
+	def reverse(self)->Path:
+		if len(self.control_elements)<2:return self
+		self.control_elements.reverse()
+		for arr in(self.fill_elements,self.geom_seq_fills,self._tokens):
+			close_path_item=arr.pop(-1)
+			arr.reverse()
+			arr.append(close_path_item)
+		self.flag^=PathFlag.REVERSED
+		self._reindex()
+		return self
+
+	def is_in_control_elements(self,ob:Any,elem:int)->None|int:
+		if ob==self.ob:return self._ce_index.get(elem)
+
+	def is_in_fill_elements(self,ob:Any,elem:int)->None|int:
+		if ob!=self.ob:return
+		tokens=self._get_fill_refs().get(elem)
+		if tokens:return min(self._token_pos[token]for token in tokens)
+
+	def set_control_element(self,elem_index:int,elem:int)->None:
+		self.control_elements[elem_index]=elem
+		self._reindex()
+
+	def set_fill(self,fill_index:int,fill_seq:np.ndarray,geometry:None|Geometry=None)->None:
+		fill_seq.flags.writeable=False
+		self._state=None
+		self.dirty|=PathDirty.GEOMETRY
+		token=self._tokens[fill_index]
+		self._remove_fill_refs(token,self.fill_elements[fill_index])
+		self.fill_elements[fill_index]=fill_seq
+		self.geom_seq_fills[fill_index]=geometry
+		self._add_fill_refs(token,fill_seq)
+
+	def insert_control_element(self,elem_index:int,elem:int)->None:
+		self.control_elements.insert(elem_index,elem)
+		self.fill_elements.insert(elem_index,EMPTY_FILL)
+		self.geom_seq_fills.insert(elem_index,None)
+		self._tokens.insert(elem_index,next(_segment_tokens))
+		self._reindex()
+
+	def remove_control_element(self,elem:int)->None:
+		elem_index=self.control_elements.index(elem)
+		self.pop_control_element(elem_index)
+
+	def pop_control_element(self,elem_index:int)->int:
+		elem=self.control_elements.pop(elem_index)
+		pop_index=elem_index-1
+		if elem_index==0:pop_index=0
+		self.geom_seq_fills.pop(pop_index)
+		self._remove_fill_refs(self._tokens.pop(pop_index),self.fill_elements.pop(pop_index))
+		self._reindex()
+		return elem
+
+	def join(self,other:Path)->bool:
+		'''Join other path to this one if they have common end control element. Other path is consumed.'''
+		if other.ob!=self.ob:return False
+		a,b=self,other
+		if a.control_elements[-1]==b.control_elements[0]:pass
+		elif a.control_elements[0]==b.control_elements[-1]:a,b=b,a
+		elif a.control_elements[0]==b.control_elements[0]:
+			b.reverse()
+			a,b=b,a
+		elif a.control_elements[-1]==b.control_elements[-1]:b.reverse()
+		else:return False
+		# First path ends where the second one starts, its closing segment is empty since both paths are open
+		fill_refs=None
+		if self._fill_refs is not None and other._fill_refs is not None:
+			fill_refs=self._fill_refs
+			for key,tokens in other._fill_refs.items():
+				if key in fill_refs:fill_refs[key].extend(tokens)
+				else:fill_refs[key]=tokens
+		self.control_elements=a.control_elements[:-1]+b.control_elements
+		self.fill_elements=a.fill_elements[:-1]+b.fill_elements
+		self.geom_seq_fills=a.geom_seq_fills[:-1]+b.geom_seq_fills
+		self._tokens=a._tokens[:-1]+b._tokens
+		self._fill_refs=fill_refs
+		self._reindex()
+		return True
+
+	def find_segment(self,elem_0:int,elem_1:int)->None|int:
+		'''Fill index of the segment between two control elements in either order, if there is one.'''
+		control_elements=self.control_elements
+		pair={elem_0,elem_1}
+		for fill_index in range(len(control_elements)-1):
+			if{control_elements[fill_index],control_elements[fill_index+1]}==pair:return fill_index
+		if self.flag&PathFlag.CLOSED and len(control_elements)>2 and{control_elements[-1],control_elements[0]}==pair:return -1
+		return None
+
+	def get_pairs_items(self,elem_index:int)->list[list[int]]:
+		'''``[elem_0, elem_1, fill_index]`` items of segments adjacent to the control element.'''
+		r_pairs=list()
+		num_ce=len(self.control_elements)
+		if num_ce<2:return r_pairs
+		if elem_index<0:elem_index=0
+		if elem_index>num_ce-1:elem_index=num_ce-1
+		elem=self.control_elements[elem_index]
+		# Pair with previous element
+		if elem_index>0:r_pairs.append([elem,self.control_elements[elem_index-1],elem_index-1])
+		# Pair with next element
+		if elem_index<num_ce-1:r_pairs.append([elem,self.control_elements[elem_index+1],elem_index])
+		# Closed path connection
+		if self.flag&PathFlag.CLOSED and num_ce>2 and elem_index in(0,num_ce-1):r_pairs.append([self.control_elements[0],self.control_elements[-1],-1])
+		return r_pairs
+
+def remove_doubles(path:Path,*,update_fills:Callable[[Path,int],None])->DoublesEvent:
+	'''Merge repeated control elements of the path.
+
+	Same first and last control elements close the path, same adjacent control elements are merged into one.
+	``update_fills(path, elem_index)`` is called to solve segments adjacent to changed control elements.
+	'''
+	ret=DoublesEvent.NONE
+	for i,control_element in enumerate(path.control_elements):
+		if path.control_elements.count(control_element)>1:
+			for j,other_control_element in enumerate(path.control_elements):
+				if i!=j and other_control_element==control_element:
+					if i==0 and j==len(path.control_elements)-1:
+						path.pop_control_element(-1)
+						if not path.flag&PathFlag.CLOSED:
+							path.flag|=PathFlag.CLOSED
+							ret|=DoublesEvent.CLOSED
+						update_fills(path,0)
+					elif i in(j-1,j+1):
+						path.pop_control_element(j)
+						ret|=DoublesEvent.MERGED
+	return ret
+
+def join_adjacent(paths:list[Path],active:Path)->bool:
+	'''Join the first open path of the same island which shares an end control element with the active open path.
+
+	Joined path is removed from the list, returns whether paths were joined.
+	'''
+	if not active.control_elements or active.flag&PathFlag.CLOSED:return False
+	for other in paths:
+		if other is not active and active.island_index==other.island_index and not other.flag&PathFlag.CLOSED:
+			if not other.control_elements:continue
+			if active.join(other):
+				paths.remove(other)
+				return True
+	return False
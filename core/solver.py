@@ -0,0 +1,161 @@
+from __future__ import annotations
+import numpy as np
+from typing import Any,Callable,Iterable
+from.graph import EMPTY_FILL,ShortestPathTree
+from.path import PathFlag
+from typing import TYPE_CHECKING
+if TYPE_CHECKING:from.path import Path
+__all__='solve_fill','solve_path','update_fills','update_fills_many','update_path_fills','ProgressiveFill'
+
+def solve_fill(path:Path,elem_0:int,elem_1:int,*,use_global_search:bool=True,max_local_nodes:int=-1,count:None|Callable[[str],None]=None)->None|np.ndarray:
+	'''Fill segment between two control elements of the path with its distance mode. Search options and ``count``,
+	which receives local search statistics, are the same as of ``MeshGraph.shortest_path``.'''
+	return path.graph.shortest_path(elem_0,elem_1,use_topology_distance=bool(path.flag&PathFlag.TOPOLOGY),use_weighted_cost=bool(path.flag&PathFlag.WEIGHTED),use_global_search=use_global_search,max_local_nodes=max_local_nodes,count=count)
+
+def solve_path(path:Path)->list[np.ndarray]:
+	'''Fills of all segments of the path, indexed as ``Path.fill_elements`` - segment from each control element to the
+	next one, the last one is the closing segment.
+
+	Searches are rooted at every second control element and settle both neighbour control elements, so each search
+	serves two segments.
+	'''
+	control_elements=path.control_elements
+	num_ce=len(control_elements)
+	ret=[EMPTY_FILL]*num_ce
+	graph=path.graph
+	if graph is None or num_ce<2:return ret
+	is_closed=bool(path.flag&PathFlag.CLOSED)and num_ce>2
+	num_segments=num_ce if is_closed else num_ce-1
+	# Items of a search are (root, ((fill_index, target, is_reversed), ...)), fill goes from the first control element of the segment
+	searches=list()
+	is_covered=[False]*num_segments
+	for root_index in range(1,num_ce,2):
+		items=[(root_index-1,control_elements[root_index-1],True)]
+		if root_index<num_segments:items.append((root_index,control_elements[(root_index+1)%num_ce],False))
+		for item in items:is_covered[item[0]]=True
+		searches.append((control_elements[root_index],items))
+	for fill_index in range(num_segments):
+		if not is_covered[fill_index]:searches.append((control_elements[fill_index],[(fill_index,control_elements[(fill_index+1)%num_ce],False)]))
+	use_topology_distance=bool(path.flag&PathFlag.TOPOLOGY)
+	use_weighted_cost=bool(path.flag&PathFlag.WEIGHTED)
+	for root,items in searches:
+		fills=graph.shortest_paths(root,[target for _fill_index,target,_is_reversed in items],use_topology_distance=use_topology_distance,use_weighted_cost=use_weighted_cost)
+		for(fill_index,_target,is_reversed),fill_seq in zip(items,fills):ret[fill_index]=fill_seq[::-1]if is_reversed else fill_seq
+	return ret
+
+def update_path_fills(path:Path,*,gen_geometry:None|Callable[[np.ndarray],Any]=None)->None:
+	'''Solve all segments of the path with ``solve_path``, optional ``gen_geometry(fill_seq)`` gives draw geometry of
+	each non-empty segment.'''
+	for fill_index,fill_seq in enumerate(solve_path(path)):
+		geometry=None
+		if len(fill_seq)and gen_geometry is not None:geometry=gen_geometry(fill_seq)
+		path.set_fill(fill_index,fill_seq,geometry)
+
+def update_fills(path:Path,elem_index:int,*,solve:None|Callable[[Path,int,int],np.ndarray]=None,gen_geometry:None|Callable[[np.ndarray],Any]=None)->None:
+	'''Solve segments adjacent to the control element again.
+
+	``solve(path, elem_0, elem_1)`` defaults to ``solve_fill``, optional ``gen_geometry(fill_seq)`` gives draw
+	geometry of each non-empty segment.
+	'''
+	if solve is None:solve=solve_fill
+	for elem_0,elem_1,fill_index in path.get_pairs_items(elem_index):
+		fill_seq=EMPTY_FILL
+		geometry=None
+		if path.graph is not None:fill_seq=solve(path,elem_0,elem_1)
+		if len(fill_seq) and gen_geometry is not None:geometry=gen_geometry(fill_seq)
+		path.set_fill(fill_index,fill_seq,geometry)
+
+def update_fills_many(items:Iterable[tuple[Path,int]],*,solve:None|Callable[[Path,int,int],np.ndarray]=None,gen_geometry:None|Callable[[Path,np.ndarray],Any]=None)->int:
+	'''Same as ``update_fills`` for several ``(path, elem_index)`` items at once, paths may belong to different graphs,
+	so ``gen_geometry(path, fill_seq)`` also takes the path. Returns the number of solved segments.
+
+	Each segment is solved once even if both of its control elements are given.
+	'''
+	if solve is None:solve=solve_fill
+	segments=list()
+	keys=set()
+	for path,elem_index in items:
+		for elem_0,elem_1,fill_index in path.get_pairs_items(elem_index):
+			key=id(path),fill_index%len(path.fill_elements)
+			if key in keys:continue
+			keys.add(key)
+			segments.append((path,elem_0,elem_1,fill_index))
+	for path,elem_0,elem_1,fill_index in segments:
+		fill_seq=EMPTY_FILL
+		if path.graph is not None:fill_seq=solve(path,elem_0,elem_1)
+		geometry=None
+		if len(fill_seq)and gen_geometry is not None:geometry=gen_geometry(path,fill_seq)
+		path.set_fill(fill_index,fill_seq,geometry)
+	return len(segments)
+
+class ProgressiveFill:
+	'''Segment fill which is solved in bounded slices, so a long search does not block the caller.
+
+	The search grows a shortest path tree from one control element of the segment until the other one is settled.
+	Until then, the preview is the path from the root to the settled node which is nearest in space to the target.
+	The tree may be shared with other queries, for example a drag tree rooted at a fixed neighbour control element.
+	'''
+	__slots__='path','elem_0','elem_1','tree','target','fill','_reverse','_target_point','_num_checked','_best_node','_best_dist','_num_island_nodes'
+	path:Path
+	elem_0:int
+	elem_1:int
+	tree:ShortestPathTree
+	target:int
+	fill:None|np.ndarray
+
+	def __init__(self,path:Path,elem_0:int,elem_1:int,*,tree:None|ShortestPathTree=None):
+		self.path=path
+		self.elem_0=elem_0
+		self.elem_1=elem_1
+		if tree is None:tree=ShortestPathTree(path.graph,elem_1,use_topology_distance=bool(path.flag&PathFlag.TOPOLOGY),use_weighted_cost=bool(path.flag&PathFlag.WEIGHTED))
+		self.tree=tree
+		# Tree rooted at the second element gives fill in the same order as ``solve_fill`` does
+		self._reverse=tree.root!=elem_1
+		self.target=elem_1 if self._reverse else elem_0
+		self.fill=None
+		self._target_point=None
+		self._num_checked=0
+		self._best_node=tree.root
+		self._best_dist=float('inf')
+		self._num_island_nodes=0
+
+	@property
+	def is_done(self)->bool:return self.fill is not None
+
+	@property
+	def progress(self)->float:
+		'''Fraction of nodes of the island which have been settled, the search usually ends before all of them.'''
+		if self.fill is not None:return 1.
+		if not self._num_island_nodes:
+			labels=self.tree.graph.island_labels
+			self._num_island_nodes=int(np.count_nonzero(labels==labels[self.tree.root]))
+		return min(1.,self.tree.num_settled/self._num_island_nodes)
+
+	def step(self,max_nodes:int=-1)->bool:
+		'''Settle at most ``max_nodes`` more nodes (all if negative). Returns whether the fill is solved.'''
+		if self.fill is not None:return True
+		if self.tree.settle(self.target,max_nodes=max_nodes)is None:return False
+		fill=self.tree.path_from(self.target)
+		self.fill=fill[::-1]if self._reverse else fill
+		return True
+
+	def _eval_points(self,nodes:np.ndarray)->np.ndarray:
+		graph=self.tree.graph
+		if graph.is_faces:return graph.face_centers(nodes)
+		return graph.coords[nodes]
+
+	def preview(self)->np.ndarray:
+		'''Partial fill from the root towards the target, the solved fill once it is done.'''
+		if self.fill is not None:return self.fill
+		if self._target_point is None:self._target_point=self._eval_points(np.array((self.target,),dtype=np.int32))[0]
+		nodes=self.tree.settled_nodes
+		if len(nodes)>self._num_checked:
+			new_nodes=np.array(nodes[self._num_checked:],dtype=np.int32)
+			self._num_checked=len(nodes)
+			dist=np.einsum('ij,ij->i',*(self._eval_points(new_nodes)-self._target_point,)*2)
+			i=int(np.argmin(dist))
+			if dist[i]<self._best_dist:
+				self._best_dist=float(dist[i])
+				self._best_node=int(new_nodes[i])
+		fill=self.tree.path_from(self._best_node)
+		return fill[::-1]if self._reverse else fill
@@ -0,0 +1,96 @@
+from __future__ import annotations
+import numpy as np
+from typing import Iterable
+__all__='STYLE_ACTIVE','STYLE_TOPOLOGY','Geometry','DrawList','merge'
+
+STYLE_ACTIVE=1
+'''Style flag of fill segments of the active path and of the active control element.'''
+STYLE_TOPOLOGY=2
+'''Style flag of fill segments of paths which use topology distance.'''
+
+class Geometry:
+	'''Vertex data of a fill segment or of control elements of a path, in object space.
+
+	``coords`` are vertex positions, ``indices`` - optional triangle vertex indices. Vertices starting from
+	``active_start`` belong to the active element.
+	'''
+	__slots__='coords','indices','active_start'
+	coords:np.ndarray
+	indices:None|np.ndarray
+	active_start:None|int
+
+	def __init__(self,coords:np.ndarray,indices:None|np.ndarray=None,active_start:None|int=None):
+		self.coords=np.ascontiguousarray(coords,dtype=np.float32).reshape(-1,3)
+		self.indices=None if indices is None else np.ascontiguousarray(indices,dtype=np.int32).reshape(-1,3)
+		self.active_start=active_start
+
+	@property
+	def nbytes(self)->int:
+		ret=self.coords.nbytes
+		if self.indices is not None:ret+=self.indices.nbytes
+		return ret
+
+class DrawList:
+	'''Builder of merged draw buffers.
+
+	Geometry of all paths is packed into one contiguous buffer per layer (for example fill segments and control
+	elements), so each layer is drawn with a single call regardless of number of paths and segments. Coordinates
+	are transformed to world space and each vertex gets ``v_Style`` attribute. All geometry of a
+	layer should be either indexed or not. Building uses NumPy only, GPU batches are created from its result.
+	Buffers of separate draw lists can be combined with ``merge``, so unchanged parts are not built again.
+	'''
+	__slots__='_layers',
+	_layers:dict[str,list[tuple[Geometry,None|np.ndarray,int,int]]]
+
+	def __init__(self):
+		self._layers=dict()
+
+	def add(self,layer:str,geometry:None|Geometry,*,matrix:None|np.ndarray=None,style:int=0,active_style:int=0)->None:
+		'''Append geometry to layer, ``active_style`` flags are added to style of the active element vertices.'''
+		if geometry is None or not len(geometry.coords):return
+		if matrix is not None:matrix=np.asarray(matrix,dtype=np.float32)
+		self._layers.setdefault(layer,list()).append((geometry,matrix,style,active_style))
+
+	def build(self)->dict[str,dict[str,np.ndarray]]:
+		'''Buffers of each non-empty layer - ``P``, ``v_Style`` and ``indices`` for indexed layers.'''
+		ret=dict()
+		for layer,items in self._layers.items():
+			num_verts=sum(len(item[0].coords)for item in items)
+			coords=np.empty((num_verts,3),dtype=np.float32)
+			styles=np.empty(num_verts,dtype=np.int32)
+			indices=list()
+			offset=0
+			for geometry,matrix,style,active_style in items:
+				end=offset+len(geometry.coords)
+				if matrix is None:coords[offset:end]=geometry.coords
+				else:
+					np.matmul(geometry.coords,matrix[:3,:3].T,out=coords[offset:end])
+					coords[offset:end]+=matrix[:3,3]
+				styles[offset:end]=style
+				if active_style and geometry.active_start is not None:styles[offset+geometry.active_start:end]|=active_style
+				if geometry.indices is not None:indices.append(geometry.indices+offset)
+				offset=end
+			buffers=dict(P=coords,v_Style=styles)
+			if indices:buffers['indices']=np.concatenate(indices)
+			ret[layer]=buffers
+		return ret
+
+def merge(parts:Iterable[dict[str,dict[str,np.ndarray]]])->dict[str,dict[str,np.ndarray]]:
+	'''Merge buffers built by separate draw lists (for example, one per path) layer by layer.
+
+	Indices are offset by the number of preceding vertices of the layer. Parts are merged in the given order.
+	'''
+	layers:dict[str,list[dict[str,np.ndarray]]]=dict()
+	for buffers in parts:
+		for layer,layer_buffers in buffers.items():layers.setdefault(layer,list()).append(layer_buffers)
+	ret=dict()
+	for layer,items in layers.items():
+		merged=dict(P=np.concatenate([item['P'] for item in items]),v_Style=np.concatenate([item['v_Style'] for item in items]))
+		indices=list()
+		offset=0
+		for layer_buffers in items:
+			if 'indices' in layer_buffers:indices.append(layer_buffers['indices']+offset)
+			offset+=len(layer_buffers['P'])
+		if indices:merged['indices']=np.concatenate(indices)
+		ret[layer]=merged
+	return ret
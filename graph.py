@@ -0,0 +1,115 @@
+from __future__ import annotations
+import zlib
+import numpy as np
+from.core.graph import MeshGraph,ShortestPathTree,eval_connected_components,eval_edge_costs,eval_uv_boundaries
+from typing import TYPE_CHECKING
+if TYPE_CHECKING:from bpy.types import Depsgraph,Mesh,Object,Scene;from bmesh.types import BMesh
+__all__='MeshGraph','ShortestPathTree','eval_connected_components','foreach_get_array','get_mesh_graph','update_edge_costs','tag_selection_update','depsgraph_update_post','undo_post','clear_cache'
+
+def foreach_get_array(collection,attr:str,dtype:type,size:int=1)->np.ndarray:
+	ret=np.empty(len(collection)*size,dtype=dtype)
+	collection.foreach_get(attr,ret)
+	if size>1:ret.shape=(-1,size)
+	return ret
+
+def _fingerprint(*arrays:np.ndarray)->int:
+	ret=0
+	for arr in arrays:ret=zlib.crc32(np.ascontiguousarray(arr).view(np.uint8),zlib.crc32(str(arr.shape).encode(),ret))
+	return ret
+
+_CACHE:dict[tuple[int,bool],tuple[tuple,MeshGraph]]=dict()
+_REVISIONS:dict[int,int]=dict()
+_SELECTION_UPDATES:set[int]=set()
+_generation=0
+
+def tag_selection_update(mesh:Mesh)->None:
+	'''Mark the next geometry update of the mesh as a selection only one, so it does not invalidate cached graphs.
+	Should be called right before edit mesh update which changes nothing but selection.'''
+	_SELECTION_UPDATES.add(mesh.as_pointer())
+
+def depsgraph_update_post(_scene:Scene,depsgraph:Depsgraph)->None:
+	'''Count geometry updates of meshes, cached graphs are validated again only after their mesh has been updated.'''
+	for update in depsgraph.updates:
+		if not update.is_updated_geometry:continue
+		id_data=update.id.original
+		if id_data.id_type=='OBJECT':
+			if id_data.type!='MESH':continue
+			id_data=id_data.data
+		elif id_data.id_type!='MESH':continue
+		ptr=id_data.as_pointer()
+		if ptr in _SELECTION_UPDATES:_SELECTION_UPDATES.discard(ptr)
+		else:_REVISIONS[ptr]=_REVISIONS.get(ptr,0)+1
+
+def undo_post(*_args)->None:
+	'''Undo and file load may replace mesh data-blocks at the same addresses, so all cached graphs are validated again.'''
+	global _generation
+	_generation+=1
+
+def get_mesh_graph(ob:Object,*,is_faces:bool,bm:None|BMesh=None,validate:bool=False)->MeshGraph:
+	'''Graph of object mesh, cached between operator invocations.
+
+	Cache entry is keyed on mesh data-block and returned as is while element counts (of edit mesh ``bm`` if given)
+	are the same and mesh had no geometry updates since it was validated. Otherwise, or if ``validate`` is set (for
+	scripts which change mesh data without depsgraph evaluation), edit mesh is written to mesh data and entry is reused while topology fingerprint (edges, loops and hidden state) stays the same. If only
+	vertex coordinates were changed, just link lengths are re-evaluated. In face mode the graph also keeps mesh
+	loop triangles to build face geometry without temporary BMeshes.
+	'''
+	mesh:Mesh=ob.data
+	ptr=mesh.as_pointer()
+	if bm is None:counts=len(mesh.vertices),len(mesh.edges),len(mesh.polygons)
+	else:counts=len(bm.verts),len(bm.edges),len(bm.faces)
+	stamp=counts,_REVISIONS.get(ptr,0),_generation
+	key=ptr,is_faces
+	item=_CACHE.get(key)
+	if item is not None and item[0]==stamp and not validate:return item[1]
+	ob.update_from_editmode()
+	coords=foreach_get_array(mesh.vertices,'co',np.float32,3)
+	edge_verts=foreach_get_array(mesh.edges,'vertices',np.int32,2)
+	edge_hide=foreach_get_array(mesh.edges,'hide',bool)
+	loop_verts=loop_edges=loop_totals=face_hide=None
+	topology_arrays=[edge_verts,edge_hide]
+	if is_faces:
+		loop_verts=foreach_get_array(mesh.loops,'vertex_index',np.int32)
+		loop_edges=foreach_get_array(mesh.loops,'edge_index',np.int32)
+		loop_totals=foreach_get_array(mesh.polygons,'loop_total',np.int32)
+		face_hide=foreach_get_array(mesh.polygons,'hide',bool)
+		topology_arrays+=[loop_verts,loop_edges,loop_totals,face_hide]
+	topology_key=_fingerprint(*topology_arrays)
+	geometry_key=_fingerprint(coords)
+	r_graph=None if item is None else item[1]
+	if r_graph is None or r_graph.topology_key!=topology_key or r_graph.num_nodes!=(len(loop_totals) if is_faces else len(coords)):
+		r_graph=MeshGraph.from_arrays(is_faces=is_faces,coords=coords,edge_verts=edge_verts,edge_hide=edge_hide,loop_verts=loop_verts,loop_edges=loop_edges,loop_totals=loop_totals,face_hide=face_hide,topology_key=topology_key,geometry_key=geometry_key)
+	elif r_graph.geometry_key!=geometry_key:
+		r_graph.update_geometry(coords=coords,geometry_key=geometry_key)
+	else:
+		_CACHE[key]=stamp,r_graph
+		return r_graph
+	_CACHE[key]=stamp,r_graph
+	if is_faces:
+		# Triangulation of n-gons depends on coordinates, so it is taken again together with link lengths
+		mesh.calc_loop_triangles()
+		r_graph.set_loop_triangles(foreach_get_array(mesh.loop_triangles,'vertices',np.int32,3),foreach_get_array(mesh.loop_triangles,'polygon_index',np.int32))
+	return r_graph
+
+def update_edge_costs(ob:Object,mesh_graph:MeshGraph)->None:
+	'''Set weighted edge costs of object mesh graph, evaluated again only if mesh, seams, sharp edges or UV
+	coordinates of the active UV map have changed. Edit mesh should be already written to mesh data.'''
+	mesh:Mesh=ob.data
+	edge_marks=foreach_get_array(mesh.edges,'use_seam',bool)|foreach_get_array(mesh.edges,'use_edge_sharp',bool)
+	loop_verts,loop_edges,loop_totals=mesh_graph.loop_verts,mesh_graph.loop_edges,mesh_graph.loop_totals
+	if loop_totals is None:
+		loop_verts=foreach_get_array(mesh.loops,'vertex_index',np.int32)
+		loop_edges=foreach_get_array(mesh.loops,'edge_index',np.int32)
+		loop_totals=foreach_get_array(mesh.polygons,'loop_total',np.int32)
+	uv_layer=mesh.uv_layers.active
+	uvs=None if uv_layer is None else foreach_get_array(uv_layer.data,'uv',np.float32,2)
+	costs_key=_fingerprint(edge_marks,*(()if uvs is None else(uvs,)))^mesh_graph.topology_key^mesh_graph.geometry_key
+	if mesh_graph.costs_key==costs_key:return
+	uv_boundaries=None
+	if uvs is not None and len(loop_totals):
+		loop_starts=np.zeros(len(loop_totals),dtype=np.int32)
+		np.cumsum(loop_totals[:-1],out=loop_starts[1:])
+		uv_boundaries=eval_uv_boundaries(len(mesh_graph.edge_verts),loop_verts,loop_edges,loop_starts,loop_totals,uvs)
+	mesh_graph.set_edge_costs(eval_edge_costs(coords=mesh_graph.coords,edge_verts=mesh_graph.edge_verts,loop_verts=loop_verts,loop_edges=loop_edges,loop_totals=loop_totals,edge_marks=edge_marks,uv_boundaries=uv_boundaries),costs_key=costs_key)
+
+def clear_cache()->None:_CACHE.clear();_REVISIONS.clear();_SELECTION_UPDATES.clear()
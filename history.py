@@ -0,0 +1,84 @@
+from __future__ import annotations
+import collections
+from typing import Any,Iterable
+__all__='DEFAULT_BUDGET','UndoHistory'
+
+DEFAULT_BUDGET=64<<20
+'''Byte budget of history used when user preferences do not limit undo memory.'''
+
+class UndoHistory:
+	'''Undo and redo stacks of immutable steps capped by an estimated byte budget.
+
+	Steps share unchanged data with each other, so each step is pushed together with ``(object, nbytes)`` items it
+	references. Items are reference counted by identity and accounted once while any step of either stack holds
+	them. Oldest undo steps are dropped while the budget is exceeded, the latest step is always kept.
+	'''
+	__slots__='budget','undo_steps','redo_steps','nbytes','_refs'
+	budget:int
+	undo_steps:collections.deque[tuple[Any,tuple[int,...]]]
+	redo_steps:collections.deque[tuple[Any,tuple[int,...]]]
+	nbytes:int
+	_refs:dict[int,list]
+
+	def __init__(self,*,budget:int=DEFAULT_BUDGET):
+		self.budget=budget
+		self.undo_steps=collections.deque()
+		self.redo_steps=collections.deque()
+		self.nbytes=0
+		self._refs=dict()
+
+	def __len__(self)->int:return len(self.undo_steps)
+
+	def _acquire(self,items:Iterable[tuple[Any,int]])->tuple[int,...]:
+		refs=self._refs
+		keys=list()
+		for obj,nbytes in items:
+			key=id(obj)
+			ref=refs.get(key)
+			if ref is None:
+				# Reference keeps object alive, so its identity is not reused while accounted
+				refs[key]=[obj,nbytes,1]
+				self.nbytes+=nbytes
+			else:ref[2]+=1
+			keys.append(key)
+		return tuple(keys)
+
+	def _release(self,keys:tuple[int,...])->None:
+		refs=self._refs
+		for key in keys:
+			ref=refs[key]
+			ref[2]-=1
+			if not ref[2]:
+				del refs[key]
+				self.nbytes-=ref[1]
+
+	def push(self,step:Any,items:Iterable[tuple[Any,int]])->None:
+		'''Append new undo step, redo steps are discarded.'''
+		while self.redo_steps:self._release(self.redo_steps.pop()[1])
+		self.undo_steps.append((step,self._acquire(items)))
+		while len(self.undo_steps)>1 and self.nbytes>self.budget:self._release(self.undo_steps.popleft()[1])
+
+	def replace(self,step:Any,items:Iterable[tuple[Any,int]])->None:
+		'''Replace the latest undo step, for example after its paths have been finished in background.'''
+		if not self.undo_steps:return self.push(step,items)
+		keys=self._acquire(items)
+		self._release(self.undo_steps.pop()[1])
+		self.undo_steps.append((step,keys))
+
+	def undo(self)->None|Any:
+		'''Move latest step to redo stack and return the step before it, if there is one.'''
+		if len(self.undo_steps)<2:return None
+		self.redo_steps.append(self.undo_steps.pop())
+		return self.undo_steps[-1][0]
+
+	def redo(self)->None|Any:
+		'''Move latest undone step back to undo stack and return it, if there is one.'''
+		if not self.redo_steps:return None
+		self.undo_steps.append(self.redo_steps.pop())
+		return self.undo_steps[-1][0]
+
+	def clear(self)->None:
+		self.undo_steps.clear()
+		self.redo_steps.clear()
+		self._refs.clear()
+		self.nbytes=0
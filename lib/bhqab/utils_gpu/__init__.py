@@ -3,19 +3,21 @@ _D='aa_method'
 _C='attr_aa_method'
 _B='u_Image'
 _A=None
-if'bpy'in locals():from importlib import reload;reload(_common);reload(_smaa);reload(_fxaa)
-else:from.import _common
+if'bpy'in locals():from importlib import reload;reload(_depth_map);reload(_common);reload(_smaa);reload(_fxaa)
+else:from.import _depth_map,_common
 import bpy
 from bpy.types import AddonPreferences,Context,UILayout
 from bpy.props import EnumProperty
 import gpu
 from gpu.types import GPUShader,GPUShaderCreateInfo,GPUStageInterfaceInfo,GPUTexture
-__all__='BatchPreset','Mode','AAPreset','get_depth_map','get_viewport_metrics','FrameBufferFramework','DrawFramework','AABase','SMAA','FXAA'
+__all__='BatchPreset','Mode','AAPreset','DepthMapCache','get_depth_map','clear_depth_map_cache','get_viewport_metrics','FrameBufferFramework','DrawFramework','AABase','SMAA','FXAA'
 BatchPreset=_common.BatchPreset
 Mode=_common.Mode
 AAPreset=_common.AAPreset
 AABase=_common.AABase
+DepthMapCache=_common.DepthMapCache
 get_depth_map=_common.get_depth_map
+clear_depth_map_cache=_common.clear_depth_map_cache
 get_viewport_metrics=_common.get_viewport_metrics
 FrameBufferFramework=_common.FrameBufferFramework
 class DrawFramework:
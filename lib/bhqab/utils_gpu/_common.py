@@ -12,14 +12,20 @@ _A=None
 from typing import Literal
 from enum import auto,Enum,IntEnum
 from..import utils_wm
+from.import _depth_map
 import bpy
 from bpy.types import AddonPreferences,Context,Region,UILayout
 from mathutils import Vector,Matrix
 import gpu
 from gpu.types import GPUBatch,GPUBatch,GPUFrameBuffer,GPUIndexBuf,GPUOffScreen,GPUTexture,GPUVertBuf,GPUVertFormat
-__all__='FrameBufferFramework','get_depth_map','get_viewport_metrics'
+__all__='FrameBufferFramework','DepthMapCache','get_depth_map','clear_depth_map_cache','get_viewport_metrics'
 def get_viewport_metrics()->Vector:viewport=gpu.state.viewport_get();w,h=viewport[2],viewport[3];return Vector((_B/w,_B/h,w,h))
-def get_depth_map(*,depth_format:str='DEPTH_COMPONENT32F')->GPUTexture:fb:GPUFrameBuffer=gpu.state.active_framebuffer_get();return gpu.types.GPUTexture(gpu.state.viewport_get()[2:],data=fb.read_depth(*fb.viewport_get()),format=depth_format)
+DepthMapCache=_depth_map.DepthMapCache
+_depth_map_cache=DepthMapCache(gpu_module=gpu)
+def get_depth_map(*,depth_format:str='DEPTH_COMPONENT32F',region:_A|Region=_A,key:object=_A)->GPUTexture:
+	if region is _A:region=bpy.context.region
+	return _depth_map_cache.get(region_key=region.as_pointer()if region else 0,depth_format=depth_format,key=key)
+def clear_depth_map_cache()->_A:_depth_map_cache.invalidate()
 class Mode(Enum):REGION=auto();TEXTURE=auto()
 class FrameBufferFramework:
 	__slots__='_mode','_region_framebuffer','_area_type','_region_type','_texture_offscreen_data';_mode:Mode;_region_framebuffer:dict[Region,tuple[GPUFrameBuffer,_A|GPUTexture,_A|GPUTexture]];_area_type:str;_region_type:str;_texture_offscreen_data:_A|GPUOffScreen
@@ -0,0 +1,26 @@
+'''Per-region cache of viewport depth textures. Module does not import ``bpy`` and ``gpu``, the GPU module is given to
+the cache, so it can be used with a stand-in module outside of Blender.'''
+from __future__ import annotations
+_A=None
+__all__='DepthMapCache',
+class DepthMapCache:
+	'''Per-region cache of viewport depth textures.
+
+	Depth is read back from the active framebuffer and uploaded to a new texture only if the region has no cached
+	texture or its key has changed. Key consists of viewport, projection and model-view matrices, depth format and
+	an optional caller key which should change together with scene contents (for example, mesh state). Python API
+	has no way to copy framebuffer depth on GPU, so a valid cached texture is the GPU-resident path. ``gpu_module``
+	is Blender ``gpu`` module or any module which provides the same ``state``, ``matrix`` and ``types.GPUTexture``
+	members.
+	'''
+	__slots__='_gpu','_items';_gpu:object;_items:dict[int,tuple[tuple,object]]
+	def __init__(self,*,gpu_module:object):self._gpu=gpu_module;self._items=dict()
+	def __len__(self)->int:return len(self._items)
+	def eval_key(self,*,depth_format:str,key:object=_A)->tuple:mod=self._gpu;return tuple(mod.state.viewport_get()),tuple(tuple(row)for row in mod.matrix.get_projection_matrix()),tuple(tuple(row)for row in mod.matrix.get_model_view_matrix()),depth_format,key
+	def get(self,*,region_key:int=0,depth_format:str='DEPTH_COMPONENT32F',key:object=_A):
+		full_key=self.eval_key(depth_format=depth_format,key=key);item=self._items.get(region_key)
+		if item is not _A and item[0]==full_key:return item[1]
+		mod=self._gpu;fb=mod.state.active_framebuffer_get();texture=mod.types.GPUTexture(full_key[0][2:],data=fb.read_depth(*fb.viewport_get()),format=depth_format);self._items[region_key]=full_key,texture;return texture
+	def invalidate(self,*,region_key:_A|int=_A)->_A:
+		if region_key is _A:self._items.clear()
+		else:self._items.pop(region_key,_A)
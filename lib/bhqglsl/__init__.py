@@ -1,12 +1,13 @@
 from __future__ import annotations
 __all__='ubo','get_libraries_dict','read_shader_files','process_shader_requirements'
-import os,re
+import os,re,hashlib
 from typing import Iterable
 if'ubo'in locals():from importlib import reload;reload(ubo)
 else:from.import ubo
 library_names='colorspace','constants','lens_distortion','mask_fragment_stage','mask_vertex_stage','sampler_map','space','tiles','dithering','fxaa_lib'
 pragma_pattern='#pragma BHQGLSL_REQUIRE\\((.*?)\\)'
 _libs:dict[str,str]=dict()
+_processed:dict[bytes,str]=dict()
 def get_libraries_dict()->dict[str,str]:
 	if not _libs:
 		base_dir=os.path.dirname(__file__)
@@ -25,6 +26,9 @@ def read_shader_files(*,directory:str,filenames:Iterable[str],process_requiremen
 			ret.append(data)
 	return ret
 def process_shader_requirements(*,data:str)->str:
-	libs=get_libraries_dict();requirements={item for match in re.findall(pragma_pattern,data)for item in re.split(',\\s*',match)}
-	if requirements:data='\n'.join(libs[item]for item in requirements)+re.sub(pragma_pattern,'',data)
-	return data
\ No newline at end of file
+	# Preprocessed sources are memoized by content hash, so each distinct source is processed once per session
+	key=hashlib.blake2b(data.encode('utf-8'),digest_size=16).digest();ret=_processed.get(key)
+	if ret is not None:return ret
+	libs=get_libraries_dict();requirements={item for match in re.findall(pragma_pattern,data)for item in re.split(',\\s*',match)};ret=data
+	if requirements:ret='\n'.join(libs[item]for item in requirements)+re.sub(pragma_pattern,'',data)
+	_processed[key]=ret;return ret
\ No newline at end of file
@@ -22,23 +22,32 @@ _C=True
 _B=False
 _A=None
 from typing import Literal
-import collections
+import itertools,time
 from enum import auto,IntFlag
 from.import ADDON_PKG
-if'bpy'in locals():from importlib import reload;reload(bhqab);reload(bhqglsl);reload(shaders)
-else:from.lib import bhqab,bhqglsl;from.import shaders
+if'bpy'in locals():from importlib import reload;reload(bhqab);reload(bhqglsl);reload(shaders);reload(graph);reload(pick);reload(markup);reload(history);reload(drawlist);reload(profiling);reload(core)
+else:from.lib import bhqab,bhqglsl;from.import shaders;from.import graph;from.import pick;from.import markup;from.import history;from.import drawlist;from.import profiling;from.import core
+from.core import PathFlag,PathDirty,PathState,Path
 import bpy
-from bpy.types import Area,Context,Event,KeyMap,KeyMapItem,Mesh,Object,Operator,Panel,Region,RegionView3D,SpaceView3D,UIPieMenu,Window
+from bpy.types import Area,Context,Event,KeyMap,KeyMapItem,Mesh,Object,Operator,Panel,Region,RegionView3D,SpaceView3D,Timer,UIPieMenu,Window
 from bpy.props import EnumProperty
 from bpy.app.translations import pgettext
 import bmesh
 from bmesh.types import BMEdge,BMesh,BMFace,BMVert
 import gpu
+import numpy as np
 from gpu.types import GPUBatch
 from gpu_extras.batch import batch_for_shader
 from typing import TYPE_CHECKING
 if TYPE_CHECKING:from.props import WMProps;from.pref import Preferences
 _REGION_VIEW_3D_N_PANEL_TABS_WIDTH_PX=21
+_DRAG_FRAME_BUDGET_S=1/60
+'''Minimal interval between processing of two drag moves, moves in between are coalesced to the newest one.'''
+_PROGRESSIVE_SLICE_NODES=20000
+'''Number of nodes a progressive solve settles at once, the first slice is solved right in the event handler.'''
+_PROGRESSIVE_SLICE_S=.02
+'''Time budget of each progressive solving timer call.'''
+_PROGRESSIVE_PROGRESS_ID='path_tool_solve'
 TOOL_KM_NAME=_N
 def _get_addon_preferences(context:Context):
 	'''Safely get addon preferences, handling versioned folder names.'''
@@ -50,60 +59,12 @@ def _get_addon_preferences(context:Context):
 		if name.startswith('path_tool'):return addons[name].preferences
 	return None
 def eval_view3d_n_panel_width(context:Context)->int:return _REGION_VIEW_3D_N_PANEL_TABS_WIDTH_PX*context.preferences.view.ui_scale
+class _MouseEvent:
+	'''Mouse position of a coalesced event, Blender events are not valid after the handler has returned.'''
+	__slots__='mouse_x','mouse_y';mouse_x:int;mouse_y:int
+	def __init__(self,mouse_x:int,mouse_y:int)->_A:self.mouse_x=mouse_x;self.mouse_y=mouse_y
 class InteractEvent(IntFlag):NONE=auto();ADD_CP=auto();ADD_NEW_PATH=auto();REMOVE_CP=auto();DRAG_CP=auto();CLOSE_PATH=auto();CHANGE_DIRECTION=auto();TOPOLOGY_DISTANCE=auto();RELEASE_PATH=auto();UNDO=auto();REDO=auto();APPLY_PATHS=auto();CANCEL=auto();PIE=auto()
-class PathFlag(IntFlag):CLOSED=auto();REVERSED=auto();TOPOLOGY=auto()
 _PackedEvent_T=tuple[int|str,int|str,int|bool,int|bool,int|bool]
-class Path:
-	__slots__='island_index','ob','batch_control_elements','control_elements','fill_elements','batch_seq_fills','flag';island_index:int;ob:_A|Object;batch_control_elements:_A|GPUBatch;control_elements:list[BMVert|BMFace];fill_elements:list[list[BMEdge|BMFace]];batch_seq_fills:list[_A|GPUBatch];flag:PathFlag
-	def __init__(self,elem:_A|BMVert|BMFace=_A,linked_island_index:int=0,ob:_A|Object=_A)->_A:
-		self.island_index=linked_island_index;self.ob=ob;self.batch_control_elements=_A;self.control_elements=list();self.fill_elements=list();self.batch_seq_fills=list()
-		if elem is not _A:self.control_elements.append(elem);self.fill_elements.append([]);self.batch_seq_fills.append(_A)
-		self.flag=PathFlag(0)
-	def __repr__(self):
-		A='fb_%d';batch_seq_fills_formatted=[]
-		for(i,batch)in enumerate(self.batch_seq_fills):
-			if batch:batch_seq_fills_formatted.append(A%i);continue
-			batch_seq_fills_formatted.append(batch)
-		ce_indices=[n.index if n.is_valid else -1 for n in self.control_elements]
-		return'\nPath [id:%d]:\n    ce: %s\n    fe: %s\n    fb: %s'%(id(self),str(ce_indices),str([len(n)for n in self.fill_elements]),str(batch_seq_fills_formatted))
-	def copy(self)->Path:new_path=Path();new_path.control_elements=self.control_elements.copy();new_path.fill_elements=self.fill_elements.copy();new_path.batch_seq_fills=self.batch_seq_fills.copy();new_path.batch_control_elements=self.batch_control_elements;new_path.island_index=self.island_index;new_path.ob=self.ob;new_path.flag=self.flag;return new_path
-	def reverse(self)->Path:
-		if len(self.control_elements)<2:return self
-		self.control_elements.reverse();close_path_fill=self.fill_elements.pop(-1);close_path_batch=self.batch_seq_fills.pop(-1);self.fill_elements.reverse();self.batch_seq_fills.reverse();self.fill_elements.append(close_path_fill);self.batch_seq_fills.append(close_path_batch);self.flag^=PathFlag.REVERSED;return self
-	def is_in_control_elements(self,elem:BMVert|BMFace)->_A|int:
-		if elem in self.control_elements:return self.control_elements.index(elem)
-	def is_in_fill_elements(self,elem:BMVert|BMFace)->_A|int:
-		if isinstance(elem,BMVert):
-			for(i,arr)in enumerate(self.fill_elements):
-				arr:list[BMEdge]
-				for edge in arr:
-					edge:BMEdge
-					for vert in edge.verts:
-						vert:BMVert
-						if elem==vert:return i
-				del arr
-		for(i,arr)in enumerate(self.fill_elements):
-			arr:list[BMFace]
-			if elem in arr:return i
-	def insert_control_element(self,elem_index,elem):self.control_elements.insert(elem_index,elem);self.fill_elements.insert(elem_index,[]);self.batch_seq_fills.insert(elem_index,_A)
-	def remove_control_element(self,elem)->_A:elem_index=self.control_elements.index(elem);self.pop_control_element(elem_index)
-	def pop_control_element(self,elem_index:int)->BMVert|BMFace:
-		elem=self.control_elements.pop(elem_index);pop_index=elem_index-1
-		if elem_index==0:pop_index=0
-		self.fill_elements.pop(pop_index);self.batch_seq_fills.pop(pop_index);return elem
-	def get_pairs_items(self,elem_index):
-		r_pairs=list();num_ce=len(self.control_elements)
-		if num_ce<2:return r_pairs
-		if elem_index<0:elem_index=0
-		if elem_index>num_ce-1:elem_index=num_ce-1
-		elem=self.control_elements[elem_index]
-		# Pair with previous element
-		if elem_index>0:r_pairs.append([elem,self.control_elements[elem_index-1],elem_index-1])
-		# Pair with next element
-		if elem_index<num_ce-1:r_pairs.append([elem,self.control_elements[elem_index+1],elem_index])
-		# Closed path connection
-		if self.flag&PathFlag.CLOSED and num_ce>2 and elem_index in(0,num_ce-1):r_pairs.append([self.control_elements[0],self.control_elements[-1],-1])
-		return r_pairs
 CONTEXT_ACTION_ITEMS=(InteractEvent.CHANGE_DIRECTION.name,'Direction','Change the direction of the active path.\nThe active element of the path will be the final element from the opposite end of the path, from it will be formed a section to the next control element that you create.',_D,InteractEvent.CHANGE_DIRECTION.value),(InteractEvent.CLOSE_PATH.name,'Close Path','Connect the start and end of the active path',_D,InteractEvent.CLOSE_PATH.value),(InteractEvent.CANCEL.name,'Cancel','Cancel editing paths',_D,InteractEvent.CANCEL.value),(InteractEvent.APPLY_PATHS.name,'Apply','Apply changes to the grid according to the selected options',_D,InteractEvent.APPLY_PATHS.value),(InteractEvent.UNDO.name,'Undo','Take a step back',_D,InteractEvent.UNDO.value),(InteractEvent.REDO.name,'Redo','Redo previous undo',_D,InteractEvent.REDO.value),(InteractEvent.TOPOLOGY_DISTANCE.name,'Topology','Algorithm for determining the shortest path without taking into account the spatial distance, only the number of steps',_D,InteractEvent.TOPOLOGY_DISTANCE.value)
 ACTION_ITEMS=CONTEXT_ACTION_ITEMS+((InteractEvent.NONE.name,_O,'',_D,InteractEvent.NONE.value),(InteractEvent.ADD_CP.name,'Add New Control Point','',_D,InteractEvent.ADD_CP.value),(InteractEvent.ADD_NEW_PATH.name,'Add New Path','',_D,InteractEvent.ADD_NEW_PATH.value),(InteractEvent.REMOVE_CP.name,'Remove Control Point','',_D,InteractEvent.REMOVE_CP.value),(InteractEvent.DRAG_CP.name,'Drag Control Point','',_D,InteractEvent.DRAG_CP.value),(InteractEvent.RELEASE_PATH.name,'Release Path','',_D,InteractEvent.RELEASE_PATH.value),(InteractEvent.PIE.name,'Open Pie Menu','',_D,InteractEvent.PIE.value))
 class MESH_PT_select_path_context(Panel):
@@ -116,19 +77,15 @@ def __validate_context_action_items_display_symmetry_concept(bias:int=1):
 		if abs(len(l)-len(r))>bias:print(f'\'_context_action_items\' may look asymmetrical in direction: {desc}\n\t"{l}" {len(l)} characters\n\t"{r}" {len(r)} characters\n')
 del __validate_context_action_items_display_symmetry_concept
 class MESH_OT_select_path(Operator):
-	bl_idname='mesh.select_path';bl_label=_O;bl_options={'REGISTER','UNDO','INTERNAL'};bl_translation_context=_P;__slots__=();context_action:EnumProperty(items=CONTEXT_ACTION_ITEMS,default=set(),options={'ENUM_FLAG',_Q,_R},translation_context=_P);action:EnumProperty(items=ACTION_ITEMS,default=InteractEvent.NONE.name,options={_Q,_R});windows:set[Window]=set();nav_events:tuple[_PackedEvent_T]=tuple();is_interaction:bool=_B;initial_ts_msm:tuple[int|bool,int|bool,int|bool];initial_mesh_elements:Literal[_G,_E];prior_ts_msm:tuple[int|bool,int|bool,int|bool];prior_mesh_elements:Literal[_G,_E];select_ts_msm:tuple[int|bool,int|bool,int|bool];select_mesh_elements:Literal['verts',_E];initial_select:tuple[BMVert|BMEdge|BMFace];bm_arr:tuple[tuple[Object,BMesh]];path_arr:list[Path]=list();mesh_islands:list[tuple[BMVert|BMEdge|BMFace]];drag_elem_indices:list[_A|int];_active_path_index:int=0;_drag_elem:_A|BMVert|BMFace=_A;_just_closed_path:bool=_B;gpu_draw_framework:_A|bhqab.utils_gpu.DrawFramework=_A;gpu_handles:list=list();gpu_common_ubo:_A|bhqglsl.ubo.UBO[shaders.CommonParams]=_A;undo_history:collections.deque[tuple[int,tuple[Path]]];redo_history:collections.deque[tuple[int,tuple[Path]]];exec_select_arr:dict[Object,list[tuple[int]]];exec_markup_arr:dict[Object,list[tuple[int]]]
+	bl_idname='mesh.select_path';bl_label=_O;bl_options={'REGISTER','UNDO','INTERNAL'};bl_translation_context=_P;__slots__=();context_action:EnumProperty(items=CONTEXT_ACTION_ITEMS,default=set(),options={'ENUM_FLAG',_Q,_R},translation_context=_P);action:EnumProperty(items=ACTION_ITEMS,default=InteractEvent.NONE.name,options={_Q,_R});windows:set[Window]=set();nav_events:tuple[_PackedEvent_T]=tuple();is_interaction:bool=_B;initial_ts_msm:tuple[int|bool,int|bool,int|bool];initial_mesh_elements:Literal[_G,_E];prior_ts_msm:tuple[int|bool,int|bool,int|bool];prior_mesh_elements:Literal[_G,_E];select_ts_msm:tuple[int|bool,int|bool,int|bool];select_mesh_elements:Literal['verts',_E];initial_select:tuple[BMVert|BMEdge|BMFace];bm_arr:tuple[tuple[Object,BMesh]];path_arr:list[Path]=list();mesh_islands:dict[tuple[Object,int],int];drag_elem_indices:list[_A|int];_active_path_index:int=0;_drag_elem:_A|int=_A;_drag_ob:_A|Object=_A;is_dragging:bool=_B;_just_closed_path:bool=_B;gpu_draw_framework:_A|bhqab.utils_gpu.DrawFramework=_A;gpu_draw_list:_A|dict[str,GPUBatch]=_A;gpu_drawn_paths:tuple[Path]=tuple();gpu_drawn_states:tuple[PathState]=tuple();gpu_drawn_active:_A|PathState=_A;gpu_style_key:_A|tuple=_A;gpu_revision:int=0;gpu_overlay_keys:dict[int,tuple]=dict();_is_select_changed:bool=_B;drag_pending:_A|tuple[int,int]=_A;drag_ready_time:float=.0;drag_timer:_A|Timer=_A;progressive_solves:dict[tuple[Path,int,int],core.ProgressiveFill]=dict();progressive_min_nodes:int=0;progressive_item_shown:bool=_B;gpu_handles:list=list();gpu_common_ubo:_A|bhqglsl.ubo.UBO[shaders.CommonParams]=_A;undo_history:history.UndoHistory;exec_select_arr:dict[Object,np.ndarray];exec_markup_arr:dict[Object,np.ndarray];mesh_graphs:dict[Object,graph.MeshGraph];drag_trees:dict[tuple[Object,int,bool,bool],graph.ShortestPathTree]
 	@staticmethod
 	def _pack_event(item:KeyMapItem|Event)->_PackedEvent_T:return item.type,item.value,item.alt,item.ctrl,item.shift
 	@classmethod
 	def _eval_meshes(cls,context:Context)->_A:
-		ret:list[tuple[Object,BMesh]]=list();props:WMProps=context.window_manager.select_path
+		ret:list[tuple[Object,BMesh]]=list()
 		for ob in context.objects_in_mode:
-			ob:Object;bm=bmesh.from_edit_mesh(ob.data)
-			if cls.prior_ts_msm[1]:bm.edges.ensure_lookup_table()
-			elif cls.prior_ts_msm[2]:
-				bm.faces.ensure_lookup_table()
-				if props.mark_seam!=_D or props.mark_sharp!=_D:bm.edges.ensure_lookup_table()
-			ret.append((ob,bm))
+			# Paths refer to elements by index, face lookup is only needed to resolve picked faces
+			ob:Object;bm=bmesh.from_edit_mesh(ob.data);bm.faces.ensure_lookup_table();ret.append((ob,bm))
 		cls.bm_arr=tuple(ret)
 	@classmethod
 	def _invoke_tweak_options(cls,context:Context):
@@ -168,8 +125,21 @@ class MESH_OT_select_path(Operator):
 									else:region_data=space.region_3d
 							return area,region,region_data
 	@classmethod
+	@profiling.timed('Pick')
 	def _get_element_by_mouse(cls,context:Context,event:Event)->tuple[_A|BMVert|BMEdge|BMFace,_A|Object]:
-		ts=context.tool_settings;ts.mesh_select_mode=cls.select_ts_msm;bpy.ops.mesh.select_all(action=_H);ui=MESH_OT_select_path._get_interactive_ui_under_mouse(context,event)
+		ui=MESH_OT_select_path._get_interactive_ui_under_mouse(context,event)
+		if ui is not _A:
+			area,region,region_data=ui
+			if isinstance(region_data,RegionView3D):
+				items=[]
+				for(ob,bm)in cls.bm_arr:mesh_graph=cls._get_mesh_graph(ob);items.append((ob,bm,(mesh_graph.topology_key,mesh_graph.geometry_key)))
+				elem,ob=pick.pick_element(region=region,rv3d=region_data,coord=(event.mouse_x-region.x,event.mouse_y-region.y),items=items,is_faces=bool(cls.prior_ts_msm[2]))
+				if elem is not _A:return elem,ob
+		# Nothing was hit by the ray (wire edges, loose vertices, quad view), let the operator do the picking
+		return cls._get_element_by_mouse_select_op(context,event,ui)
+	@classmethod
+	def _get_element_by_mouse_select_op(cls,context:Context,event:Event,ui:_A|tuple[Area,Region,RegionView3D])->tuple[_A|BMVert|BMEdge|BMFace,_A|Object]:
+		ts=context.tool_settings;ts.mesh_select_mode=cls.select_ts_msm;bpy.ops.mesh.select_all(action=_H);cls._is_select_changed=_C
 		if ui is not _A:
 			area,region,region_data=ui
 			with context.temp_override(window=bpy.context.window,area=area,region=region,region_data=region_data):bpy.ops.view3d.select('EXEC_DEFAULT',location=(event.mouse_x-region.x,event.mouse_y-region.y))
@@ -179,113 +149,151 @@ class MESH_OT_select_path(Operator):
 			if elem:elem.select=_B;bm.select_history.clear();break
 		ts.mesh_select_mode=cls.prior_ts_msm;return elem,ob
 	@classmethod
-	def _get_current_state_copy(cls)->tuple[int,tuple[Path]]:return tuple((cls._active_path_index,tuple(n.copy()for n in cls.path_arr)))
+	def _get_current_state(cls)->tuple[int,tuple[PathState]]:return cls._active_path_index,tuple(n.get_state()for n in cls.path_arr)
+	@classmethod
+	def _set_current_state(cls,step:tuple[int,tuple[PathState]])->_A:
+		# Paths are restored from snapshots, so further editing does not affect the history
+		active_path_index,states=step;cls._active_path_index=active_path_index;cls.path_arr=[Path.from_state(n)for n in states]
 	def _undo(self,context:Context):
-		cls=self.__class__
+		cls=self.__class__;cls._cancel_progressive_solves()
 		if len(cls.undo_history)==1:cls.path_arr.clear()
-		elif len(cls.undo_history)>1:step=cls.undo_history.pop();cls.redo_history.append(step);undo_step_active_path_index,undo_step_path_seq=cls.undo_history[-1];cls._active_path_index=undo_step_active_path_index;cls.path_arr=list(undo_step_path_seq);cls._just_closed_path=_B
+		else:
+			step=cls.undo_history.undo()
+			if step is not _A:cls._set_current_state(step);cls._just_closed_path=_B
 	def _redo(self,context:Context)->_A:
-		cls=self.__class__;msgctxt=cls.__qualname__
-		if len(cls.redo_history)>0:step=cls.redo_history.pop();cls.undo_history.append(step);undo_step_active_path_index,undo_step_path_seq=cls.undo_history[-1];cls._active_path_index=undo_step_active_path_index;cls.path_arr=list(undo_step_path_seq);context.area.tag_redraw()
+		cls=self.__class__;msgctxt=cls.__qualname__;cls._cancel_progressive_solves();step=cls.undo_history.redo()
+		if step is not _A:cls._set_current_state(step);context.area.tag_redraw()
 		else:self.report({'WARNING'},message=pgettext('Can not redo anymore',msgctxt))
 	@classmethod
-	def _register_undo_step(cls)->_A:step=cls._get_current_state_copy();cls.undo_history.append(step);cls.redo_history.clear()
+	def _register_undo_step(cls)->_A:step=cls._get_current_state();cls.undo_history.push(step,itertools.chain.from_iterable(n.iter_nbytes_items()for n in step[1]))
 	@classmethod
-	def _get_linked_island_index(cls,context:Context,elem:BMVert|BMFace)->int:
-		ts=context.tool_settings
-		for(i,linked_island)in enumerate(cls.mesh_islands):
-			if elem in linked_island:return i
-		ts.mesh_select_mode=cls.select_ts_msm;bpy.ops.mesh.select_all(action=_H);elem.select_set(_C);num_initial_selected,num_selected=0,1
-		while num_initial_selected!=num_selected:bpy.ops.mesh.select_linked(delimit={'NORMAL'});num_initial_selected=sum(ob.data.total_vert_sel for(ob,_)in cls.bm_arr);bpy.ops.mesh.select_more(use_face_step=_C);num_selected=sum(ob.data.total_vert_sel for(ob,_)in cls.bm_arr)
-		linked_island=cls._get_selected_elements(cls.select_mesh_elements);ts.mesh_select_mode=cls.prior_ts_msm;bpy.ops.mesh.select_all(action=_H);cls.mesh_islands.append(linked_island);return len(cls.mesh_islands)-1
+	def _replace_undo_step(cls)->_A:step=cls._get_current_state();cls.undo_history.replace(step,itertools.chain.from_iterable(n.iter_nbytes_items()for n in step[1]))
+	@classmethod
+	@profiling.timed('Island Lookup')
+	def _get_linked_island_index(cls,ob:Object,elem:int)->int:
+		mesh_graph=cls._get_mesh_graph(ob);key=ob,int(mesh_graph.island_labels[elem]);island_index=cls.mesh_islands.get(key)
+		if island_index is _A:island_index=len(cls.mesh_islands);cls.mesh_islands[key]=island_index
+		return island_index
 	@staticmethod
-	def _update_mesh(*,bm:BMesh,mesh:Mesh)->_A:bm.select_flush_mode();bmesh.update_edit_mesh(mesh=mesh,loop_triangles=_B,destructive=_B)
+	def _update_mesh(*,bm:BMesh,mesh:Mesh,is_select_only:bool=_C)->_A:
+		# Selection changes of the tool do not invalidate cached mesh graphs
+		if is_select_only:graph.tag_selection_update(mesh)
+		bm.select_flush_mode();bmesh.update_edit_mesh(mesh=mesh,loop_triangles=_B,destructive=_B)
 	@classmethod
-	def _update_meshes(cls)->_A:
+	def _update_meshes(cls,*,is_select_only:bool=_C)->_A:
 		for(ob,bm)in cls.bm_arr:
 			try:
-				if ob is not _A and bm is not _A and bm.is_valid:cls._update_mesh(bm=bm,mesh=ob.data)
+				if ob is not _A and bm is not _A and bm.is_valid:cls._update_mesh(bm=bm,mesh=ob.data,is_select_only=is_select_only)
 			except ReferenceError:pass
 	@classmethod
-	def _find_fallback_path_verts(cls,elem_0:BMVert,elem_1:BMVert)->tuple[BMEdge,...]:
-		'''Find path between vertices when shortest_path_select fails (border cases).'''
-		if not elem_0.is_valid or not elem_1.is_valid:return tuple()
-		# Direct edge connection
-		for edge in elem_0.link_edges:
-			if edge.is_valid and edge.other_vert(elem_0)==elem_1:return(edge,)
-		# Two-hop path through shared vertex
-		for edge_0 in elem_0.link_edges:
-			if not edge_0.is_valid:continue
-			mid_vert=edge_0.other_vert(elem_0)
-			if mid_vert is _A or not mid_vert.is_valid:continue
-			for edge_1 in mid_vert.link_edges:
-				if edge_1.is_valid and edge_1!=edge_0 and edge_1.other_vert(mid_vert)==elem_1:return(edge_0,edge_1)
-		return tuple()
+	def _get_mesh_graph(cls,ob:Object)->graph.MeshGraph:
+		mesh_graph=cls.mesh_graphs.get(ob)
+		if mesh_graph is _A and ob is not _A:
+			mesh_graph=graph.get_mesh_graph(ob,is_faces=bool(cls.prior_ts_msm[2]),bm=next((bm for(other_ob,bm)in cls.bm_arr if other_ob==ob),_A));cls.mesh_graphs[ob]=mesh_graph
+			# Cached costs are validated once per invocation since seams, sharp edges and UVs might have been changed
+			if mesh_graph.costs_key is not _A or bpy.context.window_manager.select_path.use_weighted_cost:graph.update_edge_costs(ob,mesh_graph)
+		return mesh_graph
+	@classmethod
+	def _get_drag_tree(cls,mesh_graph:graph.MeshGraph,path:Path,root:int)->graph.ShortestPathTree:
+		use_topology_distance=bool(path.flag&PathFlag.TOPOLOGY);use_weighted_cost=bool(path.flag&PathFlag.WEIGHTED);key=path.ob,root,use_topology_distance,use_weighted_cost;tree=cls.drag_trees.get(key)
+		if tree is _A or tree.graph is not mesh_graph:tree=graph.ShortestPathTree(mesh_graph,root,use_topology_distance=use_topology_distance,use_weighted_cost=use_weighted_cost);cls.drag_trees[key]=tree
+		return tree
 	@classmethod
+	def _solve_fill_indices(cls,mesh_graph:graph.MeshGraph,path:Path,elem_0:int,elem_1:int)->np.ndarray:
+		if path.flag&PathFlag.WEIGHTED and mesh_graph.costs_key is _A:graph.update_edge_costs(path.ob,mesh_graph)
+		# Segment is solved again, so its pending progressive solve is superseded
+		key=path,min(elem_0,elem_1),max(elem_0,elem_1);cls.progressive_solves.pop(key,_A);tree=_A
+		# While dragging, neighbour control elements stay fixed, so segments are restored from their shortest path trees. Trees are built on the first drag move, so clicks are solved by local search
+		if cls.is_dragging and path.ob==cls._drag_ob and elem_0!=elem_1:
+			if elem_0==cls._drag_elem:tree=cls._get_drag_tree(mesh_graph,path,elem_1)
+			elif elem_1==cls._drag_elem:tree=cls._get_drag_tree(mesh_graph,path,elem_0)
+		# Long searches on large meshes continue in timer slices while a preview is displayed, NumPy level search is fast enough to be done at once
+		if cls.progressive_min_nodes and mesh_graph.num_nodes>=cls.progressive_min_nodes and elem_0!=elem_1 and(tree is not _A or not mesh_graph.uses_level_search(use_topology_distance=bool(path.flag&PathFlag.TOPOLOGY))):
+			# Short segments are solved at once inside a box around them, search is bounded the same as the first progressive slice
+			if tree is _A:
+				fill_seq=core.solve_fill(path,elem_0,elem_1,use_global_search=_B,max_local_nodes=_PROGRESSIVE_SLICE_NODES,count=profiling.profiler.count)
+				if fill_seq is not _A:return fill_seq
+			job=core.ProgressiveFill(path,elem_0,elem_1,tree=tree)
+			if job.step(_PROGRESSIVE_SLICE_NODES):return job.fill
+			cls._add_progressive_solve(key,job);return job.preview()
+		if tree is not _A:
+			if tree.root==elem_1:return tree.path_from(elem_0)
+			return tree.path_from(elem_1)[::-1]
+		return core.solve_fill(path,elem_0,elem_1,count=profiling.profiler.count)
+	@classmethod
+	def _add_progressive_solve(cls,key:tuple[Path,int,int],job:core.ProgressiveFill)->_A:
+		cls.progressive_solves[key]=job;profiling.profiler.count('Progressive Solves')
+		if not bpy.app.timers.is_registered(_progressive_solve_timer):bpy.app.timers.register(_progressive_solve_timer,first_interval=.0)
+	@classmethod
+	def _cancel_progressive_solves(cls)->_A:
+		'''Drop pending progressive solves, segments keep their previews.'''
+		cls.progressive_solves.clear()
+		if bpy.app.timers.is_registered(_progressive_solve_timer):bpy.app.timers.unregister(_progressive_solve_timer)
+		cls._complete_progressive_item()
+	@classmethod
+	def _complete_progressive_item(cls)->_A:
+		if cls.progressive_item_shown:cls.progressive_item_shown=_B;bhqab.utils_ui.progress.complete(identifier=_PROGRESSIVE_PROGRESS_ID)
+	@classmethod
+	def _eval_progressive_solves(cls,time_budget:float)->bool:
+		'''Advance pending progressive solves for about the time budget (to the end if negative) and set solved fills or previews of their segments. Returns whether any segment has been solved.'''
+		deadline=time.perf_counter()+time_budget;is_solved=_B;max_nodes=_PROGRESSIVE_SLICE_NODES if time_budget>=0 else-1
+		while cls.progressive_solves:
+			for(key,job)in tuple(cls.progressive_solves.items()):
+				path=key[0];fill_index=path.find_segment(job.elem_0,job.elem_1)if path in cls.path_arr else _A
+				# Segment has been removed or its path has been replaced by another interaction
+				if fill_index is _A:del cls.progressive_solves[key];continue
+				if job.step(max_nodes):del cls.progressive_solves[key];path.set_fill(fill_index,job.fill,cls._gen_geometry_fill(path.graph,job.fill));is_solved=_C
+			if time_budget>=0 and time.perf_counter()>=deadline:break
+		for(key,job)in cls.progressive_solves.items():
+			path=key[0];fill_index=path.find_segment(job.elem_0,job.elem_1);fill_seq=job.preview();path.set_fill(fill_index,fill_seq,cls._gen_geometry_fill(path.graph,fill_seq))
+		return is_solved
+	@classmethod
+	def _progressive_solve_step(cls)->_A|float:
+		context=bpy.context;progress=bhqab.utils_ui.progress
+		# Progress item is invalidated by its cancel button
+		if cls.progressive_item_shown and not any(item.identifier==_PROGRESSIVE_PROGRESS_ID for item in progress.valid_progress_items()):cls.progressive_solves.clear();cls._complete_progressive_item();return
+		with profiling.profiler.phase('Progressive Solve'):is_solved=cls._eval_progressive_solves(_PROGRESSIVE_SLICE_S)
+		cls._tag_redraw_objects(context,cls._gpu_eval_redraw_objects())
+		if not cls.progressive_solves:
+			cls._complete_progressive_item()
+			# Undo step of the last interaction has been registered with previews
+			if is_solved and not cls.is_interaction and len(cls.undo_history):cls._replace_undo_step()
+			return
+		item=progress.get(identifier=_PROGRESSIVE_PROGRESS_ID);cls.progressive_item_shown=_C;item.label=pgettext('Solving Path',_P);item.icon='TIME';item.cancellable=_C;item.num_steps=1000;item.step=int(1000*min(job.progress for job in cls.progressive_solves.values()));return .01
+	@classmethod
+	@profiling.timed('Fill Update')
 	def _update_fills_by_element_index(cls,context:Context,path:Path,elem_index:int)->_A:
-		ts=context.tool_settings;pairs_items=path.get_pairs_items(elem_index)
-		for(elem_0,elem_1,fill_index)in pairs_items:
-			ts.mesh_select_mode=cls.select_ts_msm;bpy.ops.mesh.select_all(action=_H);cls._set_selection_state((elem_0,elem_1),_C);bpy.ops.mesh.shortest_path_select(use_topology_distance=bool(path.flag&PathFlag.TOPOLOGY));cls._set_selection_state((elem_0,elem_1),_B);fill_seq=cls._get_selected_elements(cls.prior_mesh_elements);bpy.ops.mesh.select_all(action=_H)
-			# Fallback for border vertices when shortest_path_select fails
-			if not fill_seq and isinstance(elem_0,BMVert)and isinstance(elem_1,BMVert):fill_seq=cls._find_fallback_path_verts(elem_0,elem_1)
-			ts.mesh_select_mode=cls.prior_ts_msm;path.fill_elements[fill_index]=fill_seq;batch=_A;shader=shaders.get(_S)
-			# Only create batch if we have valid fill data
-			if fill_seq:
-				if cls.prior_ts_msm[1]:
-					coord=[]
-					for edge in fill_seq:
-						if edge.is_valid:coord.extend([vert.co for vert in edge.verts])
-					if coord:batch=batch_for_shader(shader,'LINES',dict(P=coord))
-				elif cls.prior_ts_msm[2]:batch,_=cls._gpu_gen_batch_faces_seq(fill_seq,_B,shader)
-			path.batch_seq_fills[fill_index]=batch
+		mesh_graph=path.graph;gen_geometry=_A
+		if mesh_graph is not _A:gen_geometry=lambda fill_seq:cls._gen_geometry_fill(mesh_graph,fill_seq)
+		core.update_fills(path,elem_index,solve=lambda path,elem_0,elem_1:cls._solve_fill_indices(mesh_graph,path,elem_0,elem_1),gen_geometry=gen_geometry)
+	@classmethod
+	@profiling.timed('Fill Update')
+	def _update_fills_by_element_indices(cls,context:Context,items:list[tuple[Path,int]])->_A:
+		'''Solve segments adjacent to several control elements at once, each segment is solved once.'''
+		for(path,_)in items:
+			if path.flag&PathFlag.WEIGHTED and path.graph is not _A and path.graph.costs_key is _A:graph.update_edge_costs(path.ob,path.graph)
+		core.update_fills_many(items,solve=lambda path,elem_0,elem_1:cls._solve_fill_indices(path.graph,path,elem_0,elem_1),gen_geometry=lambda path,fill_seq:cls._gen_geometry_fill(path.graph,fill_seq))
+	@classmethod
+	@profiling.timed('Path Update')
+	def _update_path_fills(cls,context:Context,path:Path)->_A:
+		'''Solve all segments of the path at once, searches are shared by adjacent segments.'''
+		mesh_graph=path.graph
+		if mesh_graph is _A:return
+		if path.flag&PathFlag.WEIGHTED and mesh_graph.costs_key is _A:graph.update_edge_costs(path.ob,mesh_graph)
+		# Segments which might take long are solved one by one, so they can be solved progressively
+		if cls.progressive_min_nodes and mesh_graph.num_nodes>=cls.progressive_min_nodes and not mesh_graph.uses_level_search(use_topology_distance=bool(path.flag&PathFlag.TOPOLOGY)):return cls._update_fills_by_element_indices(context,[(path,j)for j in range(0,len(path.control_elements),2)])
+		for key in[key for key in cls.progressive_solves if key[0]is path]:del cls.progressive_solves[key]
+		core.update_path_fills(path,gen_geometry=lambda fill_seq:cls._gen_geometry_fill(mesh_graph,fill_seq))
 	def _remove_path_doubles(self,context:Context,path:Path)->_A:
-		cls=self.__class__;msgctxt=cls.__qualname__
-		for(i,control_element)in enumerate(path.control_elements):
-			if path.control_elements.count(control_element)>1:
-				for(j,other_control_element)in enumerate(path.control_elements):
-					if i!=j and other_control_element==control_element:
-						if i==0 and j==len(path.control_elements)-1:
-							path.pop_control_element(-1)
-							if path.flag^PathFlag.CLOSED:
-								path.flag|=PathFlag.CLOSED;cls._update_fills_by_element_index(context,path,0)
-								if path==cls._get_active_path():cls._just_closed_path=_C;text=pgettext('Closed active path',msgctxt)
-								else:text=pgettext('Closed path',msgctxt)
-								self.report(type={_J},message=text)
-							else:cls._update_fills_by_element_index(context,path,0)
-						elif i in(j-1,j+1):path.pop_control_element(j);batch,_=cls._gpu_gen_batch_control_elements(path==cls._get_active_path(),path);path.batch_control_elements=batch;self.report(type={_J},message=pgettext('Merged adjacent control elements',msgctxt))
+		cls=self.__class__;msgctxt=cls.__qualname__;event=core.remove_doubles(path,update_fills=lambda path,elem_index:cls._update_fills_by_element_index(context,path,elem_index))
+		if event&core.DoublesEvent.CLOSED:
+			if path==cls._get_active_path():cls._just_closed_path=_C;text=pgettext('Closed active path',msgctxt)
+			else:text=pgettext('Closed path',msgctxt)
+			self.report(type={_J},message=text)
+		if event&core.DoublesEvent.MERGED:path.geom_control_elements=cls._gen_geometry_control_elements(path);self.report(type={_J},message=pgettext('Merged adjacent control elements',msgctxt))
 	def _join_adjacent_to_active_path(self)->_A:
 		cls=self.__class__;msgctxt=cls.__qualname__;active=cls._get_active_path()
-		if active is _A or not active.control_elements:return
-		if active.flag&PathFlag.CLOSED:return
-		l_path=active
-		for(i,r_path)in enumerate(cls.path_arr):
-			if i!=cls._active_path_index and l_path.island_index==r_path.island_index and not(r_path.flag&PathFlag.CLOSED):
-				if not r_path.control_elements:continue
-				is_joined=_C
-				if l_path.control_elements[-1]==r_path.control_elements[0]:
-					if l_path.control_elements:l_path.control_elements.pop(-1)
-					if l_path.fill_elements:l_path.fill_elements.pop(-1)
-					if l_path.batch_seq_fills:l_path.batch_seq_fills.pop(-1)
-					l_path.control_elements.extend(r_path.control_elements);l_path.fill_elements.extend(r_path.fill_elements);l_path.batch_seq_fills.extend(r_path.batch_seq_fills)
-				elif l_path.control_elements[0]==r_path.control_elements[-1]:
-					if l_path.control_elements:l_path.control_elements.pop(0)
-					if r_path.fill_elements:r_path.fill_elements.pop(-1)
-					if r_path.batch_seq_fills:r_path.batch_seq_fills.pop(-1)
-					r_path.control_elements.extend(l_path.control_elements);r_path.fill_elements.extend(l_path.fill_elements);r_path.batch_seq_fills.extend(l_path.batch_seq_fills);l_path.control_elements=r_path.control_elements;l_path.fill_elements=r_path.fill_elements;l_path.batch_seq_fills=r_path.batch_seq_fills
-				elif l_path.control_elements[0]==r_path.control_elements[0]:
-					if l_path.control_elements:l_path.control_elements.pop(0)
-					r_path.control_elements.reverse();r_path.fill_elements.reverse();r_path.batch_seq_fills.reverse()
-					if r_path.fill_elements:r_path.fill_elements.pop(0)
-					if r_path.batch_seq_fills:r_path.batch_seq_fills.pop(0)
-					r_path.control_elements.extend(l_path.control_elements);r_path.fill_elements.extend(l_path.fill_elements);r_path.batch_seq_fills.extend(l_path.batch_seq_fills);l_path.control_elements=r_path.control_elements;l_path.fill_elements=r_path.fill_elements;l_path.batch_seq_fills=r_path.batch_seq_fills
-				elif l_path.control_elements[-1]==r_path.control_elements[-1]:
-					r_path.reverse()
-					if l_path.control_elements:l_path.control_elements.pop(-1)
-					if l_path.fill_elements:l_path.fill_elements.pop(-1)
-					if l_path.batch_seq_fills:l_path.batch_seq_fills.pop(-1)
-					l_path.control_elements.extend(r_path.control_elements);l_path.fill_elements.extend(r_path.fill_elements);l_path.batch_seq_fills.extend(r_path.batch_seq_fills)
-				else:is_joined=_B
-				if is_joined:cls.path_arr.remove(r_path);cls._active_path_index=cls.path_arr.index(cls._get_active_path());batch,cls.active_index=cls._gpu_gen_batch_control_elements(_C,cls._get_active_path());cls._get_active_path().batch_control_elements=batch;self.report(type={_J},message=pgettext('Joined two paths',msgctxt));return
+		if active is not _A and core.join_adjacent(cls.path_arr,active):cls.set_active_path(active);active.geom_control_elements=cls._gen_geometry_control_elements(active);self.report(type={_J},message=pgettext('Joined two paths',msgctxt))
 	@classmethod
 	def _get_selected_elements(cls,mesh_elements:str)->tuple[BMVert|BMEdge|BMFace]:
 		ret=tuple()
@@ -293,42 +301,76 @@ class MESH_OT_select_path(Operator):
 		return ret
 	def _ui_draw_popup_menu_pie(self,popup:UIPieMenu,context:Context)->_A:pie=popup.layout.menu_pie();pie.prop_tabs_enum(self,'context_action');pie.popover(MESH_PT_select_path_context.__name__)
 	@staticmethod
-	def _gpu_gen_batch_faces_seq(fill_seq,is_active,shader):
-		if not fill_seq:return _A,0
-		tmp_bm=bmesh.new()
-		for face in fill_seq:
-			if face.is_valid:tmp_bm.faces.new((tmp_bm.verts.new(v.co,v)for v in face.verts),face)
-		if not tmp_bm.verts:tmp_bm.free();return _A,0
-		tmp_bm.verts.index_update();tmp_bm.faces.ensure_lookup_table();tmp_loops=tmp_bm.calc_loop_triangles()
-		if not tmp_loops:tmp_bm.free();return _A,0
-		r_batch=batch_for_shader(shader,'TRIS',dict(P=tuple(v.co for v in tmp_bm.verts)),indices=tuple((loop.vert.index for loop in tri)for tri in tmp_loops));r_active_face_tri_start_index=_A
-		if is_active and fill_seq:
-			r_active_face_tri_start_index=len(tmp_loops);tmp_bm2=bmesh.new();face=fill_seq[-1]
-			if face.is_valid:tmp_bm2.faces.new((tmp_bm2.verts.new(v.co,v)for v in face.verts),face);r_active_face_tri_start_index-=len(tmp_bm2.calc_loop_triangles())
-			tmp_bm2.free()
-		tmp_bm.free();return r_batch,r_active_face_tri_start_index
-	@classmethod
-	def _gpu_gen_batch_control_elements(cls,is_active,path):
-		shader=shaders.get(_T)
-		if cls.prior_ts_msm[2]:shader=shaders.get(_U)
-		r_batch=_A;r_active_elem_start_index=0
-		if not path.control_elements:return r_batch,r_active_elem_start_index
-		if cls.prior_ts_msm[1]:
-			valid_verts=[(v.co,i)for i,v in enumerate(path.control_elements)if v.is_valid]
-			if valid_verts:
-				coords,indices=zip(*valid_verts)
-				r_batch=batch_for_shader(shader,'POINTS',{'P':coords,'v_Index':indices})
-			if is_active and path.control_elements:r_active_elem_start_index=len(path.control_elements)-1
-		elif cls.prior_ts_msm[2]:r_batch,r_active_elem_start_index=cls._gpu_gen_batch_faces_seq(path.control_elements,is_active,shader)
-		return r_batch,r_active_elem_start_index
+	def _gen_geometry_faces_seq(mesh_graph:graph.MeshGraph,fill_seq:np.ndarray|list[int])->_A|drawlist.Geometry:
+		if not len(fill_seq):return
+		faces=np.asarray(fill_seq,dtype=np.int32);tris=mesh_graph.face_triangles(faces)
+		if not len(tris):return
+		# Triangles do not share vertices, so the last face vertices are the active element ones
+		num_active_tris=int(mesh_graph.tri_starts[faces[-1]+1]-mesh_graph.tri_starts[faces[-1]]);return drawlist.Geometry(mesh_graph.coords[tris.ravel()],np.arange(tris.size,dtype=np.int32),3*(len(tris)-num_active_tris))
+	@classmethod
+	def _gen_geometry_fill(cls,mesh_graph:graph.MeshGraph,fill_seq:np.ndarray)->_A|drawlist.Geometry:
+		if not len(fill_seq):return
+		if cls.prior_ts_msm[1]:return drawlist.Geometry(mesh_graph.coords[mesh_graph.edge_verts[fill_seq].ravel()])
+		elif cls.prior_ts_msm[2]:return cls._gen_geometry_faces_seq(mesh_graph,fill_seq)
+	@classmethod
+	def _gen_geometry_control_elements(cls,path:Path)->_A|drawlist.Geometry:
+		if not path.control_elements or path.graph is _A:return
+		if cls.prior_ts_msm[1]:return drawlist.Geometry(path.graph.coords[path.control_elements],active_start=len(path.control_elements)-1)
+		elif cls.prior_ts_msm[2]:return cls._gen_geometry_faces_seq(path.graph,path.control_elements)
+	@classmethod
+	@profiling.timed('Path Buffers')
+	def _gpu_gen_path_buffers(cls,path:Path)->dict[str,dict[str,np.ndarray]]:
+		if path.ob is _A:return dict()
+		try:matrix=np.array(path.ob.matrix_world,dtype=np.float32)
+		except ReferenceError:return dict()
+		draw_list=drawlist.DrawList();style=0;active_style=0
+		if path.flag&PathFlag.TOPOLOGY:style|=drawlist.STYLE_TOPOLOGY
+		if path.draw_active:style|=drawlist.STYLE_ACTIVE;active_style=drawlist.STYLE_ACTIVE
+		for geometry in path.geom_seq_fills:draw_list.add(_S,geometry,matrix=matrix,style=style)
+		draw_list.add(_T,path.geom_control_elements,matrix=matrix,active_style=active_style);return draw_list.build()
+	@classmethod
+	def _gpu_eval_redraw_objects(cls)->set[Object]:
+		'''Objects of paths which look different since they were drawn last time. Paths replaced by their undo snapshots share states with them, so they are not redrawn unless they look different.'''
+		active_path=cls._get_active_path();active_state=_A if active_path is _A else active_path.get_state();ret={state.ob for state in set(cls.gpu_drawn_states).symmetric_difference(path.get_state()for path in cls.path_arr)}
+		if active_state is not cls.gpu_drawn_active:ret.update(state.ob for state in(active_state,cls.gpu_drawn_active)if state is not _A)
+		return ret
+	@staticmethod
+	def _tag_redraw_objects(context:Context,objects:set[Object])->_A:
+		'''Tag 3D view regions of windows which view layers show any of objects.'''
+		if not objects:return
+		for window in context.window_manager.windows:
+			view_layer=window.view_layer
+			try:is_visible=any(ob.visible_get(view_layer=view_layer)for ob in objects if ob is not _A)
+			except ReferenceError:is_visible=_C
+			if not is_visible:continue
+			for area in window.screen.areas:
+				if area.type==_I:
+					for region in bhqab.utils_wm.iter_area_regions(area=area,region_type=_F):region.tag_redraw()
+	@classmethod
+	@profiling.timed('Draw List')
+	def _gpu_eval_draw_list(cls)->bool:
+		'''Rebuild buffers of dirty paths and merged batches of path fills and control elements, active path is drawn last. Returns whether anything was rebuilt.'''
+		is_changed=cls.gpu_draw_list is _A or cls.gpu_drawn_paths!=tuple(cls.path_arr);active_path=cls._get_active_path()
+		for path in cls.path_arr:
+			is_active=path==active_path
+			if path.draw_active!=is_active:path.draw_active=is_active;path.dirty|=PathDirty.ACTIVE
+			if path.dirty or path.draw_buffers is _A:path.draw_buffers=cls._gpu_gen_path_buffers(path);path.dirty=PathDirty(0);is_changed=_C
+		if not is_changed:return _B
+		shader_ce=shaders.get(_T);shader_path=shaders.get(_S);type_ce='POINTS';type_path='LINES'
+		if cls.prior_ts_msm[2]:shader_ce=shaders.get(_U);shader_path=shaders.get('path_face');type_ce=type_path='TRIS'
+		ret=dict()
+		for(layer,buffers)in drawlist.merge(path.draw_buffers for path in sorted(cls.path_arr,key=lambda path:path.draw_active)).items():
+			shader,prim_type=(shader_path,type_path)if layer==_S else(shader_ce,type_ce);ret[layer]=batch_for_shader(shader,prim_type,dict(P=buffers['P'],v_Style=buffers['v_Style']),indices=buffers.get('indices'))
+		cls.gpu_draw_list=ret;cls.gpu_drawn_paths=tuple(cls.path_arr);cls.gpu_drawn_states=tuple(path.get_state()for path in cls.path_arr);cls.gpu_drawn_active=_A if active_path is _A else active_path.get_state();return _C
 	@classmethod
 	def _gpu_remove_handles(cls)->_A:
 		for handle in cls.gpu_handles:SpaceView3D.draw_handler_remove(handle,_F)
-		cls.gpu_handles.clear();cls.gpu_common_ubo=_A
+		cls.gpu_handles.clear();cls.gpu_common_ubo=_A;cls.gpu_draw_list=_A;cls.gpu_drawn_paths=tuple();cls.gpu_drawn_states=tuple();cls.gpu_drawn_active=_A;cls.gpu_style_key=_A;cls.gpu_overlay_keys=dict();bhqab.utils_gpu.clear_depth_map_cache()
 	@classmethod
 	def _gpu_update_common_ubo(cls,context:Context):
 		if not cls.gpu_common_ubo:cls.gpu_common_ubo=bhqglsl.ubo.UBO(ubo_type=shaders.CommonParams)
 	@classmethod
+	@profiling.timed('Draw')
 	def _gpu_draw_callback(cls:MESH_OT_select_path)->_A:
 		D='u_ViewportMetrics';C='u_DepthMap';B='u_Params';A=.0
 		# Early exit if not properly initialized
@@ -337,96 +379,96 @@ class MESH_OT_select_path(Operator):
 		if active_path is _A:return
 		context=bpy.context;addon_pref=_get_addon_preferences(context)
 		if addon_pref is _A:return
-		wm=context.window_manager;wm_props:WMProps=wm.select_path;draw_list:list[Path]=[_ for _ in cls.path_arr if _!=active_path];draw_list.append(active_path);shader_ce=shaders.get(_T);shader_path=shaders.get(_S)
+		wm=context.window_manager;wm_props:WMProps=wm.select_path;shader_ce=shaders.get(_T);shader_path=shaders.get(_S)
 		if cls.prior_ts_msm[2]:shader_ce=shaders.get(_U);shader_path=shaders.get('path_face')
-		depth_map=bhqab.utils_gpu.get_depth_map();fb_framework=cls.gpu_draw_framework.get(index=0)
+		# Merged batches are rebuilt only for dirty paths, uniforms are uploaded only after style has been changed
+		is_changed=cls._gpu_eval_draw_list();style_key=addon_pref.color_path[:],addon_pref.color_active_path[:],addon_pref.color_path_topology[:],addon_pref.color_active_path_topology[:],addon_pref.color_control_element[:],addon_pref.color_active_control_element[:],addon_pref.color_path_behind[:],wm_props.show_path_behind,addon_pref.point_size,addon_pref.line_width
+		if style_key!=cls.gpu_style_key:
+			# Coordinates are in world space already
+			params=cls.gpu_common_ubo.data;params.model_matrix=(1.,A,A,A),(A,1.,A,A),(A,A,1.,A),(A,A,A,1.);params.color_path,params.color_active_path,params.color_path_topology,params.color_active_path_topology,params.color_cp,params.color_active_cp,params.color_path_behind,params.show_path_behind=style_key[:8]
+			if cls.prior_ts_msm[1]:params.point_size=addon_pref.point_size+6.
+			cls.gpu_common_ubo.update();cls.gpu_style_key=style_key;is_changed=_C
+		if is_changed:cls.gpu_revision+=1
+		# Depth is read back from the viewport only after view or scene contents change
+		depth_map=bhqab.utils_gpu.get_depth_map(key=(context.scene.frame_current,tuple((mesh_graph.topology_key,mesh_graph.geometry_key)for mesh_graph in cls.mesh_graphs.values())));fb_framework=cls.gpu_draw_framework.get(index=0)
 		if fb_framework is _A:return
-		fb=fb_framework.get()
-		with fb.bind():
-			fb.clear(color=(A,A,A,A));viewport_metrics=bhqab.utils_gpu.get_viewport_metrics()
-			with gpu.matrix.push_pop():
-				gpu.state.line_width_set(addon_pref.line_width);gpu.state.blend_set('ALPHA');gpu.state.face_culling_set(_D)
-				for path in draw_list:
-					if path is _A or path.ob is _A:continue
-					try:_=path.ob.matrix_world
-					except ReferenceError:continue
-					active_ce_index=0;color_ce=addon_pref.color_control_element;color_active_ce=color_ce;color_path=addon_pref.color_path
-					if path.flag&PathFlag.TOPOLOGY:color_path=addon_pref.color_path_topology
-					if path==active_path:
-						active_ce_index=cls.active_index;color_active_ce=addon_pref.color_active_control_element;color_path=addon_pref.color_active_path
-						if path.flag&PathFlag.TOPOLOGY:color_path=addon_pref.color_active_path_topology
-					params=cls.gpu_common_ubo.data;params.model_matrix=tuple(_[:]for _ in path.ob.matrix_world.col);params.color_path=color_path[:];params.color_cp=color_ce[:];params.color_active_cp=color_active_ce[:];params.color_path_behind=addon_pref.color_path_behind[:];params.show_path_behind=wm_props.show_path_behind;params.index_active=active_ce_index
-					if cls.prior_ts_msm[1]:params.point_size=addon_pref.point_size+6.
-					cls.gpu_common_ubo.update();shader_path.bind()
-					for batch in path.batch_seq_fills:
-						if batch:shader_path.uniform_block(B,cls.gpu_common_ubo.ubo);shader_path.uniform_sampler(C,depth_map);shader_path.uniform_float(D,viewport_metrics);batch.draw(shader_path)
-					shader_ce.bind()
-					if path.batch_control_elements:shader_ce.uniform_block(B,cls.gpu_common_ubo.ubo);shader_ce.uniform_sampler(C,depth_map);shader_ce.uniform_float(D,viewport_metrics);path.batch_control_elements.draw(shader_ce)
+		fb=fb_framework.get();overlay_key=cls.gpu_revision,depth_map,fb;region_key=context.region.as_pointer()
+		# Overlay texture of the region is reused while paths, style, view and depth are the same
+		if cls.gpu_overlay_keys.get(region_key)!=overlay_key:
+			cls.gpu_overlay_keys[region_key]=overlay_key
+			with fb.bind():
+				fb.clear(color=(A,A,A,A));viewport_metrics=bhqab.utils_gpu.get_viewport_metrics()
+				with gpu.matrix.push_pop():
+					gpu.state.line_width_set(addon_pref.line_width);gpu.state.blend_set('ALPHA');gpu.state.face_culling_set(_D)
+					for(shader,layer)in((shader_path,_S),(shader_ce,_T)):
+						batch=cls.gpu_draw_list.get(layer)
+						if batch:shader.bind();shader.uniform_block(B,cls.gpu_common_ubo.ubo);shader.uniform_sampler(C,depth_map);shader.uniform_float(D,viewport_metrics);batch.draw(shader)
 		cls.gpu_draw_framework.draw(texture=fb_framework.get_color_texture())
-	def _interact_control_element(self,context:Context,elem:_A|BMVert|BMFace,ob:Object,interact_event:InteractEvent)->_A:
+	def _interact_control_element(self,context:Context,elem:_A|int,ob:Object,interact_event:InteractEvent)->_A:
 		cls=self.__class__;msgctxt=cls.__qualname__;props:WMProps=context.window_manager.select_path
 		if interact_event is InteractEvent.UNDO:self._undo(context)
 		elif interact_event is InteractEvent.REDO:self._redo(context)
-		elif elem and interact_event is InteractEvent.ADD_CP:
+		elif elem is not _A and interact_event is InteractEvent.ADD_CP:
 			if not cls.path_arr:return self._interact_control_element(context,elem,ob,InteractEvent.ADD_NEW_PATH)
-			new_elem_index=_A;elem_index=cls._get_active_path().is_in_control_elements(elem)
+			new_elem_index=_A;elem_index=cls._get_active_path().is_in_control_elements(ob,elem)
 			if elem_index is _A:
-				new_elem_index=len(cls._get_active_path().control_elements);fill_index=cls._get_active_path().is_in_fill_elements(elem)
+				new_elem_index=len(cls._get_active_path().control_elements);fill_index=cls._get_active_path().is_in_fill_elements(ob,elem)
 				if fill_index is _A:
 					is_found_in_other_path=_B
 					for path in cls.path_arr:
 						if path==cls._get_active_path():continue
-						other_elem_index=path.is_in_control_elements(elem)
+						other_elem_index=path.is_in_control_elements(ob,elem)
 						if other_elem_index is _A:
-							other_fill_index=path.is_in_fill_elements(elem)
+							other_fill_index=path.is_in_fill_elements(ob,elem)
 							if other_fill_index is not _A:is_found_in_other_path=_C
 						else:is_found_in_other_path=_C
 						if is_found_in_other_path:cls.set_active_path(path);cls._just_closed_path=_B;self._interact_control_element(context,elem,ob,InteractEvent.ADD_CP);return
 				else:new_elem_index=fill_index+1;cls._just_closed_path=_B
-			elif len(cls._get_active_path().control_elements)==1:batch,cls.active_index=cls._gpu_gen_batch_control_elements(_C,cls._get_active_path());cls._get_active_path().batch_control_elements=batch
-			if elem_index is not _A:cls.drag_elem_indices=[path.is_in_control_elements(elem)for path in cls.path_arr];cls._just_closed_path=_B
-			cls._drag_elem=elem
+			elif len(cls._get_active_path().control_elements)==1:cls._get_active_path().geom_control_elements=cls._gen_geometry_control_elements(cls._get_active_path())
+			if elem_index is not _A:cls.drag_elem_indices=[path.is_in_control_elements(ob,elem)for path in cls.path_arr];cls._just_closed_path=_B
+			cls._drag_elem=elem;cls._drag_ob=ob
 			if cls._just_closed_path:return self._interact_control_element(context,elem,ob,InteractEvent.ADD_NEW_PATH)
 			if new_elem_index is not _A:
-				linked_island_index=cls._get_linked_island_index(context,elem)
+				linked_island_index=cls._get_linked_island_index(ob,elem)
 				if cls._get_active_path().island_index!=linked_island_index:return self._interact_control_element(context,elem,ob,InteractEvent.ADD_NEW_PATH)
-				cls._get_active_path().insert_control_element(new_elem_index,elem);cls._update_fills_by_element_index(context,cls._get_active_path(),new_elem_index);batch,cls.active_index=cls._gpu_gen_batch_control_elements(_C,cls._get_active_path());cls._get_active_path().batch_control_elements=batch;cls.drag_elem_indices=[path.is_in_control_elements(elem)for path in cls.path_arr]
-		elif elem and interact_event is InteractEvent.ADD_NEW_PATH:
-			linked_island_index=cls._get_linked_island_index(context,elem);new_path=Path(elem,linked_island_index,ob)
+				cls._get_active_path().insert_control_element(new_elem_index,elem);cls._update_fills_by_element_index(context,cls._get_active_path(),new_elem_index);cls._get_active_path().geom_control_elements=cls._gen_geometry_control_elements(cls._get_active_path());cls.drag_elem_indices=[path.is_in_control_elements(ob,elem)for path in cls.path_arr]
+		elif elem is not _A and interact_event is InteractEvent.ADD_NEW_PATH:
+			linked_island_index=cls._get_linked_island_index(ob,elem);new_path=Path(elem,linked_island_index,ob,cls._get_mesh_graph(ob))
 			if props.use_topology_distance:new_path.flag|=PathFlag.TOPOLOGY
+			if props.use_weighted_cost:new_path.flag|=PathFlag.WEIGHTED
 			cls.path_arr.append(new_path);cls.set_active_path(new_path);cls._just_closed_path=_B;self._interact_control_element(context,elem,ob,InteractEvent.ADD_CP);self.report(type={_J},message=pgettext('Created new path',msgctxt))
-		elif elem and interact_event is InteractEvent.REMOVE_CP:
-			cls._just_closed_path=_B;elem_index=cls._get_active_path().is_in_control_elements(elem)
+		elif elem is not _A and interact_event is InteractEvent.REMOVE_CP:
+			cls._just_closed_path=_B;elem_index=cls._get_active_path().is_in_control_elements(ob,elem)
 			if elem_index is _A:
 				for path in cls.path_arr:
-					other_elem_index=path.is_in_control_elements(elem)
+					other_elem_index=path.is_in_control_elements(ob,elem)
 					if other_elem_index is not _A:cls.set_active_path(path);self._interact_control_element(context,elem,ob,InteractEvent.REMOVE_CP);return
 			else:
 				cls._get_active_path().pop_control_element(elem_index)
 				if not len(cls._get_active_path().control_elements):
 					cls.path_arr.remove(cls._get_active_path())
 					if len(cls.path_arr):cls.set_active_path(cls.path_arr[-1])
-				else:cls._update_fills_by_element_index(context,cls._get_active_path(),elem_index);batch,cls.active_index=cls._gpu_gen_batch_control_elements(_C,cls._get_active_path());cls._get_active_path().batch_control_elements=batch
-		elif elem and interact_event is InteractEvent.DRAG_CP:
-			if not cls._drag_elem or len(cls.drag_elem_indices)!=len(cls.path_arr):return
-			cls._just_closed_path=_B;linked_island_index=cls._get_linked_island_index(context,elem)
+				else:cls._update_fills_by_element_index(context,cls._get_active_path(),elem_index);cls._get_active_path().geom_control_elements=cls._gen_geometry_control_elements(cls._get_active_path())
+		elif elem is not _A and interact_event is InteractEvent.DRAG_CP:
+			if cls._drag_elem is _A or cls._drag_ob!=ob or len(cls.drag_elem_indices)!=len(cls.path_arr):return
+			cls._just_closed_path=_B;linked_island_index=cls._get_linked_island_index(ob,elem)
 			if cls._get_active_path().island_index==linked_island_index:
-				cls._drag_elem=elem
-				for(i,path)in enumerate(cls.path_arr):
-					j=cls.drag_elem_indices[i]
-					if j is not _A:path.control_elements[j]=elem;cls._update_fills_by_element_index(context,path,j);path.batch_control_elements,cls.active_index=cls._gpu_gen_batch_control_elements(path==cls._get_active_path(),path)
-		elif interact_event is InteractEvent.CHANGE_DIRECTION:cls._get_active_path().reverse();batch,cls.active_index=cls._gpu_gen_batch_control_elements(_C,cls._get_active_path());cls._get_active_path().batch_control_elements=batch;cls._just_closed_path=_B
+				cls._drag_elem=elem;cls.is_dragging=_C;items=[(path,j)for(path,j)in zip(cls.path_arr,cls.drag_elem_indices)if j is not _A]
+				for(path,j)in items:path.set_control_element(j,elem)
+				cls._update_fills_by_element_indices(context,items)
+				for(path,_)in items:path.geom_control_elements=cls._gen_geometry_control_elements(path)
+		elif interact_event is InteractEvent.CHANGE_DIRECTION:cls._get_active_path().reverse();cls._get_active_path().geom_control_elements=cls._gen_geometry_control_elements(cls._get_active_path());cls._just_closed_path=_B
 		elif interact_event is InteractEvent.CLOSE_PATH:
 			cls._get_active_path().flag^=PathFlag.CLOSED
 			if cls._get_active_path().flag&PathFlag.CLOSED:
 				cls._update_fills_by_element_index(context,cls._get_active_path(),0)
 				if len(cls._get_active_path().control_elements)>2:cls._just_closed_path=_C
-			else:cls._get_active_path().fill_elements[-1]=[];cls._get_active_path().batch_seq_fills[-1]=_A;cls._just_closed_path=_B;self._join_adjacent_to_active_path()
+			else:cls._get_active_path().set_fill(-1,core.EMPTY_FILL);cls._just_closed_path=_B;self._join_adjacent_to_active_path()
 		elif interact_event is InteractEvent.TOPOLOGY_DISTANCE:
 			cls._get_active_path().flag^=PathFlag.TOPOLOGY
-			for j in range(0,len(cls._get_active_path().control_elements),2):cls._update_fills_by_element_index(context,cls._get_active_path(),j)
+			cls._update_path_fills(context,cls._get_active_path())
 		elif interact_event is InteractEvent.RELEASE_PATH:
-			cls.drag_elem_indices.clear();cls._drag_elem=_A
+			cls.drag_elem_indices.clear();cls._drag_elem=_A;cls._drag_ob=_A;cls.is_dragging=_B;cls.drag_trees.clear()
 			for path in cls.path_arr:self._remove_path_doubles(context,path)
 			self._join_adjacent_to_active_path();cls._register_undo_step()
 	def draw(self,context:Context)->_A:layout=self.layout;layout.use_property_split=_C;props:WMProps=context.window_manager.select_path;props.ui_draw_func(layout)
@@ -450,7 +492,7 @@ class MESH_OT_select_path(Operator):
 					else:continue
 					with context.temp_override(window=window,area=area,region=region):bpy.ops.mesh.select_path('INVOKE_DEFAULT');cls.windows.add(window)
 		else:wm.modal_handler_add(self);return{_K}
-		ts=context.scene.tool_settings;num_undo_steps=context.preferences.edit.undo_steps;kc=wm.keyconfigs.user;km_path_tool=kc.keymaps[_N];kmi=km_path_tool.keymap_items[0];nav_events=[]
+		kc=wm.keyconfigs.user;km_path_tool=kc.keymaps[_N];kmi=km_path_tool.keymap_items[0];nav_events=[]
 		for kmi in kc.keymaps['3D View'].keymap_items:
 			kmi:KeyMapItem
 			if kmi.idname in('view3d.rotate','view3d.move','view3d.zoom','view3d.dolly','view3d.view_center_camera','view3d.view_center_lock','view3d.view_all','view3d.navigate','view3d.view_camera','view3d.view_axis','view3d.view_orbit','view3d.view_persportho','view3d.view_pan','view3d.view_roll','view3d.view_center_pick','view3d.view_selected'):
@@ -458,23 +500,29 @@ class MESH_OT_select_path(Operator):
 				if ev[0]=='WHEELINMOUSE':ev[0]='WHEELUPMOUSE'
 				elif ev[0]=='WHEELOUTMOUSE':ev[0]='WHEELDOWNMOUSE'
 				nav_events.append(tuple(ev))
-		cls.nav_events=tuple(nav_events);cls.path_arr.clear();cls.mesh_islands=list();cls.drag_elem_indices=list();cls._active_path_index=0;cls._drag_elem=_A;cls._just_closed_path=_B;cls.gpu_handles=list();cls.undo_history=collections.deque(maxlen=num_undo_steps);cls.redo_history=collections.deque(maxlen=num_undo_steps);cls.exec_select_arr=dict();cls.exec_markup_arr=dict();cls.initial_ts_msm=tuple(ts.mesh_select_mode);cls.initial_mesh_elements=_G
+		cls.nav_events=tuple(nav_events);cls._invoke_eval_state(context);elem,ob=cls._get_element_by_mouse(context,event)
+		if not elem:cls._cancel_all_instances(context);return{_L}
+		elem=elem.index
+		cls.gpu_handles=[SpaceView3D.draw_handler_add(self._gpu_draw_callback,tuple(),_F,'POST_VIEW')];cls._gpu_update_common_ubo(context);cls.gpu_draw_framework=bhqab.utils_gpu.DrawFramework(num=1);self._interact_control_element(context,elem,ob,InteractEvent.ADD_NEW_PATH);bhqab.utils_wm.tag_redraw_all_regions(context);wm.modal_handler_add(self);return self.modal(context,event)
+	@classmethod
+	def _invoke_eval_state(cls,context:Context)->_A:
+		'''Reset operator state and evaluate edit meshes, does not depend on window, region and event.'''
+		ts=context.scene.tool_settings;undo_memory_limit=context.preferences.edit.undo_memory_limit;addon_pref=_get_addon_preferences(context);profiling.profiler.enabled=bool(addon_pref is not _A and addon_pref.use_profiling and bhqab.utils_ui.developer_extras_poll(context));cls.path_arr.clear();cls.mesh_islands=dict();cls.drag_elem_indices=list();cls._active_path_index=0;cls._drag_elem=_A;cls._drag_ob=_A;cls.is_dragging=_B;cls._just_closed_path=_B;cls.drag_pending=_A;cls.drag_ready_time=.0;cls.progressive_solves=dict();cls.progressive_min_nodes=addon_pref.progressive_solve_min_elements if addon_pref is not _A and addon_pref.use_progressive_solve else 0;cls.gpu_handles=list();cls.undo_history=history.UndoHistory(budget=undo_memory_limit<<20 or history.DEFAULT_BUDGET);cls.exec_select_arr=dict();cls.exec_markup_arr=dict();cls.mesh_graphs=dict();cls.drag_trees=dict();cls.initial_ts_msm=tuple(ts.mesh_select_mode);cls.initial_mesh_elements=_G
 		if cls.initial_ts_msm[2]:cls.initial_mesh_elements=_E
 		cls.prior_ts_msm=_B,_C,_B;cls.prior_mesh_elements=_G;cls.select_ts_msm=_C,_B,_B;cls.select_mesh_elements='verts'
 		if cls.initial_ts_msm[2]:cls.prior_ts_msm=_B,_B,_C;cls.prior_mesh_elements=_E;cls.select_ts_msm=_B,_B,_C;cls.select_mesh_elements=_E
-		cls._eval_meshes(context);cls.initial_select=cls._get_selected_elements(cls.initial_mesh_elements);cls._invoke_tweak_options(context);elem,ob=cls._get_element_by_mouse(context,event)
-		if not elem:cls._cancel_all_instances(context);return{_L}
-		cls.gpu_handles=[SpaceView3D.draw_handler_add(self._gpu_draw_callback,tuple(),_F,'POST_VIEW')];shaders.register();cls._gpu_update_common_ubo(context);cls.gpu_draw_framework=bhqab.utils_gpu.DrawFramework(num=1);self._interact_control_element(context,elem,ob,InteractEvent.ADD_NEW_PATH);wm.modal_handler_add(self);return self.modal(context,event)
+		cls._eval_meshes(context);cls.initial_select=cls._get_selected_elements(cls.initial_mesh_elements);cls._invoke_tweak_options(context)
 	@classmethod
 	def _cancel_all_instances(cls,context:Context)->_A:
-		wm_props:WMProps=context.window_manager.select_path;cls.windows.clear()
+		wm_props:WMProps=context.window_manager.select_path;cls.windows.clear();cls._remove_drag_timer(context);cls._cancel_progressive_solves()
 		ts=context.tool_settings
 		# Restore initial state if it was set
 		if hasattr(cls,'initial_ts_msm')and cls.initial_ts_msm:ts.mesh_select_mode=cls.initial_ts_msm
 		if hasattr(cls,'initial_select')and cls.initial_select:
 			try:cls._set_selection_state(cls.initial_select,_C)
 			except ReferenceError:pass
-		cls._update_meshes();cls._gpu_remove_handles();cls.gpu_draw_framework=_A;wm_props.is_runtime=_B
+		cls._update_meshes();cls._gpu_remove_handles();cls.gpu_draw_framework=_A;cls.gpu_draw_list=_A;wm_props.is_runtime=_B
+		if hasattr(cls,'undo_history'):cls.undo_history.clear()
 	def cancel(self,context:Context):
 		cls=self.__class__
 		if context.window in cls.windows:cls.windows.remove(context.window)
@@ -484,7 +532,7 @@ class MESH_OT_select_path(Operator):
 		if not cls.windows:return{_L}
 		wm=context.window_manager;wm_props:WMProps=wm.select_path;addon_pref:Preferences=_get_addon_preferences(context);ev=cls._pack_event(event);interact_event=_A;kc=context.window_manager.keyconfigs.user;km:KeyMap=kc.keymaps.get(TOOL_KM_NAME);kmi:_A|KeyMapItem=km.keymap_items.match_event(event)
 		if InteractEvent.CANCEL.name in self.context_action or kmi and InteractEvent.CANCEL.name==kmi.properties.action:cls._cancel_all_instances(context);return{_L}
-		elif InteractEvent.APPLY_PATHS.name in self.context_action or kmi and InteractEvent.APPLY_PATHS.name==kmi.properties.action:cls.windows.clear();cls._eval_final_element_indices_arrays();cls._gpu_remove_handles();return self.execute(context)
+		elif InteractEvent.APPLY_PATHS.name in self.context_action or kmi and InteractEvent.APPLY_PATHS.name==kmi.properties.action:cls.windows.clear();cls._remove_drag_timer(context);cls._eval_progressive_solves(-1.);cls._cancel_progressive_solves();cls._eval_final_element_indices_arrays();cls._gpu_remove_handles();return self.execute(context)
 		elif cls._get_interactive_ui_under_mouse(context,event)is _A:return{_K}
 		elif ev in cls.nav_events:return{_V}
 		elif InteractEvent.CLOSE_PATH.name in self.context_action or kmi and InteractEvent.CLOSE_PATH.name==kmi.properties.action:interact_event=InteractEvent.CLOSE_PATH
@@ -496,11 +544,18 @@ class MESH_OT_select_path(Operator):
 		elif kmi and InteractEvent.ADD_NEW_PATH.name==kmi.properties.action:cls.is_interaction=_C;interact_event=InteractEvent.ADD_NEW_PATH
 		elif kmi and InteractEvent.REMOVE_CP.name==kmi.properties.action:interact_event=InteractEvent.REMOVE_CP
 		if cls.is_interaction:
-			if'MOUSEMOVE'==event.type:interact_event=InteractEvent.DRAG_CP
+			if'MOUSEMOVE'==event.type:
+				if cls.drag_pending is not _A:profiling.profiler.count('Coalesced Moves')
+				cls.drag_pending=event.mouse_x,event.mouse_y
 			elif'RELEASE'==event.value:cls.is_interaction=_B;interact_event=InteractEvent.RELEASE_PATH
+			# Moves queued while the previous one was processed are coalesced to the newest position, which is processed on the next move or timer event after the time budget, or before release
+			if cls.drag_pending is not _A and(interact_event is InteractEvent.RELEASE_PATH or time.perf_counter()>=cls.drag_ready_time):mouse_event=_MouseEvent(*cls.drag_pending);cls.drag_pending=_A;self._interact(context,mouse_event,InteractEvent.DRAG_CP);cls.drag_ready_time=time.perf_counter()+_DRAG_FRAME_BUDGET_S
 		if kmi and InteractEvent.PIE.name==kmi.properties.action:cls.is_interaction=_B;context.window_manager.popup_menu_pie(event=event,draw_func=self._ui_draw_popup_menu_pie,title='Path Tool',icon=_D);return{_K}
-		elif interact_event is not _A:elem,ob=cls._get_element_by_mouse(context,event);self._interact_control_element(context,elem,ob,interact_event);cls._set_selection_state(cls.initial_select,_C);cls._update_meshes()
+		elif interact_event is not _A:self._interact(context,event,interact_event)
 		if not len(cls.path_arr):cls._cancel_all_instances(context);return{_L}
+		# Timer events pick up coalesced drag moves when the mouse stops
+		if not cls.is_interaction:cls.drag_pending=_A;cls._remove_drag_timer(context)
+		elif cls.drag_timer is _A:cls.drag_timer=wm.event_timer_add(_DRAG_FRAME_BUDGET_S,window=context.window)
 		self.context_action=set()
 		if addon_pref is not _A and cls.gpu_draw_framework is not _A:
 			cls.gpu_draw_framework.aa_method=addon_pref.aa_method
@@ -508,46 +563,36 @@ class MESH_OT_select_path(Operator):
 			elif addon_pref.aa_method=='SMAA':cls.gpu_draw_framework.aa.preset=addon_pref.smaa_preset
 			cls.gpu_draw_framework.modal_eval(context,color_format='RGBA32F',depth_format='DEPTH_COMPONENT32F',percentage=100)
 		wm_props.is_runtime=_C;return{_K}
+	def _interact(self,context:Context,event:Event|_MouseEvent,interact_event:InteractEvent)->_A:
+		cls=self.__class__;elem,ob=cls._get_element_by_mouse(context,event);elem=elem.index if elem else _A;self._interact_control_element(context,elem,ob,interact_event)
+		# Mesh is updated only if picking fallback has changed selection, otherwise only viewports showing objects of changed paths are redrawn
+		if cls._is_select_changed:cls._is_select_changed=_B;cls._set_selection_state(cls.initial_select,_C);cls._update_meshes()
+		else:cls._tag_redraw_objects(context,cls._gpu_eval_redraw_objects())
+	@classmethod
+	def _remove_drag_timer(cls,context:Context)->_A:
+		if cls.drag_timer is not _A:context.window_manager.event_timer_remove(cls.drag_timer);cls.drag_timer=_A
 	@classmethod
 	def _eval_final_element_indices_arrays(cls)->_A:
 		cls.exec_select_arr=dict();cls.exec_markup_arr=dict()
-		for(ob,_bm)in cls.bm_arr:
-			index_select_seq=[];index_markup_seq=[]
-			for path in cls.path_arr:
-				if path.ob==ob:
-					for fill_seq in path.fill_elements:index_select_seq.extend([_.index for _ in fill_seq])
-					if cls.prior_ts_msm[1]:index_markup_seq=index_select_seq
-					if cls.prior_ts_msm[2]:
-						index_select_seq.extend([face.index for face in path.control_elements]);tmp=path.fill_elements;tmp.append(path.control_elements)
-						for fill_seq in tmp:
-							for face in fill_seq:index_markup_seq.extend([e.index for e in face.edges])
-				cls.exec_select_arr[ob]=list(dict.fromkeys(index_select_seq));cls.exec_markup_arr[ob]=list(dict.fromkeys(index_markup_seq))
+		for(ob,(index_select_seq,index_markup_seq))in core.eval_element_indices(cls.path_arr,is_faces=bool(cls.prior_ts_msm[2])).items():cls.exec_select_arr[ob]=index_select_seq;cls.exec_markup_arr[ob]=index_markup_seq
 		cls._update_meshes()
-	def execute(self,context:Context):
-		C='TOGGLE';B='CLEAR';A='MARK';cls=self.__class__;ts=context.tool_settings;wm_props=context.window_manager.select_path;ts.mesh_select_mode=cls.prior_ts_msm;cls._eval_meshes(context);cls.initial_select=cls._get_selected_elements(cls.prior_mesh_elements)
-		for(ob,bm)in cls.bm_arr:
-			if wm_props.mark_select!=_D:
-				index_select_seq=cls.exec_select_arr[ob];elem_seq=bm.edges
-				if cls.prior_ts_msm[2]:elem_seq=bm.faces
-				if wm_props.mark_select==_M:
-					for i in index_select_seq:elem_seq[i].select_set(_C)
-				elif wm_props.mark_select=='SUBTRACT':
-					for i in index_select_seq:elem_seq[i].select_set(_B)
-				elif wm_props.mark_select=='INVERT':
-					for i in index_select_seq:elem_seq[i].select_set(not elem_seq[i].select)
-			index_markup_seq=cls.exec_markup_arr[ob];elem_seq=bm.edges
-			if wm_props.mark_seam!=_D:
-				if wm_props.mark_seam==A:
-					for i in index_markup_seq:elem_seq[i].seam=_C
-				elif wm_props.mark_seam==B:
-					for i in index_markup_seq:elem_seq[i].seam=_B
-				elif wm_props.mark_seam==C:
-					for i in index_markup_seq:elem_seq[i].seam=not elem_seq[i].seam
-			if wm_props.mark_sharp!=_D:
-				if wm_props.mark_sharp==A:
-					for i in index_markup_seq:elem_seq[i].smooth=_B
-				elif wm_props.mark_sharp==B:
-					for i in index_markup_seq:elem_seq[i].smooth=_C
-				elif wm_props.mark_sharp==C:
-					for i in index_markup_seq:elem_seq[i].smooth=not elem_seq[i].smooth
-		wm_props.is_runtime=_B;self._update_meshes();return{'FINISHED'}
\ No newline at end of file
+	def execute(self,context:Context):return self._execute(context)
+	@classmethod
+	@profiling.timed('Execute')
+	def _execute(cls,context:Context)->set[str]:
+		ts=context.tool_settings;wm_props=context.window_manager.select_path;ts.mesh_select_mode=cls.prior_ts_msm
+		# Edit meshes are evaluated again since on redo they have been freed by undo
+		cls._eval_meshes(context);objects=tuple(ob for(ob,_bm)in cls.bm_arr);is_faces=bool(cls.prior_ts_msm[2]);num_written=sum(len(cls.exec_select_arr[ob])+len(cls.exec_markup_arr[ob])for ob in cls.exec_select_arr);num_elements=sum(len(bm.faces)if is_faces else len(bm.edges)for(_ob,bm)in cls.bm_arr)
+		# Short paths are written to edit meshes directly, converting the whole meshes out of edit mode and back would take longer
+		if num_written<=markup.BMESH_MAX_FRACTION*num_elements:
+			profiling.profiler.count('Element Markup')
+			for(ob,bm)in cls.bm_arr:
+				if ob in cls.exec_select_arr:markup.apply_markup_bmesh(bm,is_faces=is_faces,select_indices=cls.exec_select_arr[ob],markup_indices=cls.exec_markup_arr[ob],mark_select=wm_props.mark_select,mark_seam=wm_props.mark_seam,mark_sharp=wm_props.mark_sharp)
+			cls.initial_select=cls._get_selected_elements(cls.prior_mesh_elements);wm_props.is_runtime=_B;cls._update_meshes(is_select_only=wm_props.mark_seam==_D and wm_props.mark_sharp==_D);return{'FINISHED'}
+		profiling.profiler.count('Bulk Markup')
+		# Mesh attributes can be written in bulk only outside of edit mode
+		bpy.ops.object.mode_set(mode='OBJECT')
+		for ob in objects:
+			if ob in cls.exec_select_arr:markup.apply_markup(ob.data,is_faces=is_faces,select_indices=cls.exec_select_arr[ob],markup_indices=cls.exec_markup_arr[ob],mark_select=wm_props.mark_select,mark_seam=wm_props.mark_seam,mark_sharp=wm_props.mark_sharp)
+		bpy.ops.object.mode_set(mode='EDIT');cls._eval_meshes(context);cls.initial_select=cls._get_selected_elements(cls.prior_mesh_elements);wm_props.is_runtime=_B;cls._update_meshes();return{'FINISHED'}
+def _progressive_solve_timer()->_A|float:return MESH_OT_select_path._progressive_solve_step()
@@ -0,0 +1,93 @@
+from __future__ import annotations
+import numpy as np
+from typing import Iterable
+from.graph import foreach_get_array
+from typing import TYPE_CHECKING
+if TYPE_CHECKING:from bpy.types import Mesh;from bmesh.types import BMesh
+__all__='BMESH_MAX_FRACTION','apply_markup','apply_markup_bmesh'
+
+BMESH_MAX_FRACTION=.05
+'''Largest share of mesh elements (edges or faces) written by paths which is applied to edit mesh element by element.
+
+Bulk write needs the mesh to leave edit mode and enter it again, which converts the whole mesh twice. A single element
+written by the BMesh API is assumed to take about as long as conversion of forty elements. Operator profiling counts
+executions of both ways ("Element Markup" and "Bulk Markup" counters) next to "Execute" phase durations, so the
+crossover can be checked on real meshes.
+'''
+
+def _eval_mask(num:int,indices:Iterable[int])->np.ndarray:
+	ret=np.zeros(num,dtype=bool)
+	ret[np.asarray(indices,dtype=np.int32)]=True
+	return ret
+
+def _eval_mode(value:np.ndarray,mask:np.ndarray,mode:str,*,on:str,off:str)->np.ndarray:
+	if mode==on:return value|mask
+	elif mode==off:return value&~mask
+	elif mode in{'TOGGLE','INVERT'}:return value^mask
+	return value
+
+def _eval_flag(value:bool,mode:str)->bool:
+	if mode=='MARK':return True
+	elif mode=='CLEAR':return False
+	elif mode=='TOGGLE':return not value
+	return value
+
+def apply_markup(mesh:Mesh,*,is_faces:bool,select_indices:Iterable[int],markup_indices:Iterable[int],mark_select:str,mark_seam:str,mark_sharp:str)->None:
+	'''Apply path elements to mesh data in one vectorized pass, mesh should not be in edit mode.
+
+	Selection indices are faces in face mode and edges otherwise, markup indices are always edges. Modes are the
+	same as ``WMProps.mark_select``, ``WMProps.mark_seam`` and ``WMProps.mark_sharp`` items. Selection of other
+	element types is flushed the same way as edit mode select mode (edges or faces) does.
+	'''
+	num_edges=len(mesh.edges)
+	if mark_select!='NONE':
+		edge_verts=foreach_get_array(mesh.edges,'vertices',np.int32,2)
+		loop_edges=foreach_get_array(mesh.loops,'edge_index',np.int32)
+		loop_totals=foreach_get_array(mesh.polygons,'loop_total',np.int32)
+		num_faces=len(loop_totals)
+		if is_faces:
+			face_select=_eval_mode(foreach_get_array(mesh.polygons,'select',bool),_eval_mask(num_faces,select_indices),mark_select,on='EXTEND',off='SUBTRACT')
+			# Edges without faces keep their selection
+			edge_select=foreach_get_array(mesh.edges,'select',bool)
+			edge_select[loop_edges]=False
+			edge_select[loop_edges[np.repeat(face_select,loop_totals)]]=True
+		else:
+			edge_select=_eval_mode(foreach_get_array(mesh.edges,'select',bool),_eval_mask(num_edges,select_indices),mark_select,on='EXTEND',off='SUBTRACT')
+			face_select=np.zeros(num_faces,dtype=bool)
+			if num_faces:
+				loop_starts=np.zeros(num_faces,dtype=np.int64)
+				np.cumsum(loop_totals[:-1],out=loop_starts[1:])
+				face_select=np.logical_and.reduceat(edge_select[loop_edges],loop_starts)
+		# Vertices without edges keep their selection
+		vert_select=foreach_get_array(mesh.vertices,'select',bool)
+		vert_select[edge_verts.ravel()]=False
+		vert_select[edge_verts[edge_select].ravel()]=True
+		mesh.vertices.foreach_set('select',vert_select)
+		mesh.edges.foreach_set('select',edge_select)
+		mesh.polygons.foreach_set('select',face_select)
+	if mark_seam!='NONE' or mark_sharp!='NONE':
+		markup_mask=_eval_mask(num_edges,markup_indices)
+		if mark_seam!='NONE':mesh.edges.foreach_set('use_seam',_eval_mode(foreach_get_array(mesh.edges,'use_seam',bool),markup_mask,mark_seam,on='MARK',off='CLEAR'))
+		if mark_sharp!='NONE':mesh.edges.foreach_set('use_edge_sharp',_eval_mode(foreach_get_array(mesh.edges,'use_edge_sharp',bool),markup_mask,mark_sharp,on='MARK',off='CLEAR'))
+	mesh.update()
+
+def apply_markup_bmesh(bm:BMesh,*,is_faces:bool,select_indices:Iterable[int],markup_indices:Iterable[int],mark_select:str,mark_seam:str,mark_sharp:str)->None:
+	'''Apply path elements to edit mesh element by element, arguments are the same as of ``apply_markup``. Selection
+	is not flushed, that is done by edit mesh update.'''
+	bm.edges.ensure_lookup_table()
+	if mark_select!='NONE':
+		elem_seq=bm.edges
+		if is_faces:
+			bm.faces.ensure_lookup_table()
+			elem_seq=bm.faces
+		for i in select_indices:
+			elem=elem_seq[i]
+			if mark_select=='EXTEND':elem.select_set(True)
+			elif mark_select=='SUBTRACT':elem.select_set(False)
+			elif mark_select=='INVERT':elem.select_set(not elem.select)
+	if mark_seam!='NONE' or mark_sharp!='NONE':
+		for i in markup_indices:
+			elem=bm.edges[i]
+			if mark_seam!='NONE':elem.seam=_eval_flag(elem.seam,mark_seam)
+			# Sharp edge is a not smooth one
+			if mark_sharp!='NONE':elem.smooth=not _eval_flag(not elem.smooth,mark_sharp)
@@ -0,0 +1,57 @@
+from __future__ import annotations
+from typing import Iterable
+from mathutils import Vector
+from mathutils.bvhtree import BVHTree
+from bpy_extras import view3d_utils
+from typing import TYPE_CHECKING
+if TYPE_CHECKING:from bpy.types import Object,Region,RegionView3D;from bmesh.types import BMesh,BMFace,BMVert
+__all__='get_bvh_tree','pick_element','clear_cache'
+
+_CACHE:dict[int,tuple[tuple[int,int],BVHTree]]=dict()
+_RAY_STEP=1e-5
+'''Distance a ray is advanced past a hidden face hit, relative to the hit location magnitude.'''
+
+def get_bvh_tree(ob:Object,bm:BMesh,*,key:tuple[int,int])->BVHTree:
+	'''BVH tree of object edit mesh, rebuilt only if mesh key (topology and geometry fingerprints) has changed.'''
+	ptr=ob.data.as_pointer()
+	item=_CACHE.get(ptr)
+	if item is None or item[0]!=key:
+		item=key,BVHTree.FromBMesh(bm)
+		_CACHE[ptr]=item
+	return item[1]
+
+def pick_element(*,region:Region,rv3d:RegionView3D,coord:tuple[float,float],items:Iterable[tuple[Object,BMesh,tuple[int,int]]],is_faces:bool)->tuple[None|BMVert|BMFace,None|Object]:
+	'''Find element under region coordinates by casting a ray against BVH trees of edit objects.
+
+	The nearest visible hit face is picked in face mode, in vertex mode - the vertex of that face which is the closest to
+	the cursor in region space. Returns ``(None, None)`` if nothing was hit.
+	'''
+	coord=Vector(coord)
+	ray_origin=view3d_utils.region_2d_to_origin_3d(region,rv3d,coord)
+	ray_direction=view3d_utils.region_2d_to_vector_3d(region,rv3d,coord)
+	r_face=r_ob=None
+	r_distance=float('inf')
+	for ob,bm,key in items:
+		matrix_inv=ob.matrix_world.inverted_safe()
+		origin_local=matrix_inv@ray_origin
+		direction_local=(matrix_inv.to_3x3()@ray_direction).normalized()
+		bvh_tree=get_bvh_tree(ob,bm,key=key)
+		location,_normal,index,_distance=bvh_tree.ray_cast(origin_local,direction_local)
+		# Hidden faces are in the tree too, so the ray is cast again from just behind them
+		while location is not None and bm.faces[index].hide:location,_normal,index,_distance=bvh_tree.ray_cast(location+direction_local*(_RAY_STEP*max(1.,location.length)),direction_local)
+		if location is None:continue
+		distance=(ob.matrix_world@location-ray_origin).length
+		if distance<r_distance:r_face,r_ob,r_distance=bm.faces[index],ob,distance
+	if r_face is None:return None,None
+	if is_faces:return r_face,r_ob
+	r_vert=None
+	r_distance_px=float('inf')
+	for vert in r_face.verts:
+		co_2d=view3d_utils.location_3d_to_region_2d(region,rv3d,r_ob.matrix_world@vert.co)
+		if co_2d is None:continue
+		distance_px=(co_2d-coord).length
+		if distance_px<r_distance_px:r_vert,r_distance_px=vert,distance_px
+	if r_vert is None:return None,None
+	return r_vert,r_ob
+
+def clear_cache()->None:_CACHE.clear()
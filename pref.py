@@ -19,18 +19,32 @@ from.import INFO_DIR
 from.import langs
 from.import main
 from.import icons
+from.import profiling
 from.lib import bhqab
 from.lib import bhqupd
 from bpy.types import AddonPreferences,Context,KeyMap,Menu,Operator,OperatorProperties,UILayout
-from bpy.props import BoolProperty,EnumProperty,FloatVectorProperty,IntProperty
+from bpy.props import BoolProperty,EnumProperty,FloatVectorProperty,IntProperty,StringProperty
+from bpy_extras.io_utils import ExportHelper
 from bl_operators.presets import AddPresetBase
 from bpy.app.translations import pgettext
 import rna_keymap_ui
 from typing import TYPE_CHECKING
 if TYPE_CHECKING:from.props import WMProps
 PREF_TEXTS=dict()
+def _update_use_profiling(self,context:Context)->None:profiling.profiler.enabled=self.use_profiling and bhqab.utils_ui.developer_extras_poll(context)
+def _draw_profiling(layout:UILayout)->None:
+	A=True;summary=profiling.profiler.summary();col=layout.column(align=A)
+	if not summary:col.label(text='No samples yet, use the tool to collect them',text_ctxt=_A)
+	else:
+		row=col.row(align=A)
+		for text in('Phase','Count','Last',*(f"p{q}"for q in profiling.PERCENTILES),'Max'):row.label(text=text,translate=False)
+		for(name,count,*values)in summary:
+			row=col.row(align=A);row.label(text=name,translate=False);row.label(text=str(count),translate=False)
+			for value in values:row.label(text=f"{value*1e3:.2f} ms",translate=False)
+		for(name,value)in profiling.profiler.counters.items():row=col.row(align=A);row.label(text=name,translate=False);row.label(text=str(value),translate=False)
+	row=layout.row(align=A);row.operator(PREFERENCES_OT_path_tool_profiling_export.bl_idname,icon='EXPORT');row.operator(PREFERENCES_OT_path_tool_profiling_reset.bl_idname,icon='TRASH')
 class Preferences(AddonPreferences):
-	bl_idname=ADDON_PKG;tab:EnumProperty(items=((_H,'Appearance','Appearance settings',icons.get_id(_F),1<<0),('BEHAVIOR','Behavior','Behavior settings',icons.get_id('behavior'),1<<1),('KEYMAP','Keymap','Keymap settings',icons.get_id('keymap'),1<<2),('INFO','Info','How to use the addon, relative links and licensing information',icons.get_id('info'),1<<3)),default=_H,options={_I,_B},translation_context=_A,name='Tab',description='User preferences tab to be displayed');info_tab:EnumProperty(items=((_J,'How To Use the Addon','',icons.get_id('readme'),1<<0),(_K,'License','',icons.get_id('license'),1<<1),(_L,'Updates','',icons.get_id('update'),1<<2),(_G,'Links','',icons.get_id('links'),1<<3)),default={_G},options={'ENUM_FLAG',_I,_B},translation_context=_A);color_control_element:FloatVectorProperty(default=(.8,.8,.8,.8),subtype=_D,size=4,min=_E,max=_C,options={_B},translation_context=_A,name='Control Element',description='Control element color');color_active_control_element:FloatVectorProperty(default=(.039087,.331906,.940392,.8),subtype=_D,size=4,min=_E,max=_C,options={_B},translation_context=_A,name='Active Control Element',description='Color of active control element');color_path:FloatVectorProperty(default=(.593397,.708376,.634955,.8),subtype=_D,size=4,min=_E,max=_C,options={_B},translation_context=_A,name='Path',description='Regular path color');color_path_topology:FloatVectorProperty(default=(_C,.952328,.652213,.8),subtype=_D,size=4,min=_E,max=_C,options={_B},translation_context=_A,name='Topology Path',description='Color of paths which uses topology calculation method');color_active_path:FloatVectorProperty(default=(.304987,.708376,.450786,.8),subtype=_D,size=4,min=_E,max=_C,options={_B},translation_context=_A,name='Active Path',description='Active path color');color_active_path_topology:FloatVectorProperty(default=(_C,.883791,.152213,.8),subtype=_D,size=4,min=_E,max=_C,options={_B},translation_context=_A,name='Active Topology Path',description='Color of active path which uses topology calculation method');color_path_behind:FloatVectorProperty(default=(.883791,.883791,.883791,.8),subtype=_D,size=4,min=_E,max=_C,options={_B},translation_context=_A,name='Path Behind Mesh',description='The color of the path displayed behind the mesh');point_size:IntProperty(default=3,min=0,max=50,soft_max=20,subtype='FACTOR',options={_B},translation_context=_A,name='Vertex Size',description='The size of the vertex that represents the control element');line_width:IntProperty(default=3,min=1,max=9,soft_min=3,soft_max=6,subtype='PIXEL',options={_B},translation_context=_A,name='Line Thickness',description='The thickness of the lines that mark the segments of the path');auto_tweak_options:BoolProperty(default=False,options={_B},translation_context=_A,name='Auto Tweak Options',description='Adjust operator options. If no mesh element is initially selected, the selection option will be changed to "Extend". If all elements are selected, it will be changed to "Do nothing"');aa_method:bhqab.utils_gpu.DrawFramework.get_prop_aa_method();fxaa_preset:bhqab.utils_gpu.FXAA.get_prop_preset();fxaa_value:bhqab.utils_gpu.FXAA.get_prop_value();smaa_preset:bhqab.utils_gpu.SMAA.get_prop_preset()
+	bl_idname=ADDON_PKG;tab:EnumProperty(items=((_H,'Appearance','Appearance settings',icons.get_id(_F),1<<0),('BEHAVIOR','Behavior','Behavior settings',icons.get_id('behavior'),1<<1),('KEYMAP','Keymap','Keymap settings',icons.get_id('keymap'),1<<2),('INFO','Info','How to use the addon, relative links and licensing information',icons.get_id('info'),1<<3)),default=_H,options={_I,_B},translation_context=_A,name='Tab',description='User preferences tab to be displayed');info_tab:EnumProperty(items=((_J,'How To Use the Addon','',icons.get_id('readme'),1<<0),(_K,'License','',icons.get_id('license'),1<<1),(_L,'Updates','',icons.get_id('update'),1<<2),(_G,'Links','',icons.get_id('links'),1<<3)),default={_G},options={'ENUM_FLAG',_I,_B},translation_context=_A);color_control_element:FloatVectorProperty(default=(.8,.8,.8,.8),subtype=_D,size=4,min=_E,max=_C,options={_B},translation_context=_A,name='Control Element',description='Control element color');color_active_control_element:FloatVectorProperty(default=(.039087,.331906,.940392,.8),subtype=_D,size=4,min=_E,max=_C,options={_B},translation_context=_A,name='Active Control Element',description='Color of active control element');color_path:FloatVectorProperty(default=(.593397,.708376,.634955,.8),subtype=_D,size=4,min=_E,max=_C,options={_B},translation_context=_A,name='Path',description='Regular path color');color_path_topology:FloatVectorProperty(default=(_C,.952328,.652213,.8),subtype=_D,size=4,min=_E,max=_C,options={_B},translation_context=_A,name='Topology Path',description='Color of paths which uses topology calculation method');color_active_path:FloatVectorProperty(default=(.304987,.708376,.450786,.8),subtype=_D,size=4,min=_E,max=_C,options={_B},translation_context=_A,name='Active Path',description='Active path color');color_active_path_topology:FloatVectorProperty(default=(_C,.883791,.152213,.8),subtype=_D,size=4,min=_E,max=_C,options={_B},translation_context=_A,name='Active Topology Path',description='Color of active path which uses topology calculation method');color_path_behind:FloatVectorProperty(default=(.883791,.883791,.883791,.8),subtype=_D,size=4,min=_E,max=_C,options={_B},translation_context=_A,name='Path Behind Mesh',description='The color of the path displayed behind the mesh');point_size:IntProperty(default=3,min=0,max=50,soft_max=20,subtype='FACTOR',options={_B},translation_context=_A,name='Vertex Size',description='The size of the vertex that represents the control element');line_width:IntProperty(default=3,min=1,max=9,soft_min=3,soft_max=6,subtype='PIXEL',options={_B},translation_context=_A,name='Line Thickness',description='The thickness of the lines that mark the segments of the path');auto_tweak_options:BoolProperty(default=False,options={_B},translation_context=_A,name='Auto Tweak Options',description='Adjust operator options. If no mesh element is initially selected, the selection option will be changed to "Extend". If all elements are selected, it will be changed to "Do nothing"');use_progressive_solve:BoolProperty(default=True,options={_B},translation_context=_A,name='Progressive Solving',description='Solve long paths on large meshes in the background. A preview of the path is displayed and the viewport can be navigated while the path is solved');progressive_solve_min_elements:IntProperty(default=200000,min=1000,soft_max=2000000,options={_B},translation_context=_A,name='Minimal Elements',description='Minimal number of mesh elements (vertices or faces) of meshes which paths are solved progressively');use_profiling:BoolProperty(default=False,options={_B},update=_update_use_profiling,translation_context=_A,name='Profiling',description='Measure duration of picking, island lookup, path solving, draw buffers, drawing and execution. Available while "Developer Extras" are enabled');aa_method:bhqab.utils_gpu.DrawFramework.get_prop_aa_method();fxaa_preset:bhqab.utils_gpu.FXAA.get_prop_preset();fxaa_value:bhqab.utils_gpu.FXAA.get_prop_value();smaa_preset:bhqab.utils_gpu.SMAA.get_prop_preset()
 	def draw(self,context:Context)->None:
 		E='QUESTION';D='Recommended';C='NONE';B='info_tab';A=True;layout:UILayout=self.layout;layout.use_property_split=A;row=layout.row();row.prop_tabs_enum(self,'tab')
 		match self.tab:
@@ -40,9 +54,12 @@ class Preferences(AddonPreferences):
 				elif self.aa_method=='SMAA':col.prop(self,'smaa_preset')
 				else:col.label(text='Unknown Anti-Aliasing Method.')
 			case'BEHAVIOR':
-				layout.prop(self,'auto_tweak_options');pref_inputs=context.preferences.inputs
+				layout.prop(self,'auto_tweak_options');col=layout.column(align=A);col.prop(self,'use_progressive_solve');scol=col.column(align=A);scol.enabled=self.use_progressive_solve;scol.prop(self,'progressive_solve_min_elements');pref_inputs=context.preferences.inputs
 				if not pref_inputs.use_mouse_depth_navigate:col=layout.column(align=A);col.label(text=D,icon=E);col.prop(context.preferences.inputs,'use_mouse_depth_navigate')
 				if not pref_inputs.use_zoom_to_mouse:col=layout.column(align=A);col.label(text=D,icon=E);col.prop(context.preferences.inputs,'use_zoom_to_mouse')
+				if bhqab.utils_ui.developer_extras_poll(context):
+					bhqab.utils_ui.template_developer_extras_warning(context,layout);layout.prop(self,'use_profiling')
+					if self.use_profiling:_draw_profiling(layout)
 			case'KEYMAP':
 				wm=context.window_manager;wm_props:WMProps=wm.select_path;col=layout.column();col.enabled=not wm_props.is_runtime;kc=wm.keyconfigs.user;km:KeyMap=kc.keymaps.get(main.TOOL_KM_NAME)
 				if km:
@@ -66,4 +83,13 @@ class PREFERENCES_OT_path_tool_appearance_preset(AddPresetBase,Operator):
 	def description(cls,_context:Context,properties:OperatorProperties)->str:
 		msgctxt=cls.__qualname__
 		if properties.remove_active:return pgettext('Remove preset',msgctxt)
-		else:return pgettext('Add preset',msgctxt)
\ No newline at end of file
+		else:return pgettext('Add preset',msgctxt)
+class PREFERENCES_OT_path_tool_profiling_export(Operator,ExportHelper):
+	bl_idname='preferences.path_tool_profiling_export';bl_label='Export';bl_description='Write collected timings to a CSV file, or append them to a log file for any other extension';bl_options={'INTERNAL'};bl_translation_context='PREFERENCES_OT_path_tool_profiling_export';filename_ext='.csv';check_extension=None;filter_glob:StringProperty(default='*.csv;*.log;*.txt',options={_I})
+	def execute(self,context:Context)->set[str]:
+		if self.filepath.lower().endswith('.csv'):profiling.profiler.write_csv(self.filepath)
+		else:profiling.profiler.write_log(self.filepath)
+		self.report({'INFO'},pgettext('Timings written to "{filepath}"',self.__class__.__qualname__).format(filepath=self.filepath));return{'FINISHED'}
+class PREFERENCES_OT_path_tool_profiling_reset(Operator):
+	bl_idname='preferences.path_tool_profiling_reset';bl_label='Reset';bl_description='Discard collected timings';bl_options={'INTERNAL'};bl_translation_context='PREFERENCES_OT_path_tool_profiling_reset'
+	def execute(self,context:Context)->set[str]:profiling.profiler.reset();return{'FINISHED'}
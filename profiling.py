@@ -0,0 +1,113 @@
+from __future__ import annotations
+import collections
+import contextlib
+import csv
+import functools
+import time
+import numpy as np
+from typing import Callable,TypeVar
+__all__='WINDOW','PERCENTILES','Profiler','profiler','timed'
+
+WINDOW=256
+'''Number of latest samples of each phase percentiles are evaluated from.'''
+PERCENTILES=50,90,99
+
+_F=TypeVar('_F',bound=Callable)
+_NULL_CONTEXT=contextlib.nullcontext()
+
+class _Phase:
+	__slots__='profiler','name','start'
+
+	def __init__(self,profiler:Profiler,name:str):
+		self.profiler=profiler
+		self.name=name
+
+	def __enter__(self)->_Phase:
+		self.start=time.perf_counter()
+		return self
+
+	def __exit__(self,*args)->bool:
+		self.profiler.add(self.name,time.perf_counter()-self.start)
+		return False
+
+class Profiler:
+	'''Opt-in timing of operator phases.
+
+	Each phase keeps a rolling window of its latest durations (in seconds) and the total number of samples,
+	counters accumulate arbitrary statistics. While disabled, phases are not timed at all.
+	'''
+	__slots__='enabled','window','samples','totals','counters'
+	enabled:bool
+	window:int
+	samples:dict[str,collections.deque[float]]
+	totals:dict[str,int]
+	counters:dict[str,int]
+
+	def __init__(self,*,window:int=WINDOW):
+		self.enabled=False
+		self.window=window
+		self.samples=dict()
+		self.totals=dict()
+		self.counters=dict()
+
+	def phase(self,name:str)->contextlib.AbstractContextManager:
+		'''Context manager which times its block as a sample of the phase.'''
+		if not self.enabled:return _NULL_CONTEXT
+		return _Phase(self,name)
+
+	def add(self,name:str,seconds:float)->None:
+		samples=self.samples.get(name)
+		if samples is None:
+			samples=collections.deque(maxlen=self.window)
+			self.samples[name]=samples
+		samples.append(seconds)
+		self.totals[name]=self.totals.get(name,0)+1
+
+	def count(self,name:str,value:int=1)->None:
+		if self.enabled:self.counters[name]=self.counters.get(name,0)+value
+
+	def reset(self)->None:
+		self.samples.clear()
+		self.totals.clear()
+		self.counters.clear()
+
+	def summary(self)->list[tuple[str,int,float,float,float,float,float]]:
+		'''Rows of ``(phase, total number of samples, last, *percentiles, max)``, durations are in seconds.'''
+		ret=list()
+		for name,samples in self.samples.items():
+			values=np.fromiter(samples,dtype=np.float64,count=len(samples))
+			ret.append((name,self.totals[name],values[-1],*np.percentile(values,PERCENTILES).tolist(),values.max()))
+		return ret
+
+	def write_csv(self,filepath:str)->None:
+		'''Write summary rows followed by counters, durations are in milliseconds.'''
+		with open(filepath,'w',newline='',encoding='utf-8')as file:
+			writer=csv.writer(file)
+			writer.writerow(('phase','count','last_ms',*(f'p{q}_ms'for q in PERCENTILES),'max_ms'))
+			for name,count,*values in self.summary():writer.writerow((name,count,*(f'{value*1000.:.3f}'for value in values)))
+			if self.counters:
+				writer.writerow(())
+				writer.writerow(('counter','value'))
+				for name,value in self.counters.items():writer.writerow((name,value))
+
+	def format(self)->str:
+		lines=['{:<24}{:>8}{:>12}{}{:>12}'.format('Phase','Count','Last, ms',''.join(f'{f"p{q}, ms":>12}'for q in PERCENTILES),'Max, ms')]
+		for name,count,*values in self.summary():lines.append(f'{name:<24}{count:>8}'+''.join(f'{value*1000.:>12.3f}'for value in values))
+		for name,value in self.counters.items():lines.append(f'{name:<24}{value:>8}')
+		return '\n'.join(lines)
+
+	def write_log(self,filepath:str)->None:
+		with open(filepath,'a',encoding='utf-8')as file:file.write(f'{time.strftime("%Y-%m-%d %H:%M:%S")}\n{self.format()}\n\n')
+
+profiler=Profiler()
+'''Profiler of the select path operator.'''
+
+def timed(name:str)->Callable[[_F],_F]:
+	'''Decorator which times each call of the function as a sample of the phase of ``profiler``.'''
+	def decorator(func:_F)->_F:
+		@functools.wraps(func)
+		def wrapper(*args,**kwargs):
+			if not profiler.enabled:return func(*args,**kwargs)
+			with _Phase(profiler,name):return func(*args,**kwargs)
+		return wrapper
+	return decorator
@@ -36,7 +36,7 @@ def _get_addon_preferences(context:Context):
 		if name.startswith('path_tool'):return addons[name].preferences
 	return None
 class WMProps(PropertyGroup):
-	is_runtime:BoolProperty(options={_H});mark_select:EnumProperty(items=((_I,'Extend','Extend existing selection','SELECT_EXTEND',1),(_B,_C,_C,'X',2),('SUBTRACT','Subtract','Subtract existing selection','SELECT_SUBTRACT',3),('INVERT','Invert','Inverts existing selection','SELECT_DIFFERENCE',4)),default=_I,options={_D},translation_context=_A,name=_J,description='Selection options');mark_seam:EnumProperty(items=(('MARK','Mark','Mark seam path elements',_K,1),(_B,_C,_C,'X',2),('CLEAR','Clear','Clear seam path elements',_L,3),(_M,_N,'Toggle seams on path elements',_O,4)),default=_B,options={_D},translation_context=_A,name='Seam',description='Mark seam options');mark_sharp:EnumProperty(items=(('MARK','Mark','Mark sharp path elements',_K,1),(_B,_C,_C,'X',2),('CLEAR','Clear','Clear sharp path elements',_L,3),(_M,_N,'Toggle sharpness on path',_O,4)),default=_B,options={_D},translation_context=_A,name='Sharp',description='Mark sharp options');use_topology_distance:BoolProperty(default=_F,options={_D},translation_context=_A,name='Use Topology Distance',description='Use the algorithm for determining the shortest path without taking into account the spatial distance, only the number of steps. Newly created paths will use the value of the option, but this can be adjusted individually for each of them');show_path_behind:BoolProperty(default=_E,options={_D},translation_context=_A,name='Show Path Behind',description='Whether to show the path behind the mesh')
+	is_runtime:BoolProperty(options={_H});mark_select:EnumProperty(items=((_I,'Extend','Extend existing selection','SELECT_EXTEND',1),(_B,_C,_C,'X',2),('SUBTRACT','Subtract','Subtract existing selection','SELECT_SUBTRACT',3),('INVERT','Invert','Inverts existing selection','SELECT_DIFFERENCE',4)),default=_I,options={_D},translation_context=_A,name=_J,description='Selection options');mark_seam:EnumProperty(items=(('MARK','Mark','Mark seam path elements',_K,1),(_B,_C,_C,'X',2),('CLEAR','Clear','Clear seam path elements',_L,3),(_M,_N,'Toggle seams on path elements',_O,4)),default=_B,options={_D},translation_context=_A,name='Seam',description='Mark seam options');mark_sharp:EnumProperty(items=(('MARK','Mark','Mark sharp path elements',_K,1),(_B,_C,_C,'X',2),('CLEAR','Clear','Clear sharp path elements',_L,3),(_M,_N,'Toggle sharpness on path',_O,4)),default=_B,options={_D},translation_context=_A,name='Sharp',description='Mark sharp options');use_topology_distance:BoolProperty(default=_F,options={_D},translation_context=_A,name='Use Topology Distance',description='Use the algorithm for determining the shortest path without taking into account the spatial distance, only the number of steps. Newly created paths will use the value of the option, but this can be adjusted individually for each of them');use_weighted_cost:BoolProperty(default=_F,options={_D},translation_context=_A,name='Use Weighted Cost',description='Make paths follow feature lines - edges with large dihedral angle, seams, sharp edges and UV boundaries are cheaper to pass along, in face mode they are more expensive to cross. Newly created paths will use the value of the option');show_path_behind:BoolProperty(default=_E,options={_D},translation_context=_A,name='Show Path Behind',description='Whether to show the path behind the mesh')
 	def ui_draw_func(self,layout:UILayout)->None:
 		bhqab.utils_ui.template_preset(layout,menu=MESH_MT_select_path_presets,operator=MESH_OT_select_path_preset_add.bl_idname);lay=layout
 		if bpy.context.region.type in{'WINDOW','UI'}:lay=layout.column()
@@ -46,10 +46,10 @@ class WMProps(PropertyGroup):
 		row=layout.row(align=_E)
 		if bhqupd.has_updates():props=row.operator(operator=PREFERENCES_OT_select_path_pref_show.bl_idname,text='Update Available',text_ctxt=_A,emboss=_F);props.shortcut=_G
 		else:row.operator(operator=PREFERENCES_OT_select_path_pref_show.bl_idname,text='Tool Settings',text_ctxt=_A,icon_value=icons.get_id('preferences'),emboss=_F)
-		self.ui_draw_func(layout);layout.prop(self,'use_topology_distance');layout.prop(self,'show_path_behind')
+		self.ui_draw_func(layout);layout.prop(self,'use_topology_distance');layout.prop(self,'use_weighted_cost');layout.prop(self,'show_path_behind')
 class MESH_MT_select_path_presets(Menu):bl_label='Operator Preset';preset_subdir=os.path.join(_P,'wm');preset_operator='script.execute_preset';draw=Menu.draw_preset
 class MESH_OT_select_path_preset_add(AddPresetBase,Operator):
-	bl_idname='mesh.select_path_preset_add';bl_label='';bl_translation_context='MESH_OT_select_path_preset_add';preset_menu=MESH_MT_select_path_presets.__name__;preset_defines=['props = bpy.context.window_manager.select_path'];preset_values=['props.mark_select',_Q,_Q,'props.use_topology_distance'];preset_subdir=os.path.join(_P,'wm')
+	bl_idname='mesh.select_path_preset_add';bl_label='';bl_translation_context='MESH_OT_select_path_preset_add';preset_menu=MESH_MT_select_path_presets.__name__;preset_defines=['props = bpy.context.window_manager.select_path'];preset_values=['props.mark_select',_Q,_Q,'props.use_topology_distance','props.use_weighted_cost'];preset_subdir=os.path.join(_P,'wm')
 	@classmethod
 	def description(cls,_context:Context,properties:OperatorProperties)->str:
 		msgctxt=cls.__qualname__
@@ -14,7 +14,7 @@ import gpu
 from gpu.types import GPUShader,GPUShaderCreateInfo,GPUStageInterfaceInfo
 from..lib import bhqglsl
 from..lib.bhqglsl.ubo import glsl_bool,glsl_float,glsl_int,glsl_mat4,glsl_vec2,glsl_vec4
-__all__='INTERN_DIR','CommonParams','get','register'
+__all__='INTERN_DIR','CommonParams','get','warm_up','register','clear_cache'
 INTERN_DIR=os.path.join(os.path.dirname(__file__),'intern')
 
 class CommonParams(bhqglsl.ubo.StructUBO):
@@ -24,6 +24,8 @@ class CommonParams(bhqglsl.ubo.StructUBO):
 	color_path:glsl_vec4
 	color_active_path:glsl_vec4
 	color_path_behind:glsl_vec4
+	color_path_topology:glsl_vec4
+	color_active_path_topology:glsl_vec4
 	index_active:glsl_int
 	point_size:glsl_float
 	show_path_behind:glsl_bool
@@ -34,18 +36,26 @@ class CommonParams(bhqglsl.ubo.StructUBO):
 		('color_path',glsl_vec4),
 		('color_active_path',glsl_vec4),
 		('color_path_behind',glsl_vec4),
+		('color_path_topology',glsl_vec4),
+		('color_active_path_topology',glsl_vec4),
 		('index_active',glsl_int),
 		('point_size',glsl_float),
 		('show_path_behind',glsl_bool),
 		('_pad0',glsl_float)
 	)
 
+def _style_interface()->GPUStageInterfaceInfo:
+	'''Per-vertex style flags passed to fragment stage (see ``drawlist.STYLE_ACTIVE`` and ``drawlist.STYLE_TOPOLOGY``).'''
+	vert_out=GPUStageInterfaceInfo("style_iface")
+	vert_out.flat('INT','f_Style')
+	return vert_out
+
 def _create_shader_cp_vert()->GPUShader:
 	'''Control point shader for vertex mode - uses point sprites instead of geometry shader.'''
 	info=GPUShaderCreateInfo()
 	# Vertex inputs
 	info.vertex_in(0,_C,'P')
-	info.vertex_in(1,'INT','v_Index')
+	info.vertex_in(1,'INT','v_Style')
 	# Push constants
 	info.push_constant(_D,_E)
 	info.push_constant(_A,_F)
@@ -54,9 +64,7 @@ def _create_shader_cp_vert()->GPUShader:
 	# Sampler
 	info.sampler(0,_H,_I)
 	# Stage interface for passing data to fragment
-	vert_out=GPUStageInterfaceInfo("cp_vert_iface")
-	vert_out.flat('INT',"f_IsActive")
-	info.vertex_out(vert_out)
+	info.vertex_out(_style_interface())
 	# Fragment output
 	info.fragment_out(0,_A,_J)
 	# Typedef for UBO struct
@@ -66,7 +74,7 @@ def _create_shader_cp_vert()->GPUShader:
 void main() {
 	gl_Position = ModelViewProjectionMatrix * u_Params.model_matrix * vec4(P, 1.0);
 	gl_PointSize = u_Params.point_size * 2.0;
-	f_IsActive = (v_Index >= u_Params.index_active) ? 1 : 0;
+	f_Style = v_Style;
 }
 ''')
 	# Fragment shader - draw circular point
@@ -85,7 +93,7 @@ void main() {
 	if (frag_depth_greater_biased(u_DepthMap, u_ViewportMetrics.zw)) {
 		discard;
 	}
-	f_Color = (f_IsActive == 0) ? u_Params.color_cp : u_Params.color_active_cp;
+	f_Color = ((f_Style & 1) == 0) ? u_Params.color_cp : u_Params.color_active_cp;
 }
 ''')
 	return gpu.shader.create_from_info(info)
@@ -95,6 +103,8 @@ def _create_shader_cp_face()->GPUShader:
 	vertexcode,fragcode=bhqglsl.read_shader_files(directory=INTERN_DIR,filenames=(_B,'cp_face.frag'))
 	info=GPUShaderCreateInfo()
 	info.vertex_in(0,_C,'P')
+	info.vertex_in(1,'INT','v_Style')
+	info.vertex_out(_style_interface())
 	info.push_constant(_D,_E)
 	info.push_constant(_A,_F)
 	info.uniform_buf(0,CommonParams.__qualname__,_G)
@@ -110,6 +120,8 @@ def _create_shader_path_edge()->GPUShader:
 	vertexcode,fragcode=bhqglsl.read_shader_files(directory=INTERN_DIR,filenames=(_B,'path_edge.frag'))
 	info=GPUShaderCreateInfo()
 	info.vertex_in(0,_C,'P')
+	info.vertex_in(1,'INT','v_Style')
+	info.vertex_out(_style_interface())
 	info.push_constant(_D,_E)
 	info.push_constant(_A,_F)
 	info.uniform_buf(0,CommonParams.__qualname__,_G)
@@ -125,6 +137,8 @@ def _create_shader_path_face()->GPUShader:
 	vertexcode,fragcode=bhqglsl.read_shader_files(directory=INTERN_DIR,filenames=(_B,'path_face.frag'))
 	info=GPUShaderCreateInfo()
 	info.vertex_in(0,_C,'P')
+	info.vertex_in(1,'INT','v_Style')
+	info.vertex_out(_style_interface())
 	info.push_constant(_D,_E)
 	info.push_constant(_A,_F)
 	info.uniform_buf(0,CommonParams.__qualname__,_G)
@@ -135,10 +149,25 @@ def _create_shader_path_face()->GPUShader:
 	info.fragment_source(fragcode)
 	return gpu.shader.create_from_info(info)
 
-_SHADERS=dict()
-def get(name:str)->None|GPUShader:return _SHADERS.get(name,None)
-def register():
-	_SHADERS['cp_vert']=_create_shader_cp_vert()
-	_SHADERS['cp_face']=_create_shader_cp_face()
-	_SHADERS['path_edge']=_create_shader_path_edge()
-	_SHADERS['path_face']=_create_shader_path_face()
+_CREATORS={
+	'cp_vert':_create_shader_cp_vert,
+	'cp_face':_create_shader_cp_face,
+	'path_edge':_create_shader_path_edge,
+	'path_face':_create_shader_path_face,
+}
+_SHADERS:dict[str,GPUShader]=dict()
+
+def get(name:str)->None|GPUShader:
+	'''Shader by name, compiled on first use and kept until add-on is unregistered.'''
+	shader=_SHADERS.get(name,None)
+	if shader is None and name in _CREATORS:
+		shader=_SHADERS[name]=_CREATORS[name]()
+	return shader
+
+def warm_up()->None:
+	'''Compile all shaders which were not compiled yet. Can be used as a timer function.'''
+	for name in _CREATORS:get(name)
+
+def register():warm_up()
+
+def clear_cache()->None:_SHADERS.clear()
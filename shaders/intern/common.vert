@@ -1,8 +1,10 @@
 #ifndef USE_GPU_SHADER_CREATE_INFO
 in vec3 P;
+in int v_Style;
 layout(binding = 0, std140) uniform u_Params { CommonParams _u_Params; };
 uniform mat4 ModelViewProjectionMatrix;
-void main() { gl_Position = ModelViewProjectionMatrix * _u_Params.model_matrix * vec4(P, 1.0); }
+out flat int f_Style;
+void main() { gl_Position = ModelViewProjectionMatrix * _u_Params.model_matrix * vec4(P, 1.0); f_Style = v_Style; }
 #else
-void main() { gl_Position = ModelViewProjectionMatrix * u_Params.model_matrix * vec4(P, 1.0); }
+void main() { gl_Position = ModelViewProjectionMatrix * u_Params.model_matrix * vec4(P, 1.0); f_Style = v_Style; }
 #endif
\ No newline at end of file
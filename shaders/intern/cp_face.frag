@@ -3,5 +3,5 @@ void main() {
 if (frag_depth_greater_biased(u_DepthMap, u_ViewportMetrics.zw)) {
 discard;
 }
-f_Color = ((gl_PrimitiveID < u_Params.index_active) ? u_Params.color_cp : u_Params.color_active_cp);
+f_Color = (((f_Style & 1) == 0) ? u_Params.color_cp : u_Params.color_active_cp);
 }
\ No newline at end of file
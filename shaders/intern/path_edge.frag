@@ -6,7 +6,9 @@ f_Color = u_Params.color_path_behind;
 } else {
 discard;
 }
+} else if ((f_Style & 2) != 0) {
+f_Color = (((f_Style & 1) == 0) ? u_Params.color_path_topology : u_Params.color_active_path_topology);
 } else {
-f_Color = u_Params.color_path;
+f_Color = (((f_Style & 1) == 0) ? u_Params.color_path : u_Params.color_active_path);
 }
 }
\ No newline at end of file
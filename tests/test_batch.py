@@ -0,0 +1,81 @@
+'''Tests of ``batch`` module, run by Blender::
+
+	blender --background --factory-startup --python-exit-code 1 --python tests/test_batch.py
+'''
+from __future__ import annotations
+import importlib.util
+import os
+import sys
+import unittest
+import numpy as np
+import bpy
+
+ADDON_DIR=os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+ADDON_NAME='path_tool'
+
+def _load_addon():
+	module=sys.modules.get(ADDON_NAME)
+	if module is None:
+		spec=importlib.util.spec_from_file_location(ADDON_NAME,os.path.join(ADDON_DIR,'__init__.py'),submodule_search_locations=[ADDON_DIR])
+		module=importlib.util.module_from_spec(spec)
+		sys.modules[ADDON_NAME]=module
+		spec.loader.exec_module(module)
+	return module
+
+def _new_grid_object(name:str,size:int=4)->bpy.types.Object:
+	'''Object with a grid mesh of ``size`` by ``size`` vertices.'''
+	verts=[(x,y,0.)for y in range(size)for x in range(size)]
+	faces=[(y*size+x,y*size+x+1,(y+1)*size+x+1,(y+1)*size+x)for y in range(size-1)for x in range(size-1)]
+	mesh=bpy.data.meshes.new(name)
+	mesh.from_pydata(verts,(),faces)
+	mesh.update()
+	ob=bpy.data.objects.new(name,mesh)
+	bpy.context.scene.collection.objects.link(ob)
+	return ob
+
+def _get_edge_flags(ob:bpy.types.Object)->tuple[np.ndarray,np.ndarray]:
+	mesh=ob.data
+	select=np.empty(len(mesh.edges),dtype=bool)
+	seam=np.empty(len(mesh.edges),dtype=bool)
+	mesh.edges.foreach_get('select',select)
+	mesh.edges.foreach_get('use_seam',seam)
+	return select,seam
+
+class TestApplySpec(unittest.TestCase):
+	def setUp(self):
+		bpy.ops.wm.read_factory_settings(use_empty=True)
+		self.batch=_load_addon().batch
+		self.ob_a=_new_grid_object('A')
+		self.ob_b=_new_grid_object('B')
+
+	def test_apply(self):
+		stats=self.batch.apply_spec(dict(mark_seam='MARK',objects=dict(A=[[0,3]],B=[dict(control_elements=[0,15])])),mark_select='EXTEND')
+		self.assertEqual(stats['A']['paths'],1)
+		self.assertEqual(stats['A']['marked'],3)
+		self.assertEqual(stats['B']['marked'],6)
+		for ob in(self.ob_a,self.ob_b):
+			select,seam=_get_edge_flags(ob)
+			self.assertTrue(np.array_equal(select,seam))
+
+	def _assert_not_applied(self,spec:dict):
+		before=[_get_edge_flags(ob)for ob in(self.ob_a,self.ob_b)]
+		with self.assertRaises(ValueError):self.batch.apply_spec(spec,mark_select='EXTEND')
+		for ob,(select,seam)in zip((self.ob_a,self.ob_b),before):
+			select_after,seam_after=_get_edge_flags(ob)
+			self.assertTrue(np.array_equal(select,select_after))
+			self.assertTrue(np.array_equal(seam,seam_after))
+
+	def test_invalid_second_object_element(self):
+		self._assert_not_applied(dict(mark_seam='MARK',objects=dict(A=[[0,3]],B=[[0,1000]])))
+
+	def test_invalid_second_object_type(self):
+		bpy.context.scene.collection.objects.link(bpy.data.objects.new('C',None))
+		self._assert_not_applied(dict(mark_seam='MARK',objects=dict(A=[[0,3]],C=[[0,1]])))
+
+	def test_malformed_item(self):
+		for ob_items in([[0,'3']],[dict(control_elements=3)],[[0,None]],5):
+			with self.subTest(ob_items=ob_items):self._assert_not_applied(dict(mark_seam='MARK',objects=dict(A=[[0,3]],B=ob_items)))
+
+if __name__=='__main__':
+	result=unittest.main(argv=[__file__],exit=False).result
+	sys.exit(not result.wasSuccessful())
@@ -0,0 +1,96 @@
+'''Tests of depth map cache with a stand-in GPU module, run by any Python 3 interpreter::
+
+	python -m unittest discover -s tests -p test_depth_map.py
+'''
+from __future__ import annotations
+import importlib.util
+import os
+import types
+import unittest
+
+ADDON_DIR=os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+def _load_depth_map_module():
+	# Loaded by file path, the package it belongs to imports bpy
+	spec=importlib.util.spec_from_file_location('_depth_map',os.path.join(ADDON_DIR,'lib','bhqab','utils_gpu','_depth_map.py'))
+	module=importlib.util.module_from_spec(spec)
+	spec.loader.exec_module(module)
+	return module
+
+_depth_map=_load_depth_map_module()
+
+class _FrameBuffer:
+	def __init__(self,gpu_module:_FakeGPU):self.gpu_module=gpu_module
+
+	def viewport_get(self)->tuple[int,int,int,int]:return self.gpu_module.viewport
+
+	def read_depth(self,x:int,y:int,width:int,height:int)->list[float]:
+		self.gpu_module.num_reads+=1
+		return [1.]*(width*height)
+
+class _Texture:
+	def __init__(self,size:tuple[int,int],*,data:list[float],format:str):
+		self.size=size
+		self.data=data
+		self.format=format
+
+class _FakeGPU:
+	'''Stand-in of ``gpu`` module members used by the cache, counts depth read backs.'''
+	def __init__(self):
+		self.viewport=(0,0,4,2)
+		self.projection=((1.,0.),(0.,1.))
+		self.model_view=((1.,0.),(0.,1.))
+		self.num_reads=0
+		self.state=types.SimpleNamespace(viewport_get=lambda:self.viewport,active_framebuffer_get=lambda:_FrameBuffer(self))
+		self.matrix=types.SimpleNamespace(get_projection_matrix=lambda:self.projection,get_model_view_matrix=lambda:self.model_view)
+		self.types=types.SimpleNamespace(GPUTexture=_Texture)
+
+class TestDepthMapCache(unittest.TestCase):
+	def setUp(self):
+		self.gpu=_FakeGPU()
+		self.cache=_depth_map.DepthMapCache(gpu_module=self.gpu)
+
+	def test_reuse(self):
+		texture=self.cache.get(region_key=1,key=0)
+		self.assertEqual(texture.size,(4,2))
+		self.assertEqual(len(texture.data),8)
+		self.assertIs(self.cache.get(region_key=1,key=0),texture)
+		self.assertEqual(self.gpu.num_reads,1)
+
+	def test_view_change(self):
+		texture=self.cache.get(region_key=1)
+		self.gpu.model_view=((2.,0.),(0.,1.))
+		self.assertIsNot(self.cache.get(region_key=1),texture)
+		self.gpu.projection=((2.,0.),(0.,1.))
+		self.cache.get(region_key=1)
+		self.gpu.viewport=(0,0,8,4)
+		self.assertEqual(self.cache.get(region_key=1).size,(8,4))
+		self.assertEqual(self.gpu.num_reads,4)
+
+	def test_key_and_format_change(self):
+		self.cache.get(region_key=1,key=0)
+		self.cache.get(region_key=1,key=1)
+		texture=self.cache.get(region_key=1,key=1,depth_format='DEPTH_COMPONENT24')
+		self.assertEqual(texture.format,'DEPTH_COMPONENT24')
+		self.assertEqual(self.gpu.num_reads,3)
+
+	def test_regions(self):
+		texture=self.cache.get(region_key=1)
+		self.cache.get(region_key=2)
+		self.assertEqual(len(self.cache),2)
+		self.assertIs(self.cache.get(region_key=1),texture)
+		self.assertEqual(self.gpu.num_reads,2)
+
+	def test_invalidate(self):
+		self.cache.get(region_key=1)
+		self.cache.get(region_key=2)
+		self.cache.invalidate(region_key=1)
+		self.assertEqual(len(self.cache),1)
+		self.cache.get(region_key=2)
+		self.assertEqual(self.gpu.num_reads,2)
+		self.cache.invalidate()
+		self.assertEqual(len(self.cache),0)
+		self.cache.get(region_key=2)
+		self.assertEqual(self.gpu.num_reads,3)
+
+if __name__=='__main__':unittest.main()
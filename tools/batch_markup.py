@@ -0,0 +1,152 @@
+'''Select and mark up paths in many .blend files in parallel Blender processes.
+
+Run with any Python 3 interpreter::
+
+	python tools/batch_markup.py assets/ --spec paths.json --blender /path/to/blender --jobs 8 --timeout 300 --report report.json
+
+Every .blend file of the directory (recursively with ``--recursive``) is opened by a separate background Blender
+process which applies the path specification the same way ``mesh.select_path_batch`` operator does and saves the
+file (unless ``--dry-run`` is given). At most ``--jobs`` processes run at once, a process which runs longer than
+``--timeout`` seconds is killed. The report is a JSON file with the result of each file and totals.
+
+Specification format is described in ``batch.load_spec``. It is applied to every file, or, if it has a ``files``
+mapping, each file gets the specification mapped to its path relative to the directory. Selection, seam and sharp
+modes of the command line are used where the specification does not set them.
+
+The same script is the worker - Blender runs it with ``--worker`` argument.
+'''
+from __future__ import annotations
+import argparse
+import concurrent.futures
+import datetime
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+ADDON_DIR=os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+ADDON_NAME='path_tool'
+'''Module name the add-on is loaded as by the worker, regardless of its directory name.'''
+# Same as in batch module, which can not be imported outside of Blender
+MARK_SELECT_ITEMS='EXTEND','NONE','SUBTRACT','INVERT'
+MARK_ITEMS='MARK','NONE','CLEAR','TOGGLE'
+
+def _parse_args(argv:list[str])->argparse.Namespace:
+	parser=argparse.ArgumentParser(prog='batch_markup.py',description=__doc__.split('\n',1)[0])
+	parser.add_argument('directory',nargs='?',help='Directory with .blend files')
+	parser.add_argument('--spec',required=True,help='Path specification JSON file')
+	parser.add_argument('--blender',default=os.environ.get('BLENDER','blender'),help='Blender executable, "BLENDER" environment variable by default')
+	parser.add_argument('--jobs',type=int,default=max(1,(os.cpu_count()or 2)//2),help='Maximum number of Blender processes running at once')
+	parser.add_argument('--timeout',type=float,default=600.,help='Seconds a single file may take')
+	parser.add_argument('--report',default='batch_markup_report.json',help='Path of resulting JSON report')
+	parser.add_argument('--recursive',action='store_true')
+	parser.add_argument('--dry-run',action='store_true',help='Do not save files')
+	parser.add_argument('--mark-select',choices=MARK_SELECT_ITEMS,default='EXTEND')
+	parser.add_argument('--mark-seam',choices=MARK_ITEMS,default='NONE')
+	parser.add_argument('--mark-sharp',choices=MARK_ITEMS,default='NONE')
+	parser.add_argument('--worker',action='store_true',help=argparse.SUPPRESS)
+	parser.add_argument('--result',help=argparse.SUPPRESS)
+	return parser.parse_args(argv)
+
+# Worker, runs inside Blender
+
+def _run_worker(args:argparse.Namespace)->None:
+	import importlib.util
+	import bpy
+	result=dict(status='failed')
+	try:
+		with open(args.spec,'r',encoding='utf-8')as file:spec=json.load(file)
+		# Add-on directory may have a version suffix (path_tool-4_0_1), which is not a valid module name
+		module_spec=importlib.util.spec_from_file_location(ADDON_NAME,os.path.join(ADDON_DIR,'__init__.py'),submodule_search_locations=[ADDON_DIR])
+		addon=importlib.util.module_from_spec(module_spec)
+		sys.modules[ADDON_NAME]=addon
+		module_spec.loader.exec_module(addon)
+		addon.register()
+		try:
+			if bpy.context.mode!='OBJECT':bpy.ops.object.mode_set(mode='OBJECT')
+			result['objects']=addon.batch.apply_spec(spec,mark_select=args.mark_select,mark_seam=args.mark_seam,mark_sharp=args.mark_sharp)
+			if not args.dry_run:bpy.ops.wm.save_mainfile()
+			result['status']='ok'
+		finally:addon.unregister()
+	except Exception as err:
+		result['error']=f'{type(err).__name__}: {err}'
+		raise
+	finally:
+		with open(args.result,'w',encoding='utf-8')as file:json.dump(result,file)
+
+# Controller
+
+def _find_files(directory:str,recursive:bool)->list[str]:
+	ret=list()
+	for root,dirs,files in os.walk(directory):
+		ret.extend(os.path.join(root,name)for name in files if name.lower().endswith('.blend'))
+		if not recursive:break
+		dirs.sort()
+	return sorted(ret)
+
+def _eval_file_spec(spec:dict,relpath:str)->None|dict:
+	files=spec.get('files')
+	if files is None:return spec
+	return files.get(relpath.replace(os.sep,'/'))
+
+def _process_file(args:argparse.Namespace,filepath:str,spec:dict,tmpdir:str,index:int)->dict:
+	spec_path=os.path.join(tmpdir,f'spec_{index}.json')
+	result_path=os.path.join(tmpdir,f'result_{index}.json')
+	with open(spec_path,'w',encoding='utf-8')as file:json.dump(spec,file)
+	cmd=[args.blender,'--background','--factory-startup','--python-exit-code','1',filepath,'--python',os.path.abspath(__file__),'--','--worker','--spec',spec_path,'--result',result_path,'--mark-select',args.mark_select,'--mark-seam',args.mark_seam,'--mark-sharp',args.mark_sharp]
+	if args.dry_run:cmd.append('--dry-run')
+	ret=dict(file=filepath,status='failed')
+	start=time.perf_counter()
+	try:
+		proc=subprocess.run(cmd,stdout=subprocess.PIPE,stderr=subprocess.STDOUT,timeout=args.timeout,text=True,errors='replace')
+		ret['returncode']=proc.returncode
+		if os.path.exists(result_path):
+			with open(result_path,'r',encoding='utf-8')as file:ret.update(json.load(file))
+		if proc.returncode:
+			ret['status']='failed'
+			ret.setdefault('error',proc.stdout[-2000:])
+	except subprocess.TimeoutExpired:
+		ret['status']='timeout'
+		ret['error']=f'Killed after {args.timeout} seconds'
+	except OSError as err:ret['error']=str(err)
+	ret['seconds']=time.perf_counter()-start
+	return ret
+
+def _run_controller(args:argparse.Namespace)->int:
+	if not args.directory:
+		print('Directory is required',file=sys.stderr)
+		return 2
+	with open(args.spec,'r',encoding='utf-8')as file:spec=json.load(file)
+	files=_find_files(args.directory,args.recursive)
+	results=list()
+	jobs=list()
+	for filepath in files:
+		file_spec=_eval_file_spec(spec,os.path.relpath(filepath,args.directory))
+		if file_spec is None:results.append(dict(file=filepath,status='skipped'))
+		else:jobs.append((filepath,file_spec))
+	start=time.perf_counter()
+	with tempfile.TemporaryDirectory(prefix='path_tool_')as tmpdir:
+		with concurrent.futures.ThreadPoolExecutor(max_workers=max(1,args.jobs))as executor:
+			futures=[executor.submit(_process_file,args,filepath,file_spec,tmpdir,i)for i,(filepath,file_spec)in enumerate(jobs)]
+			for future in concurrent.futures.as_completed(futures):
+				result=future.result()
+				results.append(result)
+				print(f"[{len(results)}/{len(files)}] {result['status']:>8} {result['seconds']:8.2f} s  {result['file']}",flush=True)
+	results.sort(key=lambda item:item['file'])
+	totals={status:sum(1 for item in results if item['status']==status)for status in('ok','failed','timeout','skipped')}
+	report=dict(meta=dict(directory=os.path.abspath(args.directory),spec=os.path.abspath(args.spec),blender=args.blender,jobs=args.jobs,timeout=args.timeout,dry_run=args.dry_run,mark_select=args.mark_select,mark_seam=args.mark_seam,mark_sharp=args.mark_sharp,timestamp=datetime.datetime.now(datetime.timezone.utc).isoformat(),seconds=time.perf_counter()-start),totals=totals,files=results)
+	with open(args.report,'w',encoding='utf-8')as file:json.dump(report,file,indent=1)
+	print(f"{totals['ok']} ok, {totals['failed']} failed, {totals['timeout']} timed out, {totals['skipped']} skipped. Report written to {os.path.abspath(args.report)}")
+	return 0 if totals['ok']==len(jobs)else 1
+
+def main()->None:
+	argv=sys.argv[1:]
+	# Inside Blender only arguments after "--" belong to the script
+	if'--'in argv:argv=argv[argv.index('--')+1:]
+	args=_parse_args(argv)
+	if args.worker:_run_worker(args)
+	else:sys.exit(_run_controller(args))
+
+if __name__=='__main__':main()